@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+"""
+    Project: Question Answering Dataset
+    Description: A dataset containing context passages, questions, and answers for training QA models and reading comprehension systems.
+    Author: Molla Samser
+    Website: https://rskworld.in
+    Contact: help@rskworld.in
+    Phone: +91 93305 39277
+
+    Persistent Answer Cache
+    Stores predicted answers in a local SQLite database (WAL mode) keyed by
+    model name, model revision, context hash and normalized question, so
+    repeated (context, question) pairs skip the model entirely. Several
+    processes can share one cache file. Questions are case-folded only for
+    models whose tokenizer lowercases (see tokenizer_lowercases).
+
+    Usage:
+        python answer_cache.py
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import time
+import unicodedata
+
+DEFAULT_PATH = '../answer_cache.sqlite'
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 100000
+EVICT_EVERY = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS answers (
+    model TEXT NOT NULL,
+    revision TEXT NOT NULL,
+    context_hash TEXT NOT NULL,
+    question TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    created REAL NOT NULL,
+    PRIMARY KEY (model, revision, context_hash, question)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS answers_created ON answers (created);
+"""
+
+def normalize_question(question, lowercase=False):
+    """
+    Normalize a question for cache lookups: Unicode NFKC, collapsed
+    whitespace, no trailing punctuation and, for uncased models, lowercase.
+    """
+    question = unicodedata.normalize('NFKC', question)
+    if lowercase:
+        question = question.lower()
+    return re.sub(r'\s+', ' ', question).strip().rstrip('?!. ')
+
+def tokenizer_lowercases(tokenizer):
+    """Return True if a tokenizer lowercases its input, so case cannot change the answer."""
+    return bool(getattr(tokenizer, 'do_lower_case', False))
+
+def context_hash(context):
+    """Return the SHA-256 hex digest of a context passage."""
+    return hashlib.sha256(context.encode('utf-8')).hexdigest()
+
+def model_revision(model):
+    """
+    Return the Hub commit a model was loaded from, or 'local' for models
+    loaded from a directory.
+    """
+    return getattr(model.config, '_commit_hash', None) or 'local'
+
+class AnswerCache:
+    """
+    Process-safe persistent cache of QA answers.
+
+    Answers are stored as JSON, so plain strings and pipeline result dicts
+    both work. Entries expire `ttl` seconds after they are written, and the
+    oldest entries are evicted once the cache holds more than `max_entries`.
+    Eviction runs when a process opens the cache and then every EVICT_EVERY
+    writes, so short-lived processes also keep it bounded. Lookups never
+    write, so hits stay cheap under concurrent readers.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES, timeout=30.0):
+        """
+        Args:
+            path (str): SQLite database file
+            ttl (float): Seconds an entry stays valid (None to keep entries forever)
+            max_entries (int): Entries kept after eviction (None for no limit)
+            timeout (float): Seconds to wait for another process's write lock
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._connection = None
+        self._pid = None
+
+    def _connect(self):
+        """Return this process's connection, reopening it after a fork."""
+        if self._connection is None or self._pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.executescript(_SCHEMA)
+            self._connection = connection
+            self._pid = os.getpid()
+            self.evict()
+        return self._connection
+
+    def get(self, model, revision, context, question, lowercase=False):
+        """
+        Look up a cached answer.
+
+        Args:
+            lowercase (bool): Fold the question's case (for uncased models)
+
+        Returns:
+            The cached answer, or None on a miss or an expired entry
+        """
+        oldest = time.time() - self.ttl if self.ttl is not None else float('-inf')
+        row = self._connect().execute(
+            'SELECT answer FROM answers '
+            'WHERE model = ? AND revision = ? AND context_hash = ? AND question = ? AND created >= ?',
+            (model, revision, context_hash(context), normalize_question(question, lowercase), oldest)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, model, revision, context, question, answer, lowercase=False):
+        """Store an answer (any JSON-serializable value), replacing an older one."""
+        self._connect().execute(
+            'INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?, ?, ?)',
+            (model, revision, context_hash(context), normalize_question(question, lowercase),
+             json.dumps(answer, ensure_ascii=False), time.time())
+        )
+        self._writes += 1
+        if self._writes % EVICT_EVERY == 0:
+            self.evict()
+
+    def get_or_compute(self, model, revision, context, question, compute, lowercase=False):
+        """
+        Return the cached answer, or call compute() and cache its result.
+
+        Args:
+            model (str): Model name
+            revision (str): Model revision (see model_revision)
+            context (str): Context passage
+            question (str): Question
+            compute (callable): Produces the answer on a miss
+            lowercase (bool): Fold the question's case (see tokenizer_lowercases)
+        """
+        answer = self.get(model, revision, context, question, lowercase)
+        if answer is None:
+            answer = compute()
+            self.put(model, revision, context, question, answer, lowercase)
+        return answer
+
+    def evict(self):
+        """
+        Delete expired entries, then the oldest entries beyond max_entries.
+
+        Returns:
+            int: Number of entries deleted
+        """
+        connection = self._connect()
+        deleted = 0
+        with connection:
+            connection.execute('BEGIN IMMEDIATE')
+            if self.ttl is not None:
+                deleted += connection.execute('DELETE FROM answers WHERE created < ?',
+                                              (time.time() - self.ttl,)).rowcount
+            if self.max_entries is not None:
+                deleted += connection.execute(
+                    'DELETE FROM answers WHERE created <= ('
+                    'SELECT created FROM answers ORDER BY created DESC LIMIT 1 OFFSET ?)',
+                    (self.max_entries,)
+                ).rowcount
+        return deleted
+
+    def clear(self):
+        self._connect().execute('DELETE FROM answers')
+
+    def __len__(self):
+        return self._connect().execute('SELECT COUNT(*) FROM answers').fetchone()[0]
+
+    def stats(self):
+        """
+        Returns:
+            dict: entries, hits, misses and hit_rate of this process
+        """
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+    def close(self):
+        if self._connection is not None and self._pid == os.getpid():
+            self._connection.close()
+        self._connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def benchmark_lookups(cache, lookups=10000):
+    """
+    Measure the latency of cache hits.
+
+    Returns:
+        float: Mean microseconds per hit
+    """
+    context = "Benchmark context passage used for answer cache measurements."
+    cache.put('benchmark', 'local', context, 'What is cached?', 'answers')
+    start = time.perf_counter()
+    for _ in range(lookups):
+        cache.get('benchmark', 'local', context, 'What is cached')
+    return (time.perf_counter() - start) / lookups * 1e6
+
+def main():
+    """
+    Measure cache hit latency on a temporary database.
+    """
+    print("=" * 60)
+    print("Persistent Answer Cache")
+    print("Author: Molla Samser - https://rskworld.in")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        with AnswerCache(os.path.join(directory, 'bench.sqlite')) as cache:
+            micros = benchmark_lookups(cache)
+            print(f"\nCache hit latency: {micros:.1f} us")
+            print(f"Stats: {cache.stats()}")
+
+if __name__ == "__main__":
+    main()
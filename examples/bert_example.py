@@ -11,83 +11,390 @@
     This example demonstrates how to use the dataset with BERT-based models.
 """
 
-import json
+import sys
+import time
 import torch
 from transformers import BertTokenizer, BertForQuestionAnswering
-from transformers import pipeline
+from ingest_log import iter_dataset
+from token_cache import ContextTokenCache, build_qa_input, to_model_inputs
+from answer_cache import AnswerCache, model_revision, tokenizer_lowercases
+from model_registry import registry
 
 def load_dataset(file_path='../squad_format.json'):
     """
-    Load the SQuAD format dataset.
+    Load the SQuAD format dataset as a stream of flat records.
+    
+    See ingest_log.iter_dataset for where the records come from.
     
     Args:
         file_path (str): Path to the dataset JSON file
         
     Returns:
-        dict: Loaded dataset
+        iterator: (article title, context, qa) records
     """
-    with open(file_path, 'r', encoding='utf-8') as f:
-        dataset = json.load(f)
-    return dataset
+    return iter_dataset(file_path)
 
-def prepare_bert_input(context, question, tokenizer, max_length=512):
+def prepare_bert_input(context, question, tokenizer, max_length=512, cache=None):
     """
     Prepare input for BERT model.
     
+    With a fast tokenizer the inputs also carry an offset_mapping tensor
+    (character offsets of each token), which predict_answer uses to slice
+    the answer out of the context.
+    
     Args:
         context (str): Context passage
         question (str): Question to answer
         tokenizer: BERT tokenizer
         max_length (int): Maximum sequence length
+        cache (ContextTokenCache): Optional cache of context tokenizations; when
+            given, only the question is tokenized
         
     Returns:
         dict: Tokenized inputs
     """
+    if cache is not None:
+        return to_model_inputs(build_qa_input(context, question, tokenizer, cache, max_length))
+    
     # BERT expects [CLS] question [SEP] context [SEP]
-    inputs = tokenizer.encode_plus(
+    inputs = tokenizer(
         question,
         context,
         add_special_tokens=True,
         max_length=max_length,
-        padding='max_length',
         truncation=True,
+        return_offsets_mapping=getattr(tokenizer, 'is_fast', False),
         return_tensors='pt'
     )
     return inputs
 
-def predict_answer(context, question, model, tokenizer):
+def context_token_mask(token_type_ids, offset_mapping):
+    """
+    Return a bool mask that is True on context tokens.
+    
+    Context tokens are in the second segment and have a non-empty character
+    span; the final [SEP] and padding map to (0, 0).
+    """
+    return (token_type_ids == 1) & (offset_mapping[..., 1] > 0)
+
+def segment_context_mask(inputs, tokenizer):
+    """
+    Context mask for tokenizers without offsets: tokens after the first
+    [SEP], excluding the closing [SEP] and padding.
+    """
+    is_sep = inputs['input_ids'] == tokenizer.sep_token_id
+    return (torch.cumsum(is_sep.long(), dim=-1) >= 1) & ~is_sep & (inputs['attention_mask'] == 1)
+
+def span_text(context, offsets, start_idx, end_idx):
+    """Slice the answer between two context tokens out of the context."""
+    if end_idx < start_idx:
+        return ''
+    return context[int(offsets[start_idx][0]):int(offsets[end_idx][1])]
+
+def predict_answer(context, question, model, tokenizer, cache=None, answer_cache=None, max_answer_length=30):
     """
     Predict answer using BERT model.
     
+    The answer is the best scoring context span (see best_spans), so its end
+    never precedes its start and it is at most max_answer_length tokens.
+    With a fast tokenizer it is sliced out of the context through the offset
+    mapping; slow tokenizers fall back to tokenizer.decode.
+    
     Args:
         context (str): Context passage
         question (str): Question to answer
         model: BERT model for question answering
         tokenizer: BERT tokenizer
+        cache (ContextTokenCache): Optional cache of context tokenizations
+        answer_cache (AnswerCache): Optional persistent cache; repeated pairs
+            skip the forward pass
+        max_answer_length (int): Longest allowed answer in tokens
         
     Returns:
         str: Predicted answer
     """
-    inputs = prepare_bert_input(context, question, tokenizer)
+    if answer_cache is not None:
+        return answer_cache.get_or_compute(
+            model.config.name_or_path, model_revision(model), context, question,
+            lambda: predict_answer(context, question, model, tokenizer, cache=cache,
+                                   max_answer_length=max_answer_length),
+            lowercase=tokenizer_lowercases(tokenizer)
+        )
+    
+    inputs = prepare_bert_input(context, question, tokenizer, cache=cache)
+    offsets = inputs.pop('offset_mapping', None)
     
     with torch.no_grad():
         outputs = model(**inputs)
-        start_scores = outputs.start_logits
-        end_scores = outputs.end_logits
+    
+    if offsets is not None:
+        context_mask = context_token_mask(inputs['token_type_ids'], offsets)
+    else:
+        context_mask = segment_context_mask(inputs, tokenizer)
+    spans = best_spans(outputs.start_logits, outputs.end_logits, context_mask,
+                       max_answer_length=max_answer_length, n_best=1)
+    if not spans:
+        return ''
+    _, _, start_idx, end_idx = spans[0]
+    
+    # Decode the answer
+    if offsets is not None:
+        return span_text(context, offsets[0], start_idx, end_idx)
+    answer_tokens = inputs['input_ids'][0][start_idx:end_idx+1]
+    return tokenizer.decode(answer_tokens, skip_special_tokens=True)
+
+def predict_answers(pairs, model, tokenizer, batch_size=16, max_length=512, cache=None, max_answer_length=30):
+    """
+    Predict answers for many (context, question) pairs in batches.
+    
+    Pairs are tokenized once without padding, sorted by length and cut into
+    batches of similar length (length buckets). Each batch is padded only to
+    its longest member, so short QA pairs no longer pay for 512 tokens.
+    With a fast tokenizer all pairs are encoded in one batch call and the
+    answers are sliced out of the contexts through the offset mappings.
+    
+    Args:
+        pairs (list): (context, question) tuples
+        model: BERT model for question answering
+        tokenizer: BERT tokenizer
+        batch_size (int): Pairs per forward pass
+        max_length (int): Maximum sequence length
+        cache (ContextTokenCache): Optional cache of context tokenizations, so
+            questions on the same context tokenize it only once
+        max_answer_length (int): Longest allowed answer in tokens
+        
+    Returns:
+        list: Predicted answers, in the same order as `pairs`
+    """
+    if not pairs:
+        return []
+    
+    # BERT expects [CLS] question [SEP] context [SEP]
+    if cache is not None:
+        built = [build_qa_input(context, question, tokenizer, cache, max_length) for context, question in pairs]
+        encodings = {key: [features[key] for features in built]
+                     for key in ('input_ids', 'token_type_ids', 'attention_mask')}
+        offsets = [features['offset_mapping'] for features in built]
+        if offsets[0] is None:
+            offsets = None
+    else:
+        encodings = tokenizer(
+            [question for _, question in pairs],
+            [context for context, _ in pairs],
+            max_length=max_length,
+            truncation=True,
+            return_offsets_mapping=getattr(tokenizer, 'is_fast', False)
+        )
+        offsets = encodings.pop('offset_mapping', None)
+    order = sorted(range(len(pairs)), key=lambda i: len(encodings['input_ids'][i]))
+    answers = [None] * len(pairs)
+    
+    for batch_start in range(0, len(order), batch_size):
+        batch_indices = order[batch_start:batch_start + batch_size]
+        features = [{key: encodings[key][i] for key in encodings.keys()} for i in batch_indices]
+        inputs = tokenizer.pad(features, padding='longest', return_tensors='pt')
+        
+        with torch.no_grad():
+            outputs = model(**inputs)
+        
+        # Only context tokens may be picked as the answer, never the question or padding
+        if offsets is not None:
+            batch_offsets = torch.zeros(inputs['input_ids'].shape + (2,), dtype=torch.long)
+            for row, i in enumerate(batch_indices):
+                batch_offsets[row, :len(offsets[i])] = torch.tensor(offsets[i])
+            context_mask = context_token_mask(inputs['token_type_ids'], batch_offsets)
+        else:
+            context_mask = segment_context_mask(inputs, tokenizer)
+        
+        for row, i in enumerate(batch_indices):
+            spans = best_spans(outputs.start_logits[row:row + 1], outputs.end_logits[row:row + 1],
+                               context_mask[row:row + 1], max_answer_length=max_answer_length, n_best=1)
+            if not spans:
+                answers[i] = ''
+                continue
+            _, _, start_idx, end_idx = spans[0]
+            if offsets is not None:
+                answers[i] = span_text(pairs[i][0], offsets[i], start_idx, end_idx)
+                continue
+            answer_tokens = inputs['input_ids'][row][start_idx:end_idx+1]
+            answers[i] = tokenizer.decode(answer_tokens, skip_special_tokens=True)
+    
+    return answers
+
+def best_spans(start_logits, end_logits, context_mask, max_answer_length=30, n_best=5):
+    """
+    Find the highest scoring answer spans across a batch of windows.
+    
+    Every (start, end) pair is scored at once as start_logit + end_logit with
+    a broadcast outer sum. Pairs are masked out unless both tokens belong to
+    the context, end >= start, and the span is at most max_answer_length tokens.
+    
+    Args:
+        start_logits (torch.Tensor): (windows, seq_len) start logits
+        end_logits (torch.Tensor): (windows, seq_len) end logits
+        context_mask (torch.Tensor): (windows, seq_len) bool, True on context tokens
+        max_answer_length (int): Longest allowed span in tokens
+        n_best (int): Number of spans to return
+        
+    Returns:
+        list: (score, window, start_token, end_token) tuples, best first
+    """
+    seq_len = start_logits.shape[1]
+    scores = start_logits[:, :, None] + end_logits[:, None, :]
+    positions = torch.arange(seq_len)
+    span_length = positions[None, :] - positions[:, None]
+    valid = (span_length >= 0) & (span_length < max_answer_length)
+    valid = valid[None, :, :] & context_mask[:, :, None] & context_mask[:, None, :]
+    scores = scores.masked_fill(~valid, float('-inf')).flatten()
+    
+    k = min(n_best, int(valid.sum()))
+    if k == 0:
+        return []
+    top_scores, top_indices = torch.topk(scores, k)
+    spans = []
+    for score, index in zip(top_scores.tolist(), top_indices.tolist()):
+        window, rest = divmod(index, seq_len * seq_len)
+        start, end = divmod(rest, seq_len)
+        spans.append((score, window, start, end))
+    return spans
+
+def predict_answer_long(context, question, model, tokenizer, max_length=384, doc_stride=128,
+                        max_answer_length=30, n_best=5, batch_size=8):
+    """
+    Answer a question over a context of any length with a sliding window.
+    
+    The context is split into overlapping windows of max_length tokens
+    (consecutive windows share doc_stride tokens), the windows are run
+    through the model in batches, and the best spans over all windows are
+    mapped back to character offsets in the original context. Cost grows
+    linearly with the context length.
+    
+    Args:
+        context (str): Context passage
+        question (str): Question to answer
+        model: BERT model for question answering
+        tokenizer: Fast (Rust-backed) BERT tokenizer, needed for offset mappings
+        max_length (int): Tokens per window, including the question
+        doc_stride (int): Tokens of overlap between consecutive windows
+        max_answer_length (int): Longest allowed answer in tokens
+        n_best (int): Number of answers to return
+        batch_size (int): Windows per forward pass
         
-        # Get the most likely start and end positions
-        start_idx = torch.argmax(start_scores)
-        end_idx = torch.argmax(end_scores)
+    Returns:
+        list: Dicts with answer, score, start and end (character offsets), best first
+    """
+    if not getattr(tokenizer, 'is_fast', False):
+        raise ValueError("predict_answer_long needs a fast tokenizer (e.g. BertTokenizerFast)")
+    
+    encodings = tokenizer(
+        question,
+        context,
+        max_length=max_length,
+        truncation='only_second',
+        stride=doc_stride,
+        return_overflowing_tokens=True,
+        return_offsets_mapping=True,
+        padding='longest',
+        return_tensors='pt'
+    )
+    offsets = encodings.pop('offset_mapping')
+    encodings.pop('overflow_to_sample_mapping', None)
+    context_mask = torch.tensor([
+        [sequence_id == 1 for sequence_id in encodings.sequence_ids(i)]
+        for i in range(len(offsets))
+    ])
+    
+    start_logits, end_logits = [], []
+    with torch.no_grad():
+        for batch_start in range(0, len(offsets), batch_size):
+            batch = {key: value[batch_start:batch_start + batch_size] for key, value in encodings.items()}
+            outputs = model(**batch)
+            start_logits.append(outputs.start_logits)
+            end_logits.append(outputs.end_logits)
+    
+    spans = best_spans(torch.cat(start_logits), torch.cat(end_logits), context_mask,
+                       max_answer_length=max_answer_length, n_best=n_best * 2)
+    
+    # Overlapping windows can propose the same character span; keep the best copy
+    answers = []
+    seen = set()
+    for score, window, start, end in spans:
+        char_start = int(offsets[window, start, 0])
+        char_end = int(offsets[window, end, 1])
+        if (char_start, char_end) in seen:
+            continue
+        seen.add((char_start, char_end))
+        answers.append({'answer': context[char_start:char_end], 'score': score,
+                        'start': char_start, 'end': char_end})
+        if len(answers) == n_best:
+            break
+    return answers
+
+def benchmark_batched(pairs, model, tokenizer, batch_size=16):
+    """
+    Compare the per-question path with the batched path.
+    
+    Args:
+        pairs (list): (context, question) tuples
+        model: BERT model for question answering
+        tokenizer: BERT tokenizer
+        batch_size (int): Pairs per forward pass for the batched path
         
-        # Decode the answer
-        answer_tokens = inputs['input_ids'][0][start_idx:end_idx+1]
-        answer = tokenizer.decode(answer_tokens, skip_special_tokens=True)
+    Returns:
+        dict: Questions per second for 'single' and 'batched'
+    """
+    start = time.perf_counter()
+    for context, question in pairs:
+        predict_answer(context, question, model, tokenizer)
+    single = len(pairs) / (time.perf_counter() - start)
+    
+    start = time.perf_counter()
+    predict_answers(pairs, model, tokenizer, batch_size=batch_size)
+    batched = len(pairs) / (time.perf_counter() - start)
+    
+    return {'single': single, 'batched': batched}
+
+def benchmark_tokenizers(pairs, slow_tokenizer, fast_tokenizer, repeat=20, max_length=512):
+    """
+    Compare tokenization throughput of the slow and fast tokenizers.
+    
+    The slow tokenizer encodes one pair per call, as the original
+    prepare_bert_input did; the fast tokenizer encodes all pairs in one
+    batch call with offset mappings.
+    
+    Args:
+        pairs (list): (context, question) tuples
+        slow_tokenizer: Pure-Python BERT tokenizer
+        fast_tokenizer: Rust-backed BERT tokenizer
+        repeat (int): Passes over the pairs
+        max_length (int): Maximum sequence length
         
-    return answer
+    Returns:
+        dict: Tokens per second for 'slow' and 'fast'
+    """
+    questions = [question for _, question in pairs] * repeat
+    contexts = [context for context, _ in pairs] * repeat
+    
+    start = time.perf_counter()
+    tokens = 0
+    for question, context in zip(questions, contexts):
+        tokens += len(slow_tokenizer(question, context, max_length=max_length, truncation=True)['input_ids'])
+    slow = tokens / (time.perf_counter() - start)
+    
+    start = time.perf_counter()
+    encodings = fast_tokenizer(questions, contexts, max_length=max_length, truncation=True,
+                               return_offsets_mapping=True)
+    tokens = sum(len(ids) for ids in encodings['input_ids'])
+    fast = tokens / (time.perf_counter() - start)
+    
+    return {'slow': slow, 'fast': fast}
 
 def main():
     """
     Main function to demonstrate BERT question answering.
+    
+    Pass --int8 to run the reader with dynamic INT8 quantization (see
+    quantization.py) instead of fp32.
     """
     print("=" * 60)
     print("BERT Question Answering Example")
@@ -98,37 +405,70 @@ def main():
     print("\nLoading dataset...")
     dataset = load_dataset()
     
-    # Initialize BERT model and tokenizer
+    # Initialize BERT model and tokenizer (loaded once, shared with the pipeline)
     print("Loading BERT model...")
     model_name = "bert-base-uncased"
-    tokenizer = BertTokenizer.from_pretrained(model_name)
-    model = BertForQuestionAnswering.from_pretrained(model_name)
-    model.eval()
+    dtype = 'int8' if '--int8' in sys.argv[1:] else 'float32'
+    tokenizer = registry.get_tokenizer(model_name)
+    model = registry.get_model(model_name, dtype=dtype, model_class=BertForQuestionAnswering)
+    registry.warmup(model_name, dtype=dtype)
     
     # Alternative: Use pipeline (easier approach)
     print("\nUsing Hugging Face pipeline (easier approach)...")
-    qa_pipeline = pipeline("question-answering", model=model_name, tokenizer=model_name)
+    qa_pipeline = registry.get_pipeline("question-answering", model_name)
     
     # Get first example from dataset
-    if dataset['data']:
-        first_article = dataset['data'][0]
-        if first_article['paragraphs']:
-            first_paragraph = first_article['paragraphs'][0]
-            context = first_paragraph['context']
-            
-            if first_paragraph['qas']:
-                first_qa = first_paragraph['qas'][0]
-                question = first_qa['question']
-                correct_answer = first_qa['answers'][0]['text']
-                
-                print(f"\nContext: {context[:200]}...")
-                print(f"\nQuestion: {question}")
-                print(f"Correct Answer: {correct_answer}")
-                
-                # Predict using pipeline
-                result = qa_pipeline(question=question, context=context)
-                print(f"\nPredicted Answer: {result['answer']}")
-                print(f"Confidence Score: {result['score']:.4f}")
+    first_record = next(dataset, None)
+    if first_record is None:
+        print("\nThe dataset has no questions.")
+        return
+    _, context, first_qa = first_record
+    question = first_qa['question']
+    correct_answer = first_qa['answers'][0]['text']
+
+    print(f"\nContext: {context[:200]}...")
+    print(f"\nQuestion: {question}")
+    print(f"Correct Answer: {correct_answer}")
+
+    # Predict using pipeline; repeated pairs are served from the answer cache
+    answer_cache = AnswerCache()
+    result = answer_cache.get_or_compute(
+        f"pipeline:{model_name}", model_revision(qa_pipeline.model), context, question,
+        lambda: qa_pipeline(question=question, context=context),
+        lowercase=tokenizer_lowercases(qa_pipeline.tokenizer)
+    )
+    print(f"\nPredicted Answer: {result['answer']}")
+    print(f"Confidence Score: {result['score']:.4f}")
+
+    # Long-context mode: sliding windows with n-best span search
+    long_context = " ".join(context for _, context, _ in load_dataset())
+    print(f"\nLong-context prediction over {len(long_context)} characters...")
+    for candidate in predict_answer_long(long_context, question, model, tokenizer,
+                                         max_length=128, doc_stride=32, n_best=3):
+        print(f"  {candidate['score']:.2f}  [{candidate['start']}:{candidate['end']}]  {candidate['answer']}")
+    
+    # Batched inference over the whole dataset
+    pairs = [(context, qa['question']) for _, context, qa in load_dataset() if not qa['is_impossible']]
+    print(f"\nBatched prediction over {len(pairs)} questions...")
+    throughput = benchmark_batched(pairs, model, tokenizer)
+    print(f"  One question per forward pass: {throughput['single']:.1f} questions/s")
+    print(f"  Length-bucketed batches:       {throughput['batched']:.1f} questions/s")
+    print(f"  Speedup: {throughput['batched'] / throughput['single']:.1f}x")
+    
+    # Tokenization throughput: pure-Python per pair vs Rust-backed batch
+    rates = benchmark_tokenizers(pairs, BertTokenizer.from_pretrained(model_name), tokenizer)
+    print(f"\nTokenization: slow {rates['slow']:.0f} tokens/s, fast {rates['fast']:.0f} tokens/s "
+          f"({rates['fast'] / rates['slow']:.1f}x)")
+    
+    # Questions on the same context reuse its cached tokenization
+    cache = ContextTokenCache(maxsize=256)
+    predict_answers(pairs, model, tokenizer, cache=cache)
+    stats = cache.stats()
+    print(f"\nContext token cache: {stats['hits']} hits, {stats['misses']} misses, "
+          f"{stats['evictions']} evictions ({stats['hit_rate']:.0%} hit rate)")
+    
+    print("\nLoaded models:")
+    registry.print_report()
     
     print("\n" + "=" * 60)
     print("Example completed!")
@@ -0,0 +1,345 @@
+# -*- coding: utf-8 -*-
+"""
+    Project: Question Answering Dataset
+    Description: A dataset containing context passages, questions, and answers for training QA models and reading comprehension systems.
+    Author: Molla Samser
+    Website: https://rskworld.in
+    Contact: help@rskworld.in
+    Phone: +91 93305 39277
+
+    BM25 Passage Retrieval
+    Open-domain QA: questions arrive without a passage, so a BM25 retriever
+    finds candidate passages in contexts.json (or the paragraphs of a SQuAD
+    file) and the BERT reader answers over the top hits. The inverted index
+    keeps its postings in typed NumPy arrays (CSR layout), is saved next to
+    the source file (contexts.json.bm25.npz) and is rebuilt when the source
+    changes. Scores for all query terms are accumulated with one bincount.
+
+    Usage:
+        python bm25_index.py [model_name]
+"""
+
+import json
+import os
+import re
+import sys
+import time
+from array import array
+from collections import Counter
+
+import numpy as np
+
+from bert_example import predict_answer_long
+from model_registry import registry
+from sidecar import file_signature
+from squad_reader import iter_json_array, iter_squad_paragraphs
+
+INDEX_SUFFIX = '.bm25.npz'
+INDEX_VERSION = 1
+_TOKEN = re.compile(r'\w+')
+
+def tokenize(text):
+    """Lowercase word tokens."""
+    return _TOKEN.findall(text.lower())
+
+def iter_passages(file_path):
+    """
+    Stream (passage id, text) pairs from contexts.json or a SQuAD file.
+
+    Both are streamed. SQuAD paragraphs are numbered in file order.
+    """
+    if os.path.basename(file_path) == 'contexts.json':
+        for context in iter_json_array(file_path, 'contexts'):
+            yield str(context['id']), context['text']
+        return
+    for index, (_, paragraph) in enumerate(iter_squad_paragraphs(file_path)):
+        yield str(index), paragraph['context']
+
+def _pack_strings(strings):
+    """Encode strings into one UTF-8 byte array plus int64 offsets."""
+    encoded = [s.encode('utf-8') for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets
+
+class BM25Index:
+    """
+    Okapi BM25 over an inverted index in CSR form.
+
+    Postings of term t are postings_doc[term_offsets[t]:term_offsets[t + 1]]
+    (int32 passage numbers) with matching postings_tf (uint16 term counts).
+    The vocabulary is a sorted string array, so query terms are looked up
+    with a binary search and no dict is rebuilt on load.
+    """
+
+    def __init__(self, arrays, k1=1.2, b=0.75):
+        self.arrays = arrays
+        self.vocab = arrays['vocab']
+        self.term_offsets = arrays['term_offsets']
+        self.postings_doc = arrays['postings_doc']
+        self.postings_tf = arrays['postings_tf'].astype(np.float32)
+        self.doc_lengths = arrays['doc_lengths']
+        self.passage_ids = arrays['passage_ids']
+        self.k1 = k1
+        self.b = b
+        self.num_docs = len(self.doc_lengths)
+        average = float(self.doc_lengths.mean()) if self.num_docs else 1.0
+        # Per-passage part of the BM25 denominator, computed once
+        self.length_norm = (k1 * (1 - b + b * self.doc_lengths / average)).astype(np.float32)
+
+    def __len__(self):
+        return self.num_docs
+
+    @classmethod
+    def build(cls, passages, k1=1.2, b=0.75):
+        """
+        Build an index from (passage id, text) pairs.
+
+        Returns:
+            BM25Index
+        """
+        ids, texts, lengths = [], [], []
+        term_index = {}
+        all_terms, all_docs, all_tfs = array('i'), array('i'), array('i')
+        for doc, (passage_id, text) in enumerate(passages):
+            counts = Counter(tokenize(text))
+            ids.append(passage_id)
+            texts.append(text)
+            lengths.append(sum(counts.values()))
+            for term, count in counts.items():
+                all_terms.append(term_index.setdefault(term, len(term_index)))
+                all_tfs.append(count)
+            all_docs.extend([doc] * len(counts))
+
+        # Renumber terms in sorted order so the vocabulary can be binary searched
+        vocab = np.array(list(term_index), dtype=str)
+        sort_order = np.argsort(vocab, kind='stable')
+        rank = np.empty(len(vocab), dtype=np.int64)
+        rank[sort_order] = np.arange(len(vocab))
+        vocab = vocab[sort_order]
+        term_ids = rank[np.frombuffer(all_terms, dtype=np.int32)]
+        all_docs = np.frombuffer(all_docs, dtype=np.int32)
+        all_tfs = np.frombuffer(all_tfs, dtype=np.int32)
+        lengths = np.array(lengths, dtype=np.int32)
+        order = np.lexsort((all_docs, term_ids))
+
+        term_offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(term_ids, minlength=len(vocab)), out=term_offsets[1:])
+        text_bytes, text_offsets = _pack_strings(texts)
+        arrays = {
+            'version': np.array(INDEX_VERSION),
+            'vocab': vocab,
+            'term_offsets': term_offsets,
+            'postings_doc': all_docs[order],
+            'postings_tf': np.minimum(all_tfs[order], np.iinfo(np.uint16).max).astype(np.uint16),
+            'doc_lengths': lengths,
+            'passage_ids': np.array(ids, dtype=str),
+            'text_bytes': text_bytes,
+            'text_offsets': text_offsets
+        }
+        return cls(arrays, k1, b)
+
+    def save(self, path):
+        """Write the index arrays to an .npz file atomically."""
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp_path, **self.arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, k1=1.2, b=0.75):
+        with np.load(path) as data:
+            arrays = {key: data[key] for key in data.files}
+        return cls(arrays, k1, b)
+
+    @classmethod
+    def from_file(cls, file_path='../contexts.json', rebuild=False):
+        """
+        Load the index persisted next to a passage file, rebuilding it if the file changed.
+
+        Args:
+            file_path (str): contexts.json or a SQuAD file
+            rebuild (bool): Force a fresh build
+
+        Returns:
+            BM25Index
+        """
+        index_path = file_path + INDEX_SUFFIX
+        signature = file_signature(file_path, with_hash=False)
+        if not rebuild and os.path.exists(index_path):
+            index = cls.load(index_path)
+            if (int(index.arrays['version']) == INDEX_VERSION
+                    and json.loads(str(index.arrays['signature'])) == signature):
+                return index
+
+        index = cls.build(iter_passages(file_path))
+        index.arrays['signature'] = np.array(json.dumps(signature))
+        index.save(index_path)
+        return index
+
+    def passage(self, doc):
+        """Return the text of passage number `doc`."""
+        start, end = self.arrays['text_offsets'][doc:doc + 2]
+        return self.arrays['text_bytes'][start:end].tobytes().decode('utf-8')
+
+    def search(self, query, k=5):
+        """
+        Score every passage against a query and return the top k.
+
+        Args:
+            query (str): Question text
+            k (int): Number of passages to return
+
+        Returns:
+            list: (passage number, score) pairs, best first
+        """
+        terms = np.unique(np.array(tokenize(query), dtype=str))
+        if not terms.size or not self.vocab.size:
+            return []
+        positions = np.searchsorted(self.vocab, terms)
+        found = positions < len(self.vocab)
+        found[found] = self.vocab[positions[found]] == terms[found]
+        term_ids = positions[found]
+        if not term_ids.size:
+            return []
+
+        starts = self.term_offsets[term_ids]
+        ends = self.term_offsets[term_ids + 1]
+        df = (ends - starts).astype(np.float32)
+        idf = np.log1p((self.num_docs - df + 0.5) / (df + 0.5))
+        # Gather every posting of every query term into flat arrays
+        counts = ends - starts
+        flat = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        docs = self.postings_doc[flat]
+        tf = self.postings_tf[flat]
+        weights = np.repeat(idf, counts) * tf * (self.k1 + 1) / (tf + self.length_norm[docs])
+        scores = np.bincount(docs, weights=weights, minlength=self.num_docs)
+
+        k = min(k, int(np.count_nonzero(scores)))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [(int(doc), float(scores[doc])) for doc in top]
+
+    def retrieve(self, query, k=5):
+        """
+        Returns:
+            list: Dicts with passage_id, score and text, best first
+        """
+        return [{'passage_id': str(self.passage_ids[doc]), 'score': score, 'text': self.passage(doc)}
+                for doc, score in self.search(query, k)]
+
+def answer_open_domain(question, index, model, tokenizer, k=3, max_length=384, doc_stride=128):
+    """
+    Answer a question without a given passage: retrieve, then read.
+
+    Each of the top k passages goes through the sliding-window reader
+    (predict_answer_long) and the answer with the highest reader score wins.
+
+    Args:
+        question (str): Question to answer
+        index (BM25Index): Passage index
+        model: BERT model for question answering
+        tokenizer: Fast BERT tokenizer
+        k (int): Passages handed to the reader
+
+    Returns:
+        dict: answer, score (reader), passage_id and retrieval_score, or None
+            if no passage shares a term with the question
+    """
+    best = None
+    for hit in index.retrieve(question, k):
+        candidates = predict_answer_long(hit['text'], question, model, tokenizer,
+                                         max_length=max_length, doc_stride=doc_stride, n_best=1)
+        if candidates and (best is None or candidates[0]['score'] > best['score']):
+            best = {'answer': candidates[0]['answer'], 'score': candidates[0]['score'],
+                    'passage_id': hit['passage_id'], 'retrieval_score': hit['score']}
+    return best
+
+def synthetic_passages(texts, count, vocabulary_size=50000, real_word_rate=0.05, seed=0):
+    """
+    Generate distractor passages for benchmarks.
+
+    Words are drawn from a Zipf-distributed synthetic vocabulary, with a
+    fraction taken from the real passages so distractors share terms with
+    the questions.
+
+    Yields:
+        tuple: (passage id, text)
+    """
+    rng = np.random.default_rng(seed)
+    real_words = np.array([word for text in texts for word in text.split()])
+    for i in range(count):
+        length = int(rng.integers(40, 120))
+        words = np.char.add('w', (rng.zipf(1.3, size=length) % vocabulary_size).astype(str))
+        real = rng.random(length) < real_word_rate
+        words[real] = rng.choice(real_words, size=int(real.sum()))
+        yield f"synthetic-{i}", ' '.join(words)
+
+def benchmark_retrieval(contexts_path='../contexts.json', questions_path='../questions.json',
+                        distractors=100000, ks=(1, 3, 5)):
+    """
+    Measure index build time, query latency and recall@k.
+
+    The real passages are mixed with synthetic distractors; a question is a
+    hit at k when its gold passage (context_id in questions.json) is in the
+    top k.
+
+    Returns:
+        dict: passages, build_seconds, query latency in ms (mean, p95) and recall per k
+    """
+    with open(contexts_path, 'r', encoding='utf-8') as f:
+        contexts = json.load(f)['contexts']
+    with open(questions_path, 'r', encoding='utf-8') as f:
+        questions = json.load(f)['questions']
+    passages = [(str(c['id']), c['text']) for c in contexts]
+    passages += synthetic_passages([text for _, text in passages], distractors)
+
+    start = time.perf_counter()
+    index = BM25Index.build(passages)
+    build_seconds = time.perf_counter() - start
+
+    latencies = []
+    hits = {k: 0 for k in ks}
+    for q in questions:
+        start = time.perf_counter()
+        results = index.search(q['question'], max(ks))
+        latencies.append((time.perf_counter() - start) * 1000)
+        ranked = [str(index.passage_ids[doc]) for doc, _ in results]
+        for k in ks:
+            hits[k] += str(q['context_id']) in ranked[:k]
+    return {
+        'passages': len(index),
+        'build_seconds': build_seconds,
+        'query_ms': {'mean': float(np.mean(latencies)), 'p95': float(np.percentile(latencies, 95))},
+        'recall': {k: hits[k] / len(questions) for k in ks}
+    }
+
+def main():
+    """
+    Benchmark the retriever, then answer questions.json without their passages.
+    """
+    print("=" * 60)
+    print("BM25 Passage Retrieval for Open-Domain QA")
+    print("Author: Molla Samser - https://rskworld.in")
+    print("=" * 60)
+
+    result = benchmark_retrieval()
+    print(f"\nIndexed {result['passages']} passages in {result['build_seconds']:.2f} s")
+    print(f"Query latency: {result['query_ms']['mean']:.2f} ms mean, {result['query_ms']['p95']:.2f} ms p95")
+    print("Recall: " + ", ".join(f"@{k} {recall:.0%}" for k, recall in result['recall'].items()))
+
+    model_name = sys.argv[1] if len(sys.argv) > 1 else "bert-base-uncased"
+    model = registry.get_model(model_name)
+    tokenizer = registry.get_tokenizer(model_name)
+    index = BM25Index.from_file('../contexts.json')
+    with open('../questions.json', 'r', encoding='utf-8') as f:
+        questions = json.load(f)['questions']
+    print()
+    for q in questions[:5]:
+        best = answer_open_domain(q['question'], index, model, tokenizer)
+        if best is not None:
+            print(f"  {q['question']}\n    -> {best['answer']!r} (passage {best['passage_id']})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,417 @@
+# -*- coding: utf-8 -*-
+"""
+    Project: Question Answering Dataset
+    Description: A dataset containing context passages, questions, and answers for training QA models and reading comprehension systems.
+    Author: Molla Samser
+    Website: https://rskworld.in
+    Contact: help@rskworld.in
+    Phone: +91 93305 39277
+
+    Columnar Store: Compiled Memory-Mapped Dataset Format
+    Compiles squad_format.json, dataset.csv or the normalized
+    questions/contexts/answers JSON files into a single columnar binary file
+    that opens with mmap in milliseconds and slices without copying.
+
+    Usage:
+        python columnar_store.py ../squad_format.json
+"""
+
+import csv
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+
+import numpy as np
+
+from squad_reader import iter_squad_articles
+
+MAGIC = b'QACOL02\n'
+EXTENSION = '.qacol'
+ALIGNMENT = 8
+
+# String columns are stored as a UTF-8 heap plus an int64 offsets array
+STRING_COLUMNS = ('ids', 'questions', 'answers', 'contexts', 'domains')
+# Fixed-width columns, one entry per question
+NUMERIC_COLUMNS = {
+    'question_context': 'int32',
+    'answer_start': 'int32',
+    'domain': 'int32',
+    'is_impossible': 'uint8',
+    # Paragraph number; consecutive questions of one paragraph share it
+    'paragraph': 'int32',
+}
+
+class StringColumn:
+    """
+    Read-only view over a string heap and its offsets.
+
+    Slicing with a step of 1 returns another StringColumn sharing the same
+    buffers, so no string data is copied until an element is decoded.
+    """
+
+    def __init__(self, offsets, heap):
+        self.offsets = offsets
+        self.heap = heap
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("StringColumn slices must be contiguous")
+            stop = max(start, stop)
+            return StringColumn(self.offsets[start:stop + 1], self.heap)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self.heap[self.offsets[index]:self.offsets[index + 1]].tobytes().decode('utf-8')
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def raw(self, index):
+        """Return the UTF-8 bytes of one element as a zero-copy memoryview."""
+        return memoryview(self.heap[self.offsets[index]:self.offsets[index + 1]])
+
+    def byte_lengths(self):
+        """Return the UTF-8 length of every element as an int64 array."""
+        return np.diff(self.offsets)
+
+    def char_lengths(self):
+        """Return the character length of every element, computed without decoding."""
+        start, stop = int(self.offsets[0]), int(self.offsets[-1])
+        # Every UTF-8 byte except continuation bytes (10xxxxxx) starts a character
+        is_lead = (self.heap[start:stop] & 0xC0) != 0x80
+        cumulative = np.concatenate(([0], np.cumsum(is_lead, dtype=np.int64)))
+        return cumulative[self.offsets[1:] - start] - cumulative[self.offsets[:-1] - start]
+
+class ColumnarStore:
+    """
+    Memory-mapped view of a compiled .qacol file.
+
+    Attributes:
+        ids, questions, answers (StringColumn): One entry per question
+        contexts, domains (StringColumn): Deduplicated lookup tables
+        question_context, answer_start, domain, is_impossible (np.ndarray): One entry per question
+        meta (dict): Source information recorded at compile time
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a compiled QA store")
+        (header_length,) = struct.unpack_from('<Q', self._mmap, len(MAGIC))
+        header_start = len(MAGIC) + 8
+        header = json.loads(self._mmap[header_start:header_start + header_length].decode('utf-8'))
+        self.meta = header['meta']
+        arrays = {}
+        for name, spec in header['arrays'].items():
+            arrays[name] = np.frombuffer(self._mmap, dtype=spec['dtype'],
+                                         count=spec['count'], offset=spec['offset'])
+        for name in STRING_COLUMNS:
+            setattr(self, name, StringColumn(arrays[f'{name}.offsets'], arrays[f'{name}.heap']))
+        for name in NUMERIC_COLUMNS:
+            setattr(self, name, arrays[name])
+
+    def __len__(self):
+        return len(self.questions)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """
+        Drop the store's column views and unmap the file.
+
+        Raises:
+            BufferError: If arrays taken from the store are still referenced
+        """
+        for name in (*STRING_COLUMNS, *NUMERIC_COLUMNS):
+            self.__dict__.pop(name, None)
+        self._mmap.close()
+
+    def record(self, index):
+        """
+        Rebuild one question as a flat SQuAD record.
+
+        Args:
+            index (int): Question position in the store
+
+        Returns:
+            tuple: (article title, context, qa dict), as yielded by iter_squad_records
+        """
+        context = self.contexts[int(self.question_context[index])]
+        title = self.domains[int(self.domain[index])]
+        answer_start = int(self.answer_start[index])
+        is_impossible = bool(self.is_impossible[index])
+        answers = [] if is_impossible else [{'text': self.answers[index], 'answer_start': answer_start}]
+        qa = {
+            'id': self.ids[index],
+            'question': self.questions[index],
+            'answers': answers,
+            'is_impossible': is_impossible
+        }
+        return title, context, qa
+
+    def iter_records(self, start=0, stop=None):
+        """Yield flat (title, context, qa) records for questions[start:stop]."""
+        stop = len(self) if stop is None else min(stop, len(self))
+        for i in range(start, stop):
+            yield self.record(i)
+
+class _StringHeapWriter:
+    """Spools one string column to a temporary file while recording offsets."""
+
+    def __init__(self):
+        self.file = tempfile.TemporaryFile()
+        self.offsets = array('q', [0])
+
+    def append(self, text):
+        data = text.encode('utf-8')
+        self.file.write(data)
+        self.offsets.append(self.offsets[-1] + len(data))
+        return len(self.offsets) - 2
+
+class _InternTable:
+    """String column that stores each distinct value once and returns its index."""
+
+    def __init__(self, hashed=False):
+        self.heap = _StringHeapWriter()
+        self.index = {}
+        self.hashed = hashed
+
+    def intern(self, text):
+        key = hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest() if self.hashed else text
+        position = self.index.get(key)
+        if position is None:
+            position = self.heap.append(text)
+            self.index[key] = position
+        return position
+
+def _source_kind(source_path):
+    """Classify a source file as 'csv', 'normalized' or 'squad'."""
+    if source_path.lower().endswith('.csv'):
+        return 'csv'
+    if os.path.basename(source_path) in ('questions.json', 'contexts.json', 'answers.json'):
+        return 'normalized'
+    return 'squad'
+
+def _source_files(source_path):
+    """List every file a compiled store depends on."""
+    if _source_kind(source_path) == 'normalized':
+        directory = os.path.dirname(source_path)
+        return [os.path.join(directory, name) for name in ('questions.json', 'contexts.json', 'answers.json')]
+    return [source_path]
+
+def _iter_source_rows(source_path, meta):
+    """
+    Yield (id, context, question, answer, answer_start, domain, is_impossible,
+    paragraph) rows from any supported source format. CSV rows have no
+    paragraphs, so a run of rows sharing context and domain counts as one.
+    """
+    kind = _source_kind(source_path)
+    if kind == 'squad':
+        header = {}
+        articles = 0
+        paragraph_number = 0
+        for title, paragraphs, _ in iter_squad_articles(source_path, header=header):
+            articles += 1
+            for paragraph in paragraphs:
+                paragraph_number += 1
+                context = paragraph['context']
+                for qa in paragraph['qas']:
+                    answers = qa.get('answers') or []
+                    impossible = bool(qa.get('is_impossible', False)) or not answers
+                    answer = answers[0] if answers else {'text': '', 'answer_start': -1}
+                    yield (str(qa['id']), context, qa['question'], answer['text'],
+                           answer['answer_start'], title, impossible, paragraph_number)
+        meta.update(header)
+        # Titles can repeat, so the article count is not recoverable from the domain column
+        meta['articles'] = articles
+    elif kind == 'csv':
+        with open(source_path, 'r', encoding='utf-8', newline='') as f:
+            paragraph_number, previous = 0, None
+            for row in csv.DictReader(f):
+                context = row['context']
+                answer = row['answer']
+                if (context, row['domain']) != previous:
+                    paragraph_number += 1
+                    previous = (context, row['domain'])
+                yield (str(row['question_id']), context, row['question'], answer,
+                       context.find(answer), row['domain'], not answer, paragraph_number)
+    else:
+        questions_path, contexts_path, answers_path = _source_files(source_path)
+        with open(contexts_path, 'r', encoding='utf-8') as f:
+            contexts = {c['id']: c['text'] for c in json.load(f)['contexts']}
+        with open(answers_path, 'r', encoding='utf-8') as f:
+            answers = {}
+            for a in json.load(f)['answers']:
+                answers.setdefault(a['question_id'], a)
+        with open(questions_path, 'r', encoding='utf-8') as f:
+            questions = json.load(f)['questions']
+        for q in questions:
+            answer = answers.get(q['id'])
+            yield (str(q['id']), contexts[q['context_id']], q['question'],
+                   answer['answer'] if answer else '', answer['answer_start'] if answer else -1,
+                   q.get('domain', ''), answer is None, q['context_id'])
+
+def compiled_path(source_path):
+    """
+    Return the path of the compiled store for a source file.
+
+    Args:
+        source_path (str): squad_format.json, dataset.csv or questions.json
+
+    Returns:
+        str: Path with the .qacol extension
+    """
+    return os.path.splitext(source_path)[0] + EXTENSION
+
+def compile_dataset(source_path, output_path=None):
+    """
+    Compile a dataset file into the columnar binary format.
+
+    Args:
+        source_path (str): squad_format.json, dataset.csv or questions.json
+            (the latter is joined with contexts.json and answers.json from the same directory)
+        output_path (str): Destination file, defaults to compiled_path(source_path)
+
+    Returns:
+        str: Path of the written store
+    """
+    output_path = output_path or compiled_path(source_path)
+    meta = {'source': os.path.basename(source_path), 'kind': _source_kind(source_path)}
+
+    heaps = {name: _StringHeapWriter() for name in ('ids', 'questions', 'answers')}
+    contexts = _InternTable(hashed=True)
+    domains = _InternTable()
+    numeric = {name: array('q') for name in NUMERIC_COLUMNS}
+
+    rows = _iter_source_rows(source_path, meta)
+    for qid, context, question, answer, answer_start, domain, impossible, paragraph in rows:
+        heaps['ids'].append(qid)
+        heaps['questions'].append(question)
+        heaps['answers'].append(answer)
+        numeric['question_context'].append(contexts.intern(context))
+        numeric['answer_start'].append(answer_start)
+        numeric['domain'].append(domains.intern(domain))
+        numeric['is_impossible'].append(1 if impossible else 0)
+        numeric['paragraph'].append(paragraph)
+    heaps['contexts'] = contexts.heap
+    heaps['domains'] = domains.heap
+
+    # Lay out every array at an aligned offset after the header
+    sections = []
+    for name in STRING_COLUMNS:
+        writer = heaps[name]
+        sections.append((f'{name}.offsets', 'int64', len(writer.offsets), writer.offsets))
+        sections.append((f'{name}.heap', 'uint8', writer.offsets[-1], writer.file))
+    for name, dtype in NUMERIC_COLUMNS.items():
+        sections.append((name, dtype, len(numeric[name]), numeric[name]))
+
+    def layout(data_start):
+        specs = {}
+        position = data_start
+        for name, dtype, count, _ in sections:
+            position = -(-position // ALIGNMENT) * ALIGNMENT
+            specs[name] = {'dtype': dtype, 'count': count, 'offset': position}
+            position += count * np.dtype(dtype).itemsize
+        return specs
+
+    # The header size depends on the offsets it records, so iterate until stable
+    data_start = 0
+    while True:
+        header = json.dumps({'meta': meta, 'arrays': layout(data_start)}).encode('utf-8')
+        needed = -(-(len(MAGIC) + 8 + len(header)) // ALIGNMENT) * ALIGNMENT
+        if needed == data_start:
+            break
+        data_start = needed
+    specs = layout(data_start)
+
+    tmp_path = output_path + '.tmp'
+    with open(tmp_path, 'wb') as out:
+        out.write(MAGIC)
+        out.write(struct.pack('<Q', len(header)))
+        out.write(header)
+        for name, dtype, _, source in sections:
+            out.write(b'\0' * (specs[name]['offset'] - out.tell()))
+            if hasattr(source, 'read'):
+                source.seek(0)
+                while True:
+                    chunk = source.read(1 << 20)
+                    if not chunk:
+                        break
+                    out.write(chunk)
+                source.close()
+            else:
+                out.write(np.asarray(source, dtype=dtype).tobytes())
+    os.replace(tmp_path, output_path)
+    return output_path
+
+def open_store(path):
+    """
+    Open a compiled store with mmap.
+
+    Args:
+        path (str): Path to a .qacol file
+
+    Returns:
+        ColumnarStore: Memory-mapped store
+    """
+    return ColumnarStore(path)
+
+def open_compiled(source_path):
+    """
+    Open the compiled store for a source file if it exists and is up to date.
+
+    Args:
+        source_path (str): Original dataset file
+
+    Returns:
+        ColumnarStore or None: The store, or None if it is missing or older than its sources
+    """
+    path = compiled_path(source_path)
+    if not os.path.exists(path):
+        return None
+    compiled_mtime = os.path.getmtime(path)
+    for source in _source_files(source_path):
+        if os.path.exists(source) and os.path.getmtime(source) > compiled_mtime:
+            return None
+    return ColumnarStore(path)
+
+def main():
+    """
+    Compile the dataset files given on the command line (or all of them).
+    """
+    print("=" * 60)
+    print("Compiling Columnar Dataset Store")
+    print("Author: Molla Samser - https://rskworld.in")
+    print("=" * 60)
+
+    sources = sys.argv[1:] or ['../squad_format.json', '../dataset.csv', '../questions.json']
+    for source in sources:
+        output = compile_dataset(source)
+        with open_store(output) as store:
+            print(f"\n{source} -> {output}")
+            print(f"  Questions: {len(store)}")
+            print(f"  Unique contexts: {len(store.contexts)}")
+            print(f"  Domains: {len(store.domains)}")
+            print(f"  Size: {os.path.getsize(output)} bytes")
+
+if __name__ == "__main__":
+    main()
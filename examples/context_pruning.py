@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+"""
+    Project: Question Answering Dataset
+    Description: A dataset containing context passages, questions, and answers for training QA models and reading comprehension systems.
+    Author: Molla Samser
+    Website: https://rskworld.in
+    Contact: help@rskworld.in
+    Phone: +91 93305 39277
+
+    Sentence-Level Context Pruning
+    Long passages (such as the "Read the following passage" items of the
+    board English papers) overflow BERT's 512 tokens even when the answer
+    sits in a single sentence. The context is split into sentences, each
+    sentence is scored against the question by IDF-weighted term overlap,
+    and the best sentences plus their neighbours are kept within a token
+    budget. The reader sees only the pruned text; answer offsets are mapped
+    back to the original context.
+
+    Usage:
+        python context_pruning.py [model_name] [token_budget]
+"""
+
+import math
+import re
+import sys
+import time
+
+import numpy as np
+
+from bert_example import load_dataset, predict_answer_long
+from bm25_index import tokenize
+from model_registry import registry
+from squad_metrics import gold_answers, score_prediction
+
+# A sentence runs up to terminal punctuation (plus closing quotes/brackets) or the end of the text
+SENTENCE_PATTERN = re.compile(r'\S.*?(?:[.!?]+["\'”)\]]*(?=\s|$)|$)', re.S)
+
+# Words whose trailing period does not end a sentence (single initials such as "J." are handled too)
+ABBREVIATIONS = frozenset(
+    'mr mrs ms dr prof sr jr st mt gen col capt lt sgt rev hon no vol fig approx dept est inc ltd co '
+    'jan feb mar apr jun jul aug sep sept oct nov dec e.g i.e vs cf'.split()
+)
+
+STOPWORDS = frozenset(
+    'a an and are as at be by did do does for from had has have how in is it its of on or that the '
+    'their this to was were what when where which who whom whose why will with'.split()
+)
+
+def split_sentences(context):
+    """
+    Split a context into sentences.
+
+    A period after a common abbreviation ("Dr.", "e.g.") or a single
+    initial does not end a sentence, and neither does punctuation followed
+    by a lowercase word ('"Why?" asked Bob.').
+
+    Returns:
+        list: (start, end) character spans, in order
+    """
+    spans = []
+    merge = False
+    for match in SENTENCE_PATTERN.finditer(context):
+        if spans and (merge or match.group()[0].islower()):
+            spans[-1] = (spans[-1][0], match.end())
+        else:
+            spans.append(match.span())
+        last_word = context[spans[-1][0]:spans[-1][1]].rsplit(None, 1)[-1]
+        stem = last_word.lower().lstrip('("\'“')[:-1]
+        merge = last_word.endswith('.') and (stem in ABBREVIATIONS or (len(stem) == 1 and stem.isalpha()))
+    return spans
+
+def score_sentences(sentences, question):
+    """
+    Score sentences by the IDF-weighted overlap of their terms with the question.
+
+    Document frequencies are counted over the sentences of this one
+    context, so terms that appear everywhere in the passage count little.
+
+    Args:
+        sentences (list): Sentence strings
+        question (str): Question text
+
+    Returns:
+        np.ndarray: One score per sentence
+    """
+    query_terms = set(tokenize(question)) - STOPWORDS
+    sentence_terms = [set(tokenize(sentence)) & query_terms for sentence in sentences]
+    document_frequency = {}
+    for terms in sentence_terms:
+        for term in terms:
+            document_frequency[term] = document_frequency.get(term, 0) + 1
+    idf = {term: math.log(1 + len(sentences) / df) for term, df in document_frequency.items()}
+    return np.array([sum(idf[term] for term in terms) for terms in sentence_terms], dtype=np.float64)
+
+def prune_context(context, question, tokenizer, token_budget=192, neighbours=1):
+    """
+    Keep the sentences most relevant to the question within a token budget.
+
+    Sentences are taken best score first, each together with up to
+    `neighbours` sentences on either side (pronouns and answers often sit
+    next to the sentence that matches the question). When the group does
+    not fit the remaining budget the sentence is tried alone, and skipped
+    if it still does not fit. Kept sentences stay in their original order;
+    runs of adjacent sentences are copied verbatim and separate runs are
+    joined with a space.
+
+    Args:
+        context (str): Context passage
+        question (str): Question to answer
+        tokenizer: Tokenizer used to count tokens per sentence
+        token_budget (int): Most context tokens to keep
+        neighbours (int): Sentences kept on either side of a selected sentence
+
+    Returns:
+        tuple: (pruned context, segments) where segments are
+            (pruned start, original start, length) character spans
+    """
+    spans = split_sentences(context)
+    sentences = [context[start:end] for start, end in spans]
+    if not sentences:
+        return context, [(0, 0, len(context))]
+    lengths = [len(ids) for ids in tokenizer(sentences, add_special_tokens=False)['input_ids']]
+    if sum(lengths) <= token_budget:
+        return context, [(0, 0, len(context))]
+
+    scores = score_sentences(sentences, question)
+    keep = set()
+    used = 0
+    for best in sorted(range(len(sentences)), key=lambda i: (-scores[i], i)):
+        group = [i for i in range(best - neighbours, best + neighbours + 1)
+                 if 0 <= i < len(sentences) and i not in keep]
+        # Fall back to the sentence alone when its neighbours do not fit
+        for candidate in (group, [i for i in group if i == best]):
+            cost = sum(lengths[i] for i in candidate)
+            if candidate and used + cost <= token_budget:
+                keep.update(candidate)
+                used += cost
+                break
+        if used >= token_budget:
+            break
+    if not keep:
+        # Not even one sentence fits; let the reader's sliding window handle the best one
+        keep = {int(np.argmax(scores))}
+
+    pieces, segments, position = [], [], 0
+    kept = sorted(keep)
+    run_start = kept[0]
+    for previous, current in zip(kept, kept[1:] + [None]):
+        if current == previous + 1:
+            continue
+        start, end = spans[run_start][0], spans[previous][1]
+        if pieces:
+            pieces.append(' ')
+            position += 1
+        pieces.append(context[start:end])
+        segments.append((position, start, end - start))
+        position += end - start
+        run_start = current
+    return ''.join(pieces), segments
+
+def _segment_index(segments, offset, is_end=False):
+    """Return the segment holding a pruned offset (an end offset belongs to the segment it closes)."""
+    for index in range(len(segments) - 1, -1, -1):
+        pruned_start = segments[index][0]
+        if offset > pruned_start or (offset == pruned_start and not is_end):
+            return index
+    return 0
+
+def to_original_offset(segments, offset, is_end=False):
+    """Map a character offset in the pruned context back to the original context."""
+    pruned_start, original_start, length = segments[_segment_index(segments, offset, is_end)]
+    return original_start + min(max(offset - pruned_start, 0), length)
+
+def predict_answer_pruned(context, question, model, tokenizer, token_budget=192, neighbours=1, n_best=5, **kwargs):
+    """
+    Prune the context, answer over the pruned text and map the answers back.
+
+    Spans that cross the join between two kept runs would map back to an
+    original slice containing pruned text, so they are dropped. Extra
+    keyword arguments go to predict_answer_long.
+
+    Returns:
+        list: Up to n_best dicts with answer, score, start and end (character
+            offsets into the original context), best first
+    """
+    pruned, segments = prune_context(context, question, tokenizer, token_budget, neighbours)
+    # Ask for extra candidates to make up for the ones dropped at the joins
+    candidates = predict_answer_long(pruned, question, model, tokenizer, n_best=n_best * len(segments), **kwargs)
+    answers = []
+    for answer in candidates:
+        if _segment_index(segments, answer['start']) != _segment_index(segments, answer['end'], is_end=True):
+            continue
+        start = to_original_offset(segments, answer['start'])
+        end = to_original_offset(segments, answer['end'], is_end=True)
+        answers.append({'answer': context[start:end], 'score': answer['score'], 'start': start, 'end': end})
+        if len(answers) == n_best:
+            break
+    return answers
+
+def long_context_examples(file_path='../squad_format.json', padding_paragraphs=8):
+    """
+    Build long-passage examples from a SQuAD file.
+
+    Each answerable QA's paragraph is embedded among `padding_paragraphs`
+    other paragraphs of the file (half before, half after), so the passage
+    reads like a long comprehension text with the answer in one place.
+
+    Returns:
+        list: (long context, question, reference answers) tuples
+    """
+    records = [(context, qa) for _, context, qa in load_dataset(file_path)]
+    paragraphs = list(dict.fromkeys(context for context, _ in records))
+    examples = []
+    for context, qa in records:
+        if qa.get('is_impossible') or not qa.get('answers'):
+            continue
+        others = [p for p in paragraphs if p != context] or [context]
+        padding = [others[i % len(others)] for i in range(padding_paragraphs)]
+        half = padding_paragraphs // 2
+        long_context = ' '.join(padding[:half] + [context] + padding[half:])
+        examples.append((long_context, qa['question'], gold_answers(qa)))
+    return examples
+
+def benchmark_pruning(model, tokenizer, examples, token_budget=192, neighbours=1):
+    """
+    Compare the reader on full and pruned contexts.
+
+    Args:
+        model: BERT model for question answering
+        tokenizer: Fast tokenizer for the model
+        examples (list): (context, question, reference answers) tuples
+        token_budget (int): Context tokens kept by pruning
+        neighbours (int): Sentences kept around each selected sentence
+
+    Returns:
+        dict: Mean latency (ms), EM and F1 for 'full' and 'pruned', the
+            latency saved, and how often the gold answer survived pruning
+    """
+    results = {}
+    for mode in ('full', 'pruned'):
+        latencies, em_total, f1_total = [], 0.0, 0.0
+        for context, question, truths in examples:
+            start = time.perf_counter()
+            if mode == 'full':
+                answers = predict_answer_long(context, question, model, tokenizer, n_best=1)
+            else:
+                answers = predict_answer_pruned(context, question, model, tokenizer, token_budget,
+                                                neighbours, n_best=1)
+            latencies.append((time.perf_counter() - start) * 1000)
+            em, f1 = score_prediction(answers[0]['answer'] if answers else '', truths)
+            em_total += em
+            f1_total += f1
+        count = len(examples) or 1
+        results[mode] = {'latency_ms': float(np.mean(latencies)) if latencies else 0.0,
+                         'exact_match': 100.0 * em_total / count, 'f1': 100.0 * f1_total / count}
+
+    retained = sum(
+        any(truth in prune_context(context, question, tokenizer, token_budget, neighbours)[0] for truth in truths)
+        for context, question, truths in examples
+    )
+    full_ms = results['full']['latency_ms']
+    results['latency_saved'] = 1 - results['pruned']['latency_ms'] / full_ms if full_ms else 0.0
+    results['answer_retained'] = retained / (len(examples) or 1)
+    return results
+
+def main():
+    """
+    Report latency and EM/F1 with and without context pruning on long passages.
+    """
+    print("=" * 60)
+    print("Sentence-Level Context Pruning")
+    print("Author: Molla Samser - https://rskworld.in")
+    print("=" * 60)
+
+    model_name = sys.argv[1] if len(sys.argv) > 1 else "bert-base-uncased"
+    token_budget = int(sys.argv[2]) if len(sys.argv) > 2 else 192
+    model = registry.get_model(model_name)
+    tokenizer = registry.get_tokenizer(model_name)
+    registry.warmup(model_name)
+
+    examples = long_context_examples()
+    result = benchmark_pruning(model, tokenizer, examples, token_budget)
+    print(f"\n{len(examples)} long passages, token budget {token_budget}")
+    for mode in ('full', 'pruned'):
+        scores = result[mode]
+        print(f"  {mode:7s} {scores['latency_ms']:7.1f} ms  EM {scores['exact_match']:5.1f}  F1 {scores['f1']:5.1f}")
+    print(f"  Latency saved: {result['latency_saved']:.0%}, gold answer kept in {result['answer_retained']:.0%} of pruned contexts")
+    print(f"  EM change: {result['pruned']['exact_match'] - result['full']['exact_match']:+.1f}, "
+          f"F1 change: {result['pruned']['f1'] - result['full']['f1']:+.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+"""
+    Project: Question Answering Dataset
+    Description: A dataset containing context passages, questions, and answers for training QA models and reading comprehension systems.
+    Author: Molla Samser
+    Website: https://rskworld.in
+    Contact: help@rskworld.in
+    Phone: +91 93305 39277
+
+    Dataset Statistics Engine
+    Computes counts, per-domain breakdowns and context/question/answer length
+    histograms in one pass and caches them in a sidecar file
+    (e.g. dataset.csv.stats.json) keyed by size, mtime and content hash.
+    Unchanged files return the cached stats; files that only grew by
+    appending (CSV) are updated by scanning the new bytes.
+
+    Usage:
+        python dataset_stats.py ../squad_format.json ../dataset.csv
+"""
+
+import os
+import sys
+from array import array
+
+import numpy as np
+import pandas as pd
+
+from columnar_store import open_compiled
+from sidecar import file_signature, hash_file, is_unchanged, load_sidecar, save_sidecar
+from squad_reader import iter_squad_articles
+
+STATS_VERSION = 3
+SIDECAR_SUFFIX = 'stats.json'
+LENGTH_FIELDS = ('context', 'question', 'answer')
+# Lower edges of the length histogram bins, in characters
+LENGTH_BIN_EDGES = [0, 16, 32, 64, 128, 256, 512, 1024, 2048, 4096, 8192]
+
+def _length_summary(lengths):
+    """Summarize an array of lengths into a mergeable histogram."""
+    lengths = np.asarray(lengths, dtype=np.int64)
+    bins = np.searchsorted(LENGTH_BIN_EDGES, lengths, side='right') - 1
+    return {
+        'bin_edges': LENGTH_BIN_EDGES,
+        'counts': np.bincount(bins, minlength=len(LENGTH_BIN_EDGES)).tolist(),
+        'total': int(lengths.size),
+        'sum': int(lengths.sum()),
+        'max': int(lengths.max()) if lengths.size else 0
+    }
+
+def _domain_counts(domains):
+    """Count occurrences of each domain with np.unique."""
+    values, counts = np.unique(np.asarray(domains, dtype=object).astype(str), return_counts=True)
+    return {str(v): int(c) for v, c in zip(values, counts)}
+
+def _merge_stats(base, delta):
+    """Add the counts, domains and histograms of `delta` into `base`."""
+    for key, value in delta['counts'].items():
+        base['counts'][key] = base['counts'].get(key, 0) + value
+    for domain, count in delta['domains'].items():
+        base['domains'][domain] = base['domains'].get(domain, 0) + count
+    for field in LENGTH_FIELDS:
+        a, b = base['lengths'][field], delta['lengths'][field]
+        a['counts'] = [x + y for x, y in zip(a['counts'], b['counts'])]
+        a['total'] += b['total']
+        a['sum'] += b['sum']
+        a['max'] = max(a['max'], b['max'])
+    return base
+
+def _scan_csv(file_path, offset=0, fieldnames=None, chunksize=100000):
+    """
+    Compute stats for the rows of a CSV file starting at a byte offset.
+
+    Returns:
+        tuple: (stats dict, list of column names)
+    """
+    stats = {
+        'counts': {'questions': 0},
+        'domains': {},
+        'lengths': {field: _length_summary([]) for field in LENGTH_FIELDS}
+    }
+    if offset >= os.path.getsize(file_path):
+        return stats, fieldnames
+    with open(file_path, 'rb') as f:
+        f.seek(offset)
+        options = {'chunksize': chunksize, 'dtype': str, 'keep_default_na': False}
+        if offset:
+            options.update(header=None, names=fieldnames)
+        for chunk in pd.read_csv(f, **options):
+            fieldnames = list(chunk.columns)
+            delta = {
+                'counts': {'questions': len(chunk)},
+                'domains': {str(k): int(v) for k, v in chunk['domain'].value_counts().items()},
+                'lengths': {field: _length_summary(chunk[field].str.len().to_numpy())
+                            for field in LENGTH_FIELDS}
+            }
+            _merge_stats(stats, delta)
+    return stats, fieldnames
+
+def _scan_squad(file_path):
+    """
+    Compute stats for a SQuAD file, from its compiled store when one is up
+    to date, otherwise by streaming the JSON.
+
+    Returns:
+        dict: Stats and the dataset version
+    """
+    store = open_compiled(file_path)
+    if store is not None:
+        with store:
+            answerable = store.is_impossible == 0
+            domain_names = list(store.domains)
+            domain_counts = np.bincount(store.domain, minlength=len(domain_names))
+            # First question of each paragraph (paragraphs without questions have no rows)
+            starts = np.flatnonzero(np.diff(store.paragraph, prepend=-1))
+            return {
+                'version': store.meta.get('version', 'N/A'),
+                'counts': {
+                    'articles': store.meta['articles'],
+                    'paragraphs': len(starts),
+                    'questions': len(store),
+                    'impossible': int((~answerable).sum())
+                },
+                'domains': {name: int(count) for name, count in zip(domain_names, domain_counts)},
+                'lengths': {
+                    'context': _length_summary(store.contexts.char_lengths()[store.question_context[starts]]),
+                    'question': _length_summary(store.questions.char_lengths()),
+                    'answer': _length_summary(store.answers.char_lengths()[answerable])
+                }
+            }
+
+    header = {}
+    articles = 0
+    domains = []
+    lengths = {field: array('q') for field in LENGTH_FIELDS}
+    paragraphs = 0
+    impossible = 0
+    for title, article_paragraphs, _ in iter_squad_articles(file_path, header=header):
+        articles += 1
+        for paragraph in article_paragraphs:
+            # Paragraphs without questions are not counted, matching the compiled store
+            if not paragraph['qas']:
+                continue
+            paragraphs += 1
+            lengths['context'].append(len(paragraph['context']))
+            for qa in paragraph['qas']:
+                domains.append(title)
+                lengths['question'].append(len(qa['question']))
+                if qa.get('is_impossible') or not qa.get('answers'):
+                    impossible += 1
+                else:
+                    lengths['answer'].append(len(qa['answers'][0]['text']))
+    return {
+        'version': header.get('version', 'N/A'),
+        'counts': {
+            'articles': articles,
+            'paragraphs': paragraphs,
+            'questions': len(domains),
+            'impossible': impossible
+        },
+        'domains': _domain_counts(domains),
+        'lengths': {field: _length_summary(np.frombuffer(lengths[field], dtype=np.int64))
+                    for field in LENGTH_FIELDS}
+    }
+
+def compute_stats(file_path, use_cache=True):
+    """
+    Return statistics for squad_format.json or dataset.csv.
+
+    The result is cached in a sidecar file. On later calls an unchanged
+    file returns the cached stats without parsing; a CSV whose previous
+    content is an unchanged prefix of the current file only has its new
+    rows scanned.
+
+    Only the file itself is counted: QAs still waiting in a SQuAD file's
+    delta log (.delta.jsonl, see ingest_log.py) are not included, although
+    the example loaders merge them in. Compact the log first to count them.
+
+    Args:
+        file_path (str): Path to a SQuAD JSON or CSV file
+        use_cache (bool): Whether to read and write the sidecar
+
+    Returns:
+        dict: counts, domains, lengths (histograms), signature and cache status
+    """
+    is_csv = file_path.lower().endswith('.csv')
+    cached = load_sidecar(file_path, SIDECAR_SUFFIX) if use_cache else None
+    if cached is not None and cached.get('stats_version') != STATS_VERSION:
+        cached = None
+
+    stat = os.stat(file_path)
+    if cached is not None:
+        signature = cached['signature']
+        if is_unchanged(file_path, signature):
+            if stat.st_mtime != signature['mtime']:
+                # Touched but not modified: refresh the mtime so the next call is instant
+                signature['mtime'] = stat.st_mtime
+                save_sidecar(file_path, SIDECAR_SUFFIX, cached)
+            cached['cache'] = 'hit'
+            return cached
+        if is_csv and stat.st_size > signature['size']:
+            hasher = hash_file(file_path, length=signature['size'])
+            if hasher.hexdigest() == signature['sha256']:
+                delta, _ = _scan_csv(file_path, offset=signature['size'],
+                                     fieldnames=cached['fieldnames'])
+                stats = _merge_stats(cached, delta)
+                hash_file(file_path, hasher=hasher, offset=signature['size'])
+                stats['signature'] = {'size': stat.st_size, 'mtime': stat.st_mtime,
+                                      'sha256': hasher.hexdigest()}
+                if use_cache:
+                    save_sidecar(file_path, SIDECAR_SUFFIX, stats)
+                stats['cache'] = 'incremental'
+                return stats
+
+    signature = file_signature(file_path)
+    if is_csv:
+        stats, fieldnames = _scan_csv(file_path)
+        stats['fieldnames'] = fieldnames
+    else:
+        stats = _scan_squad(file_path)
+    stats['stats_version'] = STATS_VERSION
+    stats['format'] = 'csv' if is_csv else 'squad'
+    stats['signature'] = signature
+    if use_cache:
+        save_sidecar(file_path, SIDECAR_SUFFIX, stats)
+    stats['cache'] = 'miss'
+    return stats
+
+def mean_length(stats, field):
+    """Return the mean length of a field from its histogram summary."""
+    summary = stats['lengths'][field]
+    return summary['sum'] / summary['total'] if summary['total'] else 0.0
+
+def print_stats(file_path, stats):
+    """
+    Print a stats dict in a readable form.
+    """
+    print(f"\n{file_path} ({stats['format']}, cache {stats['cache']}):")
+    for key, value in stats['counts'].items():
+        print(f"  {key.capitalize()}: {value}")
+    print(f"  Domains: {', '.join(f'{d} ({c})' for d, c in stats['domains'].items())}")
+    for field in LENGTH_FIELDS:
+        summary = stats['lengths'][field]
+        print(f"  {field.capitalize()} length: mean {mean_length(stats, field):.1f}, max {summary['max']} chars")
+
+def main():
+    """
+    Print statistics for the dataset files given on the command line.
+    """
+    print("=" * 60)
+    print("Dataset Statistics")
+    print("Author: Molla Samser - https://rskworld.in")
+    print("=" * 60)
+
+    for file_path in sys.argv[1:] or ['../squad_format.json', '../dataset.csv']:
+        print_stats(file_path, compute_stats(file_path))
+
+if __name__ == "__main__":
+    main()
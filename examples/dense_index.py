@@ -0,0 +1,354 @@
+# -*- coding: utf-8 -*-
+"""
+    Project: Question Answering Dataset
+    Description: A dataset containing context passages, questions, and answers for training QA models and reading comprehension systems.
+    Author: Molla Samser
+    Website: https://rskworld.in
+    Contact: help@rskworld.in
+    Phone: +91 93305 39277
+
+    Dense Passage Index
+    Embeds every passage once with a local transformer encoder (mean pooled,
+    L2 normalized) and keeps the vectors in a float16 memory-mapped matrix.
+    Queries are answered with a NumPy matrix-vector product and an
+    argpartition top-k. An optional IVF layer (spherical k-means) restricts
+    each query to the closest lists, so search stays sublinear as the
+    corpus grows. New passages are appended without re-embedding the rest.
+
+    Index directory layout:
+        meta.json          dim, count, ids.txt length, encoder and IVF settings
+        embeddings.f16     (count, dim) float16 rows, appended in place
+        ids.txt            one passage id per line
+        centroids.npy      IVF centroids (after train_ivf)
+        assignments.i32    IVF list of every row
+
+    Usage:
+        python dense_index.py [encoder_name]
+"""
+
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import torch
+from transformers import AutoModel, AutoTokenizer
+
+from bm25_index import iter_passages
+
+DEFAULT_ENCODER = "sentence-transformers/all-MiniLM-L6-v2"
+# Rows converted to float32 at a time; small enough to stay in cache
+CHUNK_ROWS = 8192
+
+class Encoder:
+    """Mean-pooled, L2-normalized sentence embeddings from a transformer encoder."""
+
+    def __init__(self, model_name=DEFAULT_ENCODER, batch_size=32, max_length=256):
+        self.model_name = model_name
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.model = AutoModel.from_pretrained(model_name).eval()
+        self.batch_size = batch_size
+        self.max_length = max_length
+
+    @property
+    def dim(self):
+        return self.model.config.hidden_size
+
+    def encode(self, texts):
+        """
+        Args:
+            texts (list): Strings to embed
+
+        Returns:
+            np.ndarray: (len(texts), dim) float32 unit vectors
+        """
+        vectors = []
+        with torch.no_grad():
+            for start in range(0, len(texts), self.batch_size):
+                inputs = self.tokenizer(texts[start:start + self.batch_size], padding=True, truncation=True,
+                                        max_length=self.max_length, return_tensors='pt')
+                hidden = self.model(**inputs).last_hidden_state
+                mask = inputs['attention_mask'].unsqueeze(-1).to(hidden.dtype)
+                pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1)
+                vectors.append(torch.nn.functional.normalize(pooled, dim=1).numpy())
+        return np.concatenate(vectors) if vectors else np.zeros((0, self.dim), dtype=np.float32)
+
+def _top_k(scores, rows, k):
+    """Return (rows, scores) of the k highest scores, best first."""
+    k = min(k, len(scores))
+    if k == 0:
+        return rows[:0], scores[:0]
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top], kind='stable')]
+    return rows[top], scores[top]
+
+class DenseIndex:
+    """
+    Append-only float16 vector index stored in a directory.
+
+    meta.json is rewritten after every append and holds the committed row
+    count (and the committed length of ids.txt), so a reader never maps a
+    partially written row and an append only writes the new rows and ids.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(self._path('meta.json'), 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+        with open(self._path('ids.txt'), 'r', encoding='utf-8') as f:
+            self.ids = [line.rstrip('\n') for _, line in zip(range(self.meta['count']), f)]
+        self.centroids = np.load(self._path('centroids.npy')) if self.meta.get('ivf_lists') else None
+        self._embeddings = None
+        self._lists = None
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    @classmethod
+    def create(cls, directory, dim, encoder_name=None):
+        """Create an empty index directory."""
+        os.makedirs(directory, exist_ok=True)
+        for name in ('embeddings.f16', 'ids.txt', 'assignments.i32'):
+            open(os.path.join(directory, name), 'wb').close()
+        meta = {'dim': dim, 'count': 0, 'ids_bytes': 0, 'encoder': encoder_name, 'ivf_lists': 0}
+        _write_json(os.path.join(directory, 'meta.json'), meta)
+        return cls(directory)
+
+    def __len__(self):
+        return self.meta['count']
+
+    @property
+    def embeddings(self):
+        """(count, dim) float16 memmap of the committed rows."""
+        if self._embeddings is None:
+            if not len(self):
+                return np.zeros((0, self.meta['dim']), dtype=np.float16)
+            self._embeddings = np.memmap(self._path('embeddings.f16'), dtype=np.float16, mode='r',
+                                         shape=(len(self), self.meta['dim']))
+        return self._embeddings
+
+    def _assignments(self):
+        return np.fromfile(self._path('assignments.i32'), dtype=np.int32, count=len(self))
+
+    def _assign(self, vectors):
+        """Return the nearest centroid of every vector."""
+        assignments = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), CHUNK_ROWS):
+            chunk = np.asarray(vectors[start:start + CHUNK_ROWS], dtype=np.float32)
+            assignments[start:start + CHUNK_ROWS] = np.argmax(chunk @ self.centroids.T, axis=1)
+        return assignments
+
+    def add(self, ids, vectors):
+        """
+        Append vectors (and their passage ids) without touching existing rows.
+
+        With IVF trained, new rows are assigned to their nearest list.
+
+        Args:
+            ids (list): Passage ids
+            vectors (np.ndarray): (len(ids), dim) unit vectors
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if len(ids) != len(vectors) or (len(vectors) and vectors.shape[1] != self.meta['dim']):
+            raise ValueError(f"Expected {len(ids)} vectors of dimension {self.meta['dim']}")
+        count = len(self)
+        with open(self._path('embeddings.f16'), 'r+b') as f:
+            f.seek(count * self.meta['dim'] * 2)
+            f.write(vectors.astype(np.float16).tobytes())
+            f.truncate()
+        # ids.txt is cut back to the committed rows in case an earlier append was interrupted
+        with open(self._path('ids.txt'), 'r+b') as f:
+            f.seek(self.meta['ids_bytes'])
+            f.write(''.join(f"{passage_id}\n" for passage_id in ids).encode('utf-8'))
+            f.truncate()
+            ids_bytes = f.tell()
+        with open(self._path('assignments.i32'), 'r+b') as f:
+            f.seek(count * 4)
+            if self.centroids is not None:
+                f.write(self._assign(vectors).tobytes())
+            f.truncate()
+        self.meta['count'] = count + len(ids)
+        self.meta['ids_bytes'] = ids_bytes
+        _write_json(self._path('meta.json'), self.meta)
+        self.ids.extend(str(i) for i in ids)
+        self._embeddings = None
+        self._lists = None
+
+    def train_ivf(self, n_lists, iterations=20, points_per_list=64, seed=0):
+        """
+        Partition the rows into n_lists inverted lists with spherical k-means.
+
+        Centroids are fitted on a random sample of points_per_list rows per
+        list; every row is then assigned to its nearest centroid.
+        """
+        if not 1 <= n_lists <= len(self):
+            raise ValueError(f"n_lists must be between 1 and the number of rows ({len(self)}), got {n_lists}")
+        rng = np.random.default_rng(seed)
+        sample_rows = rng.choice(len(self), size=min(points_per_list * n_lists, len(self)), replace=False)
+        sample = np.asarray(self.embeddings[np.sort(sample_rows)], dtype=np.float32)
+        centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)]
+        for _ in range(iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            order = np.argsort(labels, kind='stable')
+            present, starts = np.unique(labels[order], return_index=True)
+            sums = np.zeros_like(centroids)
+            sums[present] = np.add.reduceat(sample[order], starts)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            # Empty lists keep their previous centroid
+            centroids = np.where(norms > 0, sums / np.maximum(norms, 1e-12), centroids)
+
+        self.centroids = centroids.astype(np.float32)
+        np.save(self._path('centroids.npy'), self.centroids)
+        self._assign(self.embeddings).tofile(self._path('assignments.i32'))
+        self.meta['ivf_lists'] = n_lists
+        _write_json(self._path('meta.json'), self.meta)
+        self._lists = None
+
+    def _inverted_lists(self):
+        """Return (list offsets, rows sorted by list), built once per open."""
+        if self._lists is None:
+            assignments = self._assignments()
+            rows = np.argsort(assignments, kind='stable').astype(np.int64)
+            offsets = np.searchsorted(assignments[rows], np.arange(len(self.centroids) + 1))
+            self._lists = (offsets, rows)
+        return self._lists
+
+    def search(self, query, k=5, n_probe=None):
+        """
+        Find the rows most similar (by dot product) to a query vector.
+
+        Args:
+            query (np.ndarray): (dim,) unit vector
+            k (int): Number of results
+            n_probe (int): IVF lists to scan; None scans every row
+
+        Returns:
+            list: (passage id, score) pairs, best first
+        """
+        query = np.asarray(query, dtype=np.float32)
+        if n_probe and self.centroids is not None:
+            offsets, sorted_rows = self._inverted_lists()
+            probe = np.argpartition(-(self.centroids @ query), min(n_probe, len(self.centroids)) - 1)[:n_probe]
+            rows = np.sort(np.concatenate([sorted_rows[offsets[p]:offsets[p + 1]] for p in probe]))
+            scores = np.asarray(self.embeddings[rows], dtype=np.float32) @ query
+            best_rows, best_scores = _top_k(scores, rows, k)
+        else:
+            best_rows, best_scores = np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+            for start in range(0, len(self), CHUNK_ROWS):
+                chunk = np.asarray(self.embeddings[start:start + CHUNK_ROWS], dtype=np.float32)
+                rows = np.arange(start, start + len(chunk))
+                chunk_rows, chunk_scores = _top_k(chunk @ query, rows, k)
+                best_rows, best_scores = _top_k(np.concatenate([best_scores, chunk_scores]),
+                                                np.concatenate([best_rows, chunk_rows]), k)
+        return [(self.ids[row], float(score)) for row, score in zip(best_rows, best_scores)]
+
+def _write_json(path, data):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+def open_dense_index(directory, encoder):
+    """Open an index directory, creating it for the encoder if missing."""
+    if not os.path.exists(os.path.join(directory, 'meta.json')):
+        return DenseIndex.create(directory, encoder.dim, encoder.model_name)
+    index = DenseIndex(directory)
+    if index.meta['encoder'] != encoder.model_name:
+        raise ValueError(f"{directory} holds {index.meta['encoder']} embeddings, not {encoder.model_name}")
+    return index
+
+def add_passages(index, encoder, passages):
+    """
+    Embed and append passages whose id is not in the index yet.
+
+    Returns:
+        int: Number of passages embedded
+    """
+    known = set(index.ids)
+    new = [(str(passage_id), text) for passage_id, text in passages if str(passage_id) not in known]
+    if new:
+        index.add([passage_id for passage_id, _ in new], encoder.encode([text for _, text in new]))
+    return len(new)
+
+def benchmark_search(dim=384, rows=200000, topics=2000, n_lists=256, n_probe=8, queries=100, k=10, seed=0):
+    """
+    Compare a full scan with IVF search on synthetic embeddings.
+
+    Rows are drawn around `topics` random directions, as passage embeddings
+    cluster by subject; uniformly random vectors have no structure for IVF
+    to exploit.
+
+    Returns:
+        dict: Latency (ms) of both modes, IVF recall@k against the full scan
+            and IVF training seconds
+    """
+    import tempfile
+
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((topics, dim)).astype(np.float32)
+    centers /= np.linalg.norm(centers, axis=1, keepdims=True)
+    with tempfile.TemporaryDirectory() as directory:
+        index = DenseIndex.create(directory, dim)
+        for start in range(0, rows, CHUNK_ROWS):
+            size = min(CHUNK_ROWS, rows - start)
+            vectors = centers[rng.integers(topics, size=size)]
+            vectors += rng.standard_normal((size, dim)).astype(np.float32) / np.sqrt(dim)
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+            index.add(list(range(start, start + len(vectors))), vectors)
+        start = time.perf_counter()
+        index.train_ivf(n_lists)
+        train_seconds = time.perf_counter() - start
+
+        # Queries near stored rows, as real questions are near their passages
+        targets = rng.choice(rows, size=queries, replace=False)
+        probes = np.asarray(index.embeddings[np.sort(targets)], dtype=np.float32)
+        probes += 0.05 * rng.standard_normal(probes.shape).astype(np.float32)
+        probes /= np.linalg.norm(probes, axis=1, keepdims=True)
+
+        timings = {'flat': [], 'ivf': []}
+        recall = 0.0
+        for query in probes:
+            start = time.perf_counter()
+            exact = index.search(query, k)
+            timings['flat'].append((time.perf_counter() - start) * 1000)
+            start = time.perf_counter()
+            approx = index.search(query, k, n_probe=n_probe)
+            timings['ivf'].append((time.perf_counter() - start) * 1000)
+            recall += len({i for i, _ in exact} & {i for i, _ in approx}) / k
+        result = {mode: float(np.mean(values)) for mode, values in timings.items()}
+        del index
+    result.update(rows=rows, recall=recall / queries, train_seconds=train_seconds)
+    return result
+
+def main():
+    """
+    Index contexts.json, answer questions.json by dense retrieval, and
+    benchmark flat vs IVF search.
+    """
+    print("=" * 60)
+    print("Dense Passage Index")
+    print("Author: Molla Samser - https://rskworld.in")
+    print("=" * 60)
+
+    encoder = Encoder(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_ENCODER)
+    index = open_dense_index('../dense_index', encoder)
+    added = add_passages(index, encoder, iter_passages('../contexts.json'))
+    print(f"\nEmbedded {added} new passages ({len(index)} indexed)")
+
+    with open('../questions.json', 'r', encoding='utf-8') as f:
+        questions = json.load(f)['questions']
+    if len(index) and questions:
+        query_vectors = encoder.encode([q['question'] for q in questions])
+        hits = sum(index.search(vector, 1)[0][0] == str(q['context_id'])
+                   for q, vector in zip(questions, query_vectors))
+        print(f"Recall@1 on questions.json: {hits / len(questions):.0%}")
+    else:
+        print("Recall@1 skipped: no passages or no questions to evaluate")
+
+    result = benchmark_search()
+    print(f"\n{result['rows']} synthetic vectors: flat {result['flat']:.2f} ms, IVF {result['ivf']:.2f} ms "
+          f"(recall@10 {result['recall']:.0%}, trained in {result['train_seconds']:.1f} s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+    Project: Question Answering Dataset
+    Description: A dataset containing context passages, questions, and answers for training QA models and reading comprehension systems.
+    Author: Molla Samser
+    Website: https://rskworld.in
+    Contact: help@rskworld.in
+    Phone: +91 93305 39277
+
+    QA Evaluation Harness
+    Streams every answerable QA of squad_format.json through a backend
+    (PyTorch, INT8 or ONNX Runtime) in batches, optionally across a process
+    pool, and writes a JSON report with SQuAD EM/F1 overall and per domain
+    (article title), examples per second and batch latency percentiles.
+
+    Usage:
+        python evaluate_qa.py [backend] [model_name] [workers]
+        backend: torch (default), int8 or onnx
+"""
+
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+import torch
+
+from bert_example import load_dataset, predict_answers
+from model_registry import registry
+from squad_metrics import gold_answers, score_prediction
+
+BACKENDS = ('torch', 'int8', 'onnx')
+
+_worker = {}
+
+def load_backend(backend, model_name):
+    """
+    Load a model and tokenizer for one of BACKENDS.
+
+    Returns:
+        tuple: (model, tokenizer)
+    """
+    if backend == 'torch':
+        return registry.get_model(model_name), registry.get_tokenizer(model_name)
+    if backend == 'int8':
+        return registry.get_model(model_name, dtype='int8'), registry.get_tokenizer(model_name)
+    if backend == 'onnx':
+        # Imported here so onnxruntime stays optional for the other backends
+        from onnx_backend import ONNX_NAME, OnnxQAModel, export_onnx, onnx_export_dir
+        output_dir = onnx_export_dir(model_name)
+        if not os.path.exists(os.path.join(output_dir, ONNX_NAME)):
+            export_onnx(model_name, output_dir)
+        return OnnxQAModel.from_export(output_dir), registry.get_tokenizer(output_dir)
+    raise ValueError(f"Unknown backend '{backend}', expected one of {BACKENDS}")
+
+def iter_eval_batches(file_path, batch_size):
+    """
+    Stream answerable QAs in batches.
+
+    Yields:
+        list: (domain, context, question, reference answers) tuples
+    """
+    batch = []
+    for title, context, qa in load_dataset(file_path):
+        if qa.get('is_impossible') or not qa.get('answers'):
+            continue
+        batch.append((title, context, qa['question'], gold_answers(qa)))
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def _predict_timed(model, tokenizer, batch):
+    """Predict one batch; return (answers, seconds)."""
+    pairs = [(context, question) for _, context, question, _ in batch]
+    start = time.perf_counter()
+    answers = predict_answers(pairs, model, tokenizer, batch_size=len(pairs))
+    return answers, time.perf_counter() - start
+
+def _init_worker(backend, model_name, threads):
+    torch.set_num_threads(threads)
+    _worker['model'], _worker['tokenizer'] = load_backend(backend, model_name)
+
+def _worker_batch(batch):
+    return _predict_timed(_worker['model'], _worker['tokenizer'], batch)
+
+def _iter_results(backend, model_name, batches, workers):
+    """Yield (batch, answers, seconds) in completion order."""
+    if workers <= 1:
+        model, tokenizer = load_backend(backend, model_name)
+        for batch in batches:
+            yield (batch,) + _predict_timed(model, tokenizer, batch)
+        return
+
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(backend, model_name, threads)) as pool:
+        pending = {}
+        for batch in batches:
+            # Bound the number of batches waiting in memory
+            if len(pending) >= 2 * workers:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield (pending.pop(future),) + future.result()
+            pending[pool.submit(_worker_batch, batch)] = batch
+        for future in pending:
+            yield (pending[future],) + future.result()
+
+def evaluate_backend(backend='torch', model_name="bert-base-uncased", file_path='../squad_format.json',
+                     batch_size=16, workers=1):
+    """
+    Evaluate a backend on every answerable QA of a SQuAD file.
+
+    Args:
+        backend (str): One of BACKENDS
+        model_name (str): Hub name or local directory of the model
+        file_path (str): SQuAD file to evaluate on
+        batch_size (int): Questions per forward pass
+        workers (int): Worker processes (1 runs in this process)
+
+    Returns:
+        dict: exact_match and f1 overall and per_domain, examples_per_second,
+            batch_latency_ms percentiles and the run settings
+    """
+    overall_total = [0, 0.0, 0.0]
+    totals = {}
+    batch_latencies = []
+    examples = 0
+    start = time.perf_counter()
+    for batch, answers, seconds in _iter_results(backend, model_name,
+                                                 iter_eval_batches(file_path, batch_size), workers):
+        batch_latencies.append(seconds * 1000)
+        for (domain, _, _, truths), answer in zip(batch, answers):
+            em, f1 = score_prediction(answer, truths)
+            for total in (overall_total, totals.setdefault(domain, [0, 0.0, 0.0])):
+                total[0] += 1
+                total[1] += em
+                total[2] += f1
+        examples += len(batch)
+    elapsed = time.perf_counter() - start
+
+    def scores(total):
+        count, em, f1 = total
+        count_or_one = count or 1
+        return {'count': count, 'exact_match': 100.0 * em / count_or_one, 'f1': 100.0 * f1 / count_or_one}
+
+    overall = scores(overall_total)
+    latencies = batch_latencies or [0.0]
+    return {
+        'backend': backend,
+        'model': model_name,
+        'dataset': os.path.abspath(file_path),
+        'batch_size': batch_size,
+        'workers': workers,
+        'examples': examples,
+        'exact_match': overall['exact_match'],
+        'f1': overall['f1'],
+        'per_domain': {domain: scores(total) for domain, total in sorted(totals.items())},
+        'examples_per_second': examples / elapsed if elapsed else 0.0,
+        'batch_latency_ms': {
+            'mean': float(np.mean(latencies)),
+            'p50': float(np.percentile(latencies, 50)),
+            'p95': float(np.percentile(latencies, 95)),
+            'p99': float(np.percentile(latencies, 99))
+        }
+    }
+
+def write_report(report, output_path):
+    """Write an evaluation report as indented JSON."""
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+def main():
+    """
+    Evaluate a backend and write eval_report-<backend>.json.
+    """
+    print("=" * 60)
+    print("QA Evaluation Harness")
+    print("Author: Molla Samser - https://rskworld.in")
+    print("=" * 60)
+
+    backend = sys.argv[1] if len(sys.argv) > 1 else 'torch'
+    model_name = sys.argv[2] if len(sys.argv) > 2 else "bert-base-uncased"
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+
+    report = evaluate_backend(backend, model_name, workers=workers)
+    output_path = f'../eval_report-{backend}.json'
+    write_report(report, output_path)
+
+    print(f"\n{report['examples']} answerable questions, backend {backend}, {workers} worker(s)")
+    print(f"  EM {report['exact_match']:.1f}  F1 {report['f1']:.1f}")
+    for domain, scores in report['per_domain'].items():
+        print(f"    {domain:30s} {scores['count']:4d}  EM {scores['exact_match']:5.1f}  F1 {scores['f1']:5.1f}")
+    latency = report['batch_latency_ms']
+    print(f"  {report['examples_per_second']:.1f} examples/s, batch latency "
+          f"p50 {latency['p50']:.1f} ms, p95 {latency['p95']:.1f} ms, p99 {latency['p99']:.1f} ms")
+    print(f"\nReport written to {output_path}")
+
+if __name__ == "__main__":
+    main()
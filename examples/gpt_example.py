@@ -11,23 +11,42 @@
     This example demonstrates how to use the dataset with GPT-based models.
 """
 
-import json
+import copy
+import hashlib
+import time
+from collections import OrderedDict
 from transformers import GPT2LMHeadModel, GPT2Tokenizer
 import torch
+from ingest_log import iter_dataset
 
 def load_dataset(file_path='../squad_format.json'):
     """
-    Load the SQuAD format dataset.
+    Load the SQuAD format dataset as a stream of flat records.
+    
+    See ingest_log.iter_dataset for where the records come from.
     
     Args:
         file_path (str): Path to the dataset JSON file
         
     Returns:
-        dict: Loaded dataset
+        iterator: (article title, context, qa) records
+    """
+    return iter_dataset(file_path)
+
+def format_prompt_prefix(context):
+    """
+    Format the part of the prompt shared by every question on a context.
+    
+    The prefix stops right after "Question:" so that it tokenizes to the
+    same ids on its own as at the start of the full prompt.
+    
+    Args:
+        context (str): Context passage
+        
+    Returns:
+        str: Prompt prefix
     """
-    with open(file_path, 'r', encoding='utf-8') as f:
-        dataset = json.load(f)
-    return dataset
+    return f"Context: {context}\n\nQuestion:"
 
 def format_prompt(context, question):
     """
@@ -40,10 +59,104 @@ def format_prompt(context, question):
     Returns:
         str: Formatted prompt
     """
-    prompt = f"Context: {context}\n\nQuestion: {question}\n\nAnswer:"
+    prompt = f"{format_prompt_prefix(context)} {question}\n\nAnswer:"
     return prompt
 
-def generate_answer(context, question, model, tokenizer, max_length=200):
+class PrefixKVCache:
+    """
+    LRU cache of the model's key/value states for context prompt prefixes.
+    
+    The prefix of a context is run through the model once; later questions
+    on the same context start from a copy of its past_key_values, so only
+    the question tokens are encoded before the first generated token.
+    Entries hold tensors of size layers x prefix length x hidden size, so
+    keep maxsize small for long contexts.
+    """
+    
+    def __init__(self, model, tokenizer, maxsize=32):
+        """
+        Args:
+            model: GPT model the states belong to
+            tokenizer: GPT tokenizer
+            maxsize (int): Maximum number of cached contexts
+        """
+        self.model = model
+        self.tokenizer = tokenizer
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def get(self, context):
+        """
+        Return the prefix token ids of a context and a private copy of their
+        key/value states, running the prefix through the model on a miss.
+        
+        Args:
+            context (str): Context passage
+            
+        Returns:
+            tuple: (prefix ids tensor of shape (1, prefix length), past_key_values)
+        """
+        key = hashlib.sha1(context.encode('utf-8')).hexdigest()
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+        else:
+            self.misses += 1
+            prefix_ids = self.tokenizer.encode(format_prompt_prefix(context), return_tensors='pt')
+            with torch.no_grad():
+                past = self.model(prefix_ids, use_cache=True).past_key_values
+            entry = (prefix_ids, past)
+            self._entries[key] = entry
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        # Generation appends to the cache in place; the stored entry must stay at the prefix
+        return entry[0], copy.deepcopy(entry[1])
+    
+    def clear(self):
+        self._entries.clear()
+    
+    def stats(self):
+        """
+        Returns:
+            dict: size, hits, misses, evictions and hit_rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+def prompt_inputs(context, question, tokenizer, prefix_cache=None):
+    """
+    Tokenize the prompt, reusing the cached prefix state when a cache is given.
+    
+    Returns:
+        dict: input_ids and attention_mask for the whole prompt, plus
+            past_key_values covering the prefix when prefix_cache is given
+    """
+    if prefix_cache is None:
+        input_ids = tokenizer.encode(format_prompt(context, question), return_tensors='pt')
+        return {'input_ids': input_ids, 'attention_mask': torch.ones_like(input_ids)}
+    
+    prefix_ids, past = prefix_cache.get(context)
+    suffix = format_prompt(context, question)[len(format_prompt_prefix(context)):]
+    suffix_ids = tokenizer.encode(suffix, return_tensors='pt')
+    input_ids = torch.cat([prefix_ids, suffix_ids], dim=1)
+    # generate() only runs the ids past the cached length
+    return {'input_ids': input_ids, 'attention_mask': torch.ones_like(input_ids), 'past_key_values': past}
+
+def generate_answer(context, question, model, tokenizer, max_length=200, prefix_cache=None):
     """
     Generate answer using GPT model.
     
@@ -53,6 +166,8 @@ def generate_answer(context, question, model, tokenizer, max_length=200):
         model: GPT model
         tokenizer: GPT tokenizer
         max_length (int): Maximum generation length
+        prefix_cache (PrefixKVCache): Optional cache of context prefix states;
+            later questions on a cached context only encode the question
         
     Returns:
         str: Generated answer
@@ -60,13 +175,13 @@ def generate_answer(context, question, model, tokenizer, max_length=200):
     prompt = format_prompt(context, question)
     
     # Tokenize input
-    inputs = tokenizer.encode(prompt, return_tensors='pt')
+    inputs = prompt_inputs(context, question, tokenizer, prefix_cache)
     
     # Generate answer
     with torch.no_grad():
         outputs = model.generate(
-            inputs,
-            max_length=len(inputs[0]) + max_length,
+            **inputs,
+            max_length=inputs['input_ids'].shape[1] + max_length,
             num_return_sequences=1,
             temperature=0.7,
             do_sample=True,
@@ -84,6 +199,53 @@ def generate_answer(context, question, model, tokenizer, max_length=200):
     
     return answer
 
+def time_to_first_token(context, question, model, tokenizer, prefix_cache=None):
+    """Return the seconds until the first generated token (greedy)."""
+    start = time.perf_counter()
+    inputs = prompt_inputs(context, question, tokenizer, prefix_cache)
+    with torch.no_grad():
+        model.generate(**inputs, max_new_tokens=1, do_sample=False, pad_token_id=tokenizer.eos_token_id)
+    return time.perf_counter() - start
+
+def benchmark_prefix_cache(records, model, tokenizer, maxsize=32):
+    """
+    Compare time-to-first-token with and without the prefix cache.
+    
+    Args:
+        records (list): (context, question) tuples; contexts with several
+            questions show the benefit
+        model: GPT model
+        tokenizer: GPT tokenizer
+        maxsize (int): Prefix cache size
+        
+    Returns:
+        dict: Mean TTFT in ms without the cache ('uncached'), for the first
+            question on a context ('first', which fills the cache) and for
+            later questions ('repeat'), plus the cache statistics
+    """
+    # One untimed pass so the first measurement does not pay for lazy initialization
+    if records:
+        time_to_first_token(records[0][0], records[0][1], model, tokenizer)
+    
+    uncached = [time_to_first_token(context, question, model, tokenizer) for context, question in records]
+    
+    cache = PrefixKVCache(model, tokenizer, maxsize)
+    first, repeat = [], []
+    for context, question in records:
+        hit = cache.hits
+        seconds = time_to_first_token(context, question, model, tokenizer, cache)
+        (repeat if cache.hits > hit else first).append(seconds)
+    
+    def mean_ms(values):
+        return 1000 * sum(values) / len(values) if values else 0.0
+    
+    return {
+        'uncached': mean_ms(uncached),
+        'first': mean_ms(first),
+        'repeat': mean_ms(repeat),
+        'cache': cache.stats()
+    }
+
 def main():
     """
     Main function to demonstrate GPT question answering.
@@ -109,26 +271,30 @@ def main():
         tokenizer.pad_token = tokenizer.eos_token
     
     # Get first example from dataset
-    if dataset['data']:
-        first_article = dataset['data'][0]
-        if first_article['paragraphs']:
-            first_paragraph = first_article['paragraphs'][0]
-            context = first_paragraph['context']
-            
-            if first_paragraph['qas']:
-                first_qa = first_paragraph['qas'][0]
-                question = first_qa['question']
-                correct_answer = first_qa['answers'][0]['text']
-                
-                print(f"\nContext: {context[:200]}...")
-                print(f"\nQuestion: {question}")
-                print(f"Correct Answer: {correct_answer}")
-                
-                # Generate answer
-                print("\nGenerating answer with GPT-2...")
-                generated_answer = generate_answer(context, question, model, tokenizer)
-                print(f"\nGenerated Answer: {generated_answer}")
-    
+    first_record = next(dataset, None)
+    if first_record is not None:
+        _, context, first_qa = first_record
+        question = first_qa['question']
+        correct_answer = first_qa['answers'][0]['text']
+
+        print(f"\nContext: {context[:200]}...")
+        print(f"\nQuestion: {question}")
+        print(f"Correct Answer: {correct_answer}")
+
+        # Generate answer
+        print("\nGenerating answer with GPT-2...")
+        generated_answer = generate_answer(context, question, model, tokenizer)
+        print(f"\nGenerated Answer: {generated_answer}")
+
+    # Questions that share a context reuse its cached prefix state
+    print("\nBenchmarking time-to-first-token with the prefix KV-cache...")
+    records = [(context, qa['question']) for _, context, qa in load_dataset()]
+    result = benchmark_prefix_cache(records, model, tokenizer)
+    print(f"  Full prompt:             {result['uncached']:.1f} ms")
+    print(f"  First question (filled): {result['first']:.1f} ms")
+    print(f"  Later questions (hit):   {result['repeat']:.1f} ms")
+    print(f"  Cache: {result['cache']['hits']} hits, {result['cache']['misses']} misses")
+
     print("\n" + "=" * 60)
     print("Note: GPT-2 is a general language model and may not perform")
     print("as well as specialized QA models like BERT for this task.")
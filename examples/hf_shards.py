@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+"""
+    Project: Question Answering Dataset
+    Description: A dataset containing context passages, questions, and answers for training QA models and reading comprehension systems.
+    Author: Molla Samser
+    Website: https://rskworld.in
+    Contact: help@rskworld.in
+    Phone: +91 93305 39277
+
+    Sharded SQuAD to Hugging Face Conversion
+    Splits the paragraphs of squad_format.json into shards and converts them
+    in a process pool. The paragraph byte ranges come from the persisted
+    offset index of lazy_dataset.py, so the parent only hands each worker a
+    range of paragraphs; the worker reads and parses its own bytes and writes
+    its shard straight to Arrow with Dataset.save_to_disk. A manifest records
+    a fingerprint of the input so that re-running on unchanged data is a no-op.
+
+    Building the offset index is a serial scan, done once per version of the
+    file and reused afterwards (by LazySquadDataset too).
+
+    Usage:
+        python hf_shards.py ../squad_format.json ../hf_dataset [bench]
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from datasets import Dataset, Features, Sequence, Value, concatenate_datasets, disable_progress_bars, load_from_disk
+
+from lazy_dataset import load_offset_index
+from sidecar import hash_file
+
+CONVERTER_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+
+FEATURES = Features({
+    'id': Value('string'),
+    'title': Value('string'),
+    'context': Value('string'),
+    'question': Value('string'),
+    'answers': Sequence({'text': Value('string'), 'answer_start': Value('int32')})
+})
+
+def _shard_columns(paragraphs, include_impossible):
+    """Flatten (title, paragraph) pairs into HF columns."""
+    columns = {name: [] for name in FEATURES}
+    for title, paragraph in paragraphs:
+        context = paragraph['context']
+        for qa in paragraph['qas']:
+            answers = [] if qa.get('is_impossible') else qa.get('answers', [])
+            if not answers and not include_impossible:
+                continue
+            columns['id'].append(str(qa['id']))
+            columns['title'].append(title)
+            columns['context'].append(context)
+            columns['question'].append(qa['question'])
+            columns['answers'].append({
+                'text': [a['text'] for a in answers],
+                'answer_start': [a['answer_start'] for a in answers]
+            })
+    return columns
+
+def _read_paragraphs(file_path, titles, starts, ends):
+    """Read a contiguous run of paragraphs with one read and parse each slice."""
+    with open(file_path, 'rb') as f:
+        f.seek(starts[0])
+        data = f.read(ends[-1] - starts[0])
+    base = starts[0]
+    return [(title, json.loads(data[start - base:end - base].decode('utf-8')))
+            for title, start, end in zip(titles, starts, ends)]
+
+def _write_shard(shard_dir, file_path, titles, starts, ends, include_impossible):
+    """
+    Read, convert and save one shard as an Arrow dataset (runs in a worker).
+
+    Returns:
+        int: Number of examples written
+    """
+    disable_progress_bars()
+    paragraphs = _read_paragraphs(file_path, titles, starts, ends)
+    dataset = Dataset.from_dict(_shard_columns(paragraphs, include_impossible), features=FEATURES)
+    dataset.save_to_disk(shard_dir)
+    return len(dataset)
+
+def _iter_shards(index, paragraphs_per_shard):
+    """
+    Cut the offset index into shards of at most paragraphs_per_shard paragraphs.
+
+    Yields:
+        tuple: (titles, byte starts, byte ends) of the shard's paragraphs
+    """
+    titles = index['titles']
+    for first in range(0, len(index['para_start']), paragraphs_per_shard):
+        last = first + paragraphs_per_shard
+        yield ([str(titles[t]) for t in index['para_title'][first:last]],
+               index['para_start'][first:last].tolist(), index['para_end'][first:last].tolist())
+
+def input_fingerprint(file_path, paragraphs_per_shard, include_impossible):
+    """
+    Fingerprint the input file and conversion settings.
+
+    Returns:
+        str: Hex digest that changes whenever the output would change
+    """
+    hasher = hash_file(file_path)
+    hasher.update(json.dumps({
+        'converter_version': CONVERTER_VERSION,
+        'paragraphs_per_shard': paragraphs_per_shard,
+        'include_impossible': include_impossible
+    }, sort_keys=True).encode('utf-8'))
+    return hasher.hexdigest()
+
+def _read_manifest(output_dir):
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def convert_squad_to_hf_shards(file_path='../squad_format.json', output_dir='../hf_dataset',
+                               num_proc=None, paragraphs_per_shard=1000,
+                               include_impossible=True, force=False):
+    """
+    Convert a SQuAD file to Arrow shards in parallel.
+
+    Unlike convert_squad_to_hf_dataset, unanswerable questions are kept
+    (with empty answer lists, as in SQuAD 2.0 on the Hub) unless
+    include_impossible is False.
+
+    Args:
+        file_path (str): Path to the SQuAD JSON file
+        output_dir (str): Directory receiving shard-NNNNN folders and the manifest
+        num_proc (int): Worker processes, defaults to the CPU count
+        paragraphs_per_shard (int): Paragraphs converted per shard
+        include_impossible (bool): Whether to keep unanswerable questions
+        force (bool): Convert even if the manifest fingerprint matches
+
+    Returns:
+        dict: The manifest (fingerprint, shards, num_rows, skipped)
+    """
+    fingerprint = input_fingerprint(file_path, paragraphs_per_shard, include_impossible)
+    manifest = _read_manifest(output_dir)
+    if (not force and manifest is not None and manifest['fingerprint'] == fingerprint
+            and all(os.path.isdir(os.path.join(output_dir, s['name'])) for s in manifest['shards'])):
+        manifest['skipped'] = True
+        return manifest
+
+    # Remove shards from an older input so they cannot leak into the new output
+    os.makedirs(output_dir, exist_ok=True)
+    for name in os.listdir(output_dir):
+        if name.startswith('shard-') or name == MANIFEST_NAME:
+            path = os.path.join(output_dir, name)
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            else:
+                os.remove(path)
+
+    num_proc = num_proc or os.cpu_count() or 1
+    offset_index = load_offset_index(file_path)
+    shards = []
+    with ProcessPoolExecutor(max_workers=num_proc) as pool:
+        pending = {}
+        for index, (titles, starts, ends) in enumerate(_iter_shards(offset_index, paragraphs_per_shard)):
+            # Bound the number of shards queued ahead of the workers
+            if len(pending) >= 2 * num_proc:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    shards.append({'name': pending.pop(future), 'rows': future.result()})
+            name = f'shard-{index:05d}'
+            future = pool.submit(_write_shard, os.path.join(output_dir, name), file_path,
+                                 titles, starts, ends, include_impossible)
+            pending[future] = name
+        for future in pending:
+            shards.append({'name': pending[future], 'rows': future.result()})
+
+    shards.sort(key=lambda s: s['name'])
+    manifest = {
+        'fingerprint': fingerprint,
+        'source': os.path.abspath(file_path),
+        'shards': shards,
+        'num_rows': sum(s['rows'] for s in shards)
+    }
+    with open(os.path.join(output_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    manifest['skipped'] = False
+    return manifest
+
+def load_hf_shards(output_dir='../hf_dataset'):
+    """
+    Load every shard with datasets.load_from_disk and concatenate them.
+
+    Args:
+        output_dir (str): Directory written by convert_squad_to_hf_shards
+
+    Returns:
+        Dataset: All examples, memory-mapped from the Arrow shards
+    """
+    manifest = _read_manifest(output_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"No {MANIFEST_NAME} in {output_dir}")
+    shards = [load_from_disk(os.path.join(output_dir, s['name'])) for s in manifest['shards']]
+    if not shards:
+        return Dataset.from_dict({name: [] for name in FEATURES}, features=FEATURES)
+    return concatenate_datasets(shards)
+
+def benchmark_scaling(file_path='../squad_format.json', proc_counts=None, paragraphs_per_shard=1000):
+    """
+    Time a forced conversion for several worker counts.
+
+    The offset index is built before timing, so the numbers measure the
+    parallel read/convert/write phase.
+
+    Args:
+        file_path (str): Path to the SQuAD JSON file
+        proc_counts (list): Worker counts, defaults to powers of two up to the CPU count
+        paragraphs_per_shard (int): Paragraphs converted per shard
+
+    Returns:
+        list: Dicts with num_proc, seconds, examples_per_second and speedup
+    """
+    if proc_counts is None:
+        proc_counts = [1]
+        while proc_counts[-1] * 2 <= (os.cpu_count() or 1):
+            proc_counts.append(proc_counts[-1] * 2)
+    load_offset_index(file_path)
+
+    results = []
+    for num_proc in proc_counts:
+        with tempfile.TemporaryDirectory() as output_dir:
+            start = time.perf_counter()
+            manifest = convert_squad_to_hf_shards(file_path, output_dir, num_proc=num_proc,
+                                                  paragraphs_per_shard=paragraphs_per_shard, force=True)
+            seconds = time.perf_counter() - start
+        baseline = results[0]['seconds'] if results else seconds
+        results.append({
+            'num_proc': num_proc,
+            'seconds': seconds,
+            'examples_per_second': manifest['num_rows'] / max(seconds, 1e-9),
+            'speedup': baseline / max(seconds, 1e-9)
+        })
+    return results
+
+def main():
+    """
+    Convert the SQuAD file given on the command line and report throughput.
+    """
+    print("=" * 60)
+    print("Sharded SQuAD to Hugging Face Conversion")
+    print("Author: Molla Samser - https://rskworld.in")
+    print("=" * 60)
+
+    file_path = sys.argv[1] if len(sys.argv) > 1 else '../squad_format.json'
+    output_dir = sys.argv[2] if len(sys.argv) > 2 else '../hf_dataset'
+
+    start = time.perf_counter()
+    manifest = convert_squad_to_hf_shards(file_path, output_dir)
+    elapsed = time.perf_counter() - start
+
+    if manifest['skipped']:
+        print(f"\nInput unchanged, reused {len(manifest['shards'])} shards in {output_dir}")
+    else:
+        print(f"\nWrote {manifest['num_rows']} examples in {len(manifest['shards'])} shards "
+              f"to {output_dir} in {elapsed:.2f} s ({manifest['num_rows'] / max(elapsed, 1e-9):.0f} examples/s)")
+
+    dataset = load_hf_shards(output_dir)
+    print(f"Loaded back: {dataset}")
+
+    if len(sys.argv) > 3 and sys.argv[3] == 'bench':
+        print("\nScaling with worker processes:")
+        for result in benchmark_scaling(file_path):
+            print(f"  num_proc={result['num_proc']:3d}: {result['seconds']:7.2f} s  "
+                  f"{result['examples_per_second']:10.0f} examples/s  {result['speedup']:5.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,444 @@
+# -*- coding: utf-8 -*-
+"""
+    Project: Question Answering Dataset
+    Description: A dataset containing context passages, questions, and answers for training QA models and reading comprehension systems.
+    Author: Molla Samser
+    Website: https://rskworld.in
+    Contact: help@rskworld.in
+    Phone: +91 93305 39277
+
+    Append-Only Ingestion Log
+    New QAs are appended to a JSONL delta log next to squad_format.json
+    (squad_format.json.delta.jsonl) instead of rewriting the dataset.
+    Readers see the base file plus the deltas as one merged view, and the
+    log is periodically compacted back into the base files.
+
+    Usage:
+        python ingest_log.py compact
+"""
+
+import csv
+import json
+import os
+import sys
+import tempfile
+import textwrap
+import time
+
+from columnar_store import open_compiled
+from squad_reader import iter_json_array, iter_squad_articles, iter_squad_paragraphs, iter_squad_records
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are still atomic, compaction is not locked
+    fcntl = None
+
+LOG_SUFFIX = '.delta.jsonl'
+DEFAULT_COMPACT_BYTES = 64 * 1024 * 1024
+CSV_COLUMNS = ['context', 'question', 'answer', 'domain', 'question_id']
+NORMALIZED_FILES = [('questions.json', 'questions'), ('contexts.json', 'contexts'), ('answers.json', 'answers')]
+
+class _Lock:
+    """Exclusive advisory lock on an open file descriptor."""
+
+    def __init__(self, fd):
+        self.fd = fd
+
+    def __enter__(self):
+        if fcntl is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if fcntl is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+
+class DeltaLog:
+    """
+    Append-only log of QA records layered over a SQuAD base file.
+
+    Each line of the log is one flat record:
+    {"title": ..., "context": ..., "qa": {...}}. A record whose qa id
+    already exists in the base file replaces it in the merged view.
+    """
+
+    def __init__(self, base_path='../squad_format.json', log_path=None,
+                 compact_bytes=DEFAULT_COMPACT_BYTES, csv_path=None, normalized_dir=None):
+        """
+        Args:
+            base_path (str): SQuAD JSON file the log is layered over
+            log_path (str): Delta log path, defaults to base_path + '.delta.jsonl'
+            compact_bytes (int): Log size that triggers compaction after an append (None to disable)
+            csv_path (str): CSV sibling (e.g. '../dataset.csv') to rewrite on compaction
+            normalized_dir (str): Directory of the normalized siblings (questions.json,
+                contexts.json, answers.json) to rewrite on compaction
+        """
+        self.base_path = base_path
+        self.log_path = log_path or base_path + LOG_SUFFIX
+        self.compact_bytes = compact_bytes
+        self.csv_path = csv_path
+        self.normalized_dir = normalized_dir
+
+    def _open_log(self):
+        return os.open(self.log_path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+
+    def append(self, records, dedupe=None):
+        """
+        Append QA records to the log without touching the base file.
+
+        All records are written with a single write() under the log lock, so
+        concurrent writers never interleave partial lines.
+
+        Args:
+            records (iterable): (title, context, qa dict) records
+            dedupe (NearDuplicateFilter): Optional filter (see near_duplicates.py);
+                records whose question is a near duplicate of one already seen are dropped
+
+        Returns:
+            int: Number of records appended
+        """
+        if dedupe is not None:
+            records = dedupe.filter(records, key=lambda record: record[2]['question'])
+        lines = [
+            json.dumps({'title': title, 'context': context, 'qa': qa}, ensure_ascii=False)
+            for title, context, qa in records
+        ]
+        if not lines:
+            return 0
+        data = ('\n'.join(lines) + '\n').encode('utf-8')
+        fd = self._open_log()
+        try:
+            with _Lock(fd):
+                view = memoryview(data)
+                while view:
+                    written = os.write(fd, view)
+                    view = view[written:]
+                size = os.fstat(fd).st_size
+        finally:
+            os.close(fd)
+        if self.compact_bytes is not None and size >= self.compact_bytes:
+            self.compact()
+        return len(lines)
+
+    def has_deltas(self):
+        """Return True if the log holds records not yet compacted."""
+        return os.path.exists(self.log_path) and os.path.getsize(self.log_path) > 0
+
+    def iter_deltas(self):
+        """
+        Yield the logged records in append order.
+
+        A trailing line without a newline (an interrupted write) is ignored.
+
+        Yields:
+            tuple: (title, context, qa dict)
+        """
+        if not os.path.exists(self.log_path):
+            return
+        with open(self.log_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.endswith('\n'):
+                    break
+                entry = json.loads(line)
+                yield entry['title'], entry['context'], entry['qa']
+
+    def iter_merged(self):
+        """
+        Stream the base file and the log as one view.
+
+        The log is read before the base file is opened, so a compaction that
+        runs in between cannot hide records from this reader.
+
+        Yields:
+            tuple: (title, context, qa dict)
+        """
+        deltas = {}
+        for record in self.iter_deltas():
+            deltas[str(record[2]['id'])] = record
+        if os.path.exists(self.base_path):
+            for record in iter_squad_records(self.base_path):
+                replacement = deltas.pop(str(record[2]['id']), None)
+                yield replacement if replacement is not None else record
+        yield from deltas.values()
+
+    def compact(self):
+        """
+        Fold the log into the base file and its siblings, then empty the log.
+
+        The base file is streamed article by article and rewritten with the
+        deltas folded in, so memory is bounded by the log and one paragraph,
+        not by the corpus. The CSV and normalized siblings are then
+        regenerated from the new base file. Each new file is written next to
+        the old one and swapped in with os.replace, so concurrent readers
+        see either the old or the new file. Appends block on the log lock
+        for the duration.
+
+        Returns:
+            int: Number of records in the compacted base file
+        """
+        fd = self._open_log()
+        try:
+            with _Lock(fd):
+                count = self._write_squad()
+                if self.csv_path:
+                    self._write_csv(iter_squad_records(self.base_path))
+                if self.normalized_dir:
+                    self._write_normalized()
+                os.ftruncate(fd, 0)
+        finally:
+            os.close(fd)
+        return count
+
+    def _plan_deltas(self, header):
+        """
+        Decide where each logged record goes in the compacted base file.
+
+        A record replaces the first base QA with its id, in place when it
+        keeps that QA's title and context. Every other record is added to
+        the paragraph with its title and context, or to a new one.
+
+        Returns:
+            tuple: (replacements {qa id: record or None to drop the base QA},
+                additions {title: {context: [qa, ...]}})
+        """
+        deltas = {}
+        for record in self.iter_deltas():
+            deltas[str(record[2]['id'])] = record
+        replacements = {}
+        if os.path.exists(self.base_path):
+            for title, context, qa in iter_squad_records(self.base_path, header=header):
+                qa_id = str(qa['id'])
+                if qa_id in deltas and qa_id not in replacements:
+                    record = deltas[qa_id]
+                    in_place = record[0] == title and record[1] == context
+                    replacements[qa_id] = record if in_place else None
+                    if in_place:
+                        del deltas[qa_id]
+        additions = {}
+        for title, context, qa in deltas.values():
+            additions.setdefault(title, {}).setdefault(context, []).append(qa)
+        return replacements, additions
+
+    def _write_squad(self):
+        """
+        Stream the base file and the log into a new base file.
+
+        Article, paragraph and top-level keys other than those the merge
+        touches are carried through. New QAs for an existing article or
+        paragraph land in the first one with that title and context instead
+        of starting a second one; the rest become new articles at the end.
+        """
+        header = {}
+        replacements, additions = self._plan_deltas(header)
+        articles = iter_squad_articles(self.base_path) if os.path.exists(self.base_path) else ()
+
+        tmp_path = f"{self.base_path}.{os.getpid()}.tmp"
+        count = 0
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write('{')
+            for key, value in {'version': '2.0', **header}.items():
+                f.write('\n  %s: %s,' % (json.dumps(key, ensure_ascii=False), _indented(value, 2)))
+            f.write('\n  "data": [')
+
+            def write_article(article_index, title, paragraphs, extra):
+                written = 0
+                f.write(',' if article_index else '')
+                f.write('\n    {')
+                if title is not None:
+                    f.write('\n      "title": %s,' % json.dumps(title, ensure_ascii=False))
+                f.write('\n      "paragraphs": [')
+                for paragraph_index, paragraph in enumerate(paragraphs):
+                    written += len(paragraph['qas'])
+                    f.write(',' if paragraph_index else '')
+                    f.write('\n' + textwrap.indent(json.dumps(paragraph, indent=2, ensure_ascii=False), ' ' * 8))
+                f.write('\n      ]')
+                for key, value in extra.items():
+                    f.write(',\n      %s: %s' % (json.dumps(key, ensure_ascii=False), _indented(value, 6)))
+                f.write('\n    }')
+                return written
+
+            def merged_paragraphs(title, paragraphs):
+                added = additions.pop(title, {})
+                for paragraph in paragraphs:
+                    qas = []
+                    for qa in paragraph.get('qas', []):
+                        qa_id = str(qa['id'])
+                        if qa_id in replacements:
+                            record = replacements.pop(qa_id)
+                            if record is not None:
+                                qas.append(record[2])
+                        else:
+                            qas.append(qa)
+                    paragraph['qas'] = qas + added.pop(paragraph.get('context'), [])
+                    yield paragraph
+                for context, qas in added.items():
+                    yield {'context': context, 'qas': qas}
+
+            article_index = 0
+            for title, paragraphs, extra in articles:
+                count += write_article(article_index, title, merged_paragraphs(title, paragraphs), extra)
+                article_index += 1
+            for title, paragraphs in list(additions.items()):
+                count += write_article(article_index, title, merged_paragraphs(title, ()), {})
+                article_index += 1
+            f.write('\n  ]\n}\n')
+        os.replace(tmp_path, self.base_path)
+        return count
+
+    def _write_csv(self, records):
+        """Rewrite the CSV sibling from the (already compacted) base records."""
+        tmp_path = f"{self.csv_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+            f.write(','.join(CSV_COLUMNS) + '\n')
+            writer = csv.writer(f, quoting=csv.QUOTE_NONNUMERIC, lineterminator='\n')
+            for title, context, qa in records:
+                answers = qa.get('answers') or [{'text': ''}]
+                writer.writerow([context, qa['question'], answers[0]['text'], title, _question_id(qa)])
+        os.replace(tmp_path, self.csv_path)
+
+    def _write_normalized(self):
+        """
+        Rewrite questions.json, contexts.json and answers.json from the base file.
+
+        Every paragraph becomes one context, every QA one question and every
+        gold answer one answer. Top-level keys other than the record array
+        (such as "_metadata") are carried over from the existing files.
+        """
+        outputs = {}
+        for name, key in NORMALIZED_FILES:
+            path = os.path.join(self.normalized_dir, name)
+            header = {}
+            if os.path.exists(path):
+                for _ in iter_json_array(path, key, header):
+                    pass
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            f = open(tmp_path, 'w', encoding='utf-8')
+            f.write('{')
+            for header_key, value in header.items():
+                f.write('\n  %s: %s,' % (json.dumps(header_key, ensure_ascii=False), _indented(value, 2)))
+            f.write('\n  %s: [' % json.dumps(key))
+            outputs[key] = (f, tmp_path, path, [0])
+
+        def write(key, record):
+            f, _, _, written = outputs[key]
+            f.write(',' if written[0] else '')
+            f.write('\n' + textwrap.indent(json.dumps(record, indent=2, ensure_ascii=False), ' ' * 4))
+            written[0] += 1
+
+        try:
+            answer_id = 0
+            for context_id, (title, paragraph) in enumerate(iter_squad_paragraphs(self.base_path), 1):
+                write('contexts', {'id': context_id, 'text': paragraph['context'], 'domain': title})
+                for qa in paragraph['qas']:
+                    question_id = _question_id(qa)
+                    write('questions', {'id': question_id, 'context_id': context_id,
+                                        'question': qa['question'], 'domain': title})
+                    for answer in qa.get('answers') or []:
+                        answer_id += 1
+                        write('answers', {'id': answer_id, 'question_id': question_id,
+                                          'answer': answer['text'], 'answer_start': answer['answer_start']})
+        finally:
+            for f, _, _, _ in outputs.values():
+                f.write('\n  ]\n}\n')
+                f.close()
+        for _, tmp_path, path, _ in outputs.values():
+            os.replace(tmp_path, path)
+
+def _question_id(qa):
+    """Numeric QA ids are stored as numbers in the CSV and normalized files."""
+    return int(qa['id']) if str(qa['id']).isdigit() else qa['id']
+
+def _indented(value, indent):
+    """JSON-encode a value for a member nested `indent` spaces deep."""
+    text = json.dumps(value, indent=2, ensure_ascii=False)
+    return text.replace('\n', '\n' + ' ' * indent)
+
+def iter_merged_records(base_path='../squad_format.json'):
+    """
+    Stream a SQuAD file merged with its delta log, if it has one.
+
+    Args:
+        base_path (str): Path to the SQuAD JSON file
+
+    Returns:
+        iterator: (title, context, qa dict) records
+    """
+    return DeltaLog(base_path, compact_bytes=None).iter_merged()
+
+def has_pending_deltas(base_path='../squad_format.json'):
+    """Return True if the SQuAD file has records waiting in its delta log."""
+    return DeltaLog(base_path, compact_bytes=None).has_deltas()
+
+def iter_dataset(file_path='../squad_format.json'):
+    """
+    Stream a SQuAD dataset from the fastest up-to-date source.
+
+    QAs waiting in the delta log are merged in. Otherwise the compiled
+    columnar store (see columnar_store.py) is used when an up-to-date one
+    exists, else the JSON is parsed incrementally. This is the loader
+    behind the example scripts' load_dataset functions.
+
+    Args:
+        file_path (str): Path to the SQuAD JSON file
+
+    Yields:
+        tuple: (article title, context, qa dict)
+    """
+    if has_pending_deltas(file_path):
+        yield from iter_merged_records(file_path)
+        return
+    store = open_compiled(file_path)
+    if store is not None:
+        # Unmapped once the records are consumed or the iterator is discarded
+        with store:
+            yield from store.iter_records()
+        return
+    yield from iter_squad_records(file_path)
+
+def benchmark_appends(log, count=10000, batch_size=500):
+    """
+    Measure append throughput with synthetic QAs.
+
+    Returns:
+        float: QAs appended per second
+    """
+    context = "Benchmark context passage used for append throughput measurements."
+    start = time.perf_counter()
+    for batch_start in range(0, count, batch_size):
+        batch = [
+            ('Benchmark', context, {
+                'id': f'bench-{i}',
+                'question': f'Benchmark question {i}?',
+                'answers': [{'text': 'Benchmark', 'answer_start': 0}],
+                'is_impossible': False
+            })
+            for i in range(batch_start, min(count, batch_start + batch_size))
+        ]
+        log.append(batch)
+    return count / (time.perf_counter() - start)
+
+def main():
+    """
+    Compact the delta log of squad_format.json, or benchmark appends.
+    """
+    print("=" * 60)
+    print("Append-Only Ingestion Log")
+    print("Author: Molla Samser - https://rskworld.in")
+    print("=" * 60)
+
+    command = sys.argv[1] if len(sys.argv) > 1 else 'status'
+    log = DeltaLog('../squad_format.json', csv_path='../dataset.csv', normalized_dir='..')
+
+    if command == 'compact':
+        count = log.compact()
+        print(f"\nCompacted {log.log_path} into {log.base_path} ({count} QAs)")
+    elif command == 'bench':
+        with tempfile.TemporaryDirectory() as directory:
+            rate = benchmark_appends(DeltaLog(os.path.join(directory, 'bench.json'), compact_bytes=None))
+        print(f"\nAppended {rate:.0f} QAs per second")
+    else:
+        pending = sum(1 for _ in log.iter_deltas())
+        print(f"\n{log.log_path}: {pending} pending QAs")
+
+if __name__ == "__main__":
+    main()
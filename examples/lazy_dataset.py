@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+    Project: Question Answering Dataset
+    Description: A dataset containing context passages, questions, and answers for training QA models and reading comprehension systems.
+    Author: Molla Samser
+    Website: https://rskworld.in
+    Contact: help@rskworld.in
+    Phone: +91 93305 39277
+
+    Lazy Random-Access SQuAD Dataset
+    Builds a persistent index (squad_format.json.offsets.npz) that maps every
+    question to the byte range of its paragraph in one streaming scan. After
+    that, fetching a question reads and parses only that paragraph.
+
+    Usage:
+        python lazy_dataset.py ../squad_format.json 2
+"""
+
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from sidecar import file_signature
+from squad_reader import iter_squad_paragraph_spans
+
+INDEX_VERSION = 1
+INDEX_SUFFIX = '.offsets.npz'
+
+def build_offset_index(file_path):
+    """
+    Scan a SQuAD file once and record where each paragraph lives.
+
+    Args:
+        file_path (str): Path to the SQuAD JSON file
+
+    Returns:
+        dict: numpy arrays describing paragraphs and questions
+    """
+    titles = {}
+    para_start, para_end, para_title = [], [], []
+    question_para, question_pos, ids = [], [], []
+    for title, paragraph, start, end in iter_squad_paragraph_spans(file_path):
+        para_index = len(para_start)
+        para_start.append(start)
+        para_end.append(end)
+        para_title.append(titles.setdefault(title, len(titles)))
+        for position, qa in enumerate(paragraph['qas']):
+            question_para.append(para_index)
+            question_pos.append(position)
+            ids.append(str(qa['id']))
+
+    ids = np.array(ids, dtype=str)
+    id_order = np.argsort(ids, kind='stable')
+    signature = file_signature(file_path, with_hash=False)
+    return {
+        'version': np.array(INDEX_VERSION),
+        'signature': np.array(json.dumps(signature)),
+        'titles': np.array(list(titles), dtype=str),
+        'para_start': np.array(para_start, dtype=np.int64),
+        'para_end': np.array(para_end, dtype=np.int64),
+        'para_title': np.array(para_title, dtype=np.int32),
+        'question_para': np.array(question_para, dtype=np.int32),
+        'question_pos': np.array(question_pos, dtype=np.int32),
+        # Ids in sorted order, and the item position of each, for binary search
+        'sorted_ids': ids[id_order],
+        'id_order': id_order.astype(np.int64)
+    }
+
+def load_offset_index(file_path, rebuild=False):
+    """
+    Load the persisted index for a SQuAD file, rebuilding it if the file changed.
+
+    Args:
+        file_path (str): Path to the SQuAD JSON file
+        rebuild (bool): Force a fresh scan
+
+    Returns:
+        dict: Index arrays
+    """
+    index_path = file_path + INDEX_SUFFIX
+    if not rebuild and os.path.exists(index_path):
+        with np.load(index_path) as data:
+            index = {key: data[key] for key in data.files}
+        signature = json.loads(str(index['signature']))
+        stat = os.stat(file_path)
+        if (int(index['version']) == INDEX_VERSION and stat.st_size == signature['size']
+                and stat.st_mtime == signature['mtime']):
+            return index
+
+    index = build_offset_index(file_path)
+    tmp_path = f"{index_path}.{os.getpid()}.tmp.npz"
+    np.savez(tmp_path, **index)
+    os.replace(tmp_path, index_path)
+    return index
+
+class LazySquadDataset:
+    """
+    Random-access view of a SQuAD file that parses one paragraph per lookup.
+
+    Items are (article title, context, qa) records, the same shape as
+    iter_squad_records yields. Memory use is the index plus the most
+    recently read paragraph, independent of file size.
+    """
+
+    def __init__(self, file_path='../squad_format.json', rebuild_index=False):
+        """
+        Args:
+            file_path (str): Path to the SQuAD JSON file
+            rebuild_index (bool): Ignore any persisted index
+        """
+        self.file_path = file_path
+        self.index = load_offset_index(file_path, rebuild=rebuild_index)
+        self._file = open(file_path, 'rb')
+        self._cached_para = -1
+        self._cached_paragraph = None
+
+    def __len__(self):
+        return len(self.index['question_para'])
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        para = int(self.index['question_para'][i])
+        paragraph = self._read_paragraph(para)
+        title = str(self.index['titles'][self.index['para_title'][para]])
+        qa = paragraph['qas'][int(self.index['question_pos'][i])]
+        return title, paragraph['context'], qa
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._file.close()
+
+    def _read_paragraph(self, para):
+        """Read and parse one paragraph, reusing the last one when possible."""
+        if para != self._cached_para:
+            start = int(self.index['para_start'][para])
+            end = int(self.index['para_end'][para])
+            self._file.seek(start)
+            self._cached_paragraph = json.loads(self._file.read(end - start).decode('utf-8'))
+            self._cached_para = para
+        return self._cached_paragraph
+
+    def position_of(self, question_id):
+        """
+        Find the item position of a question id by binary search.
+
+        Returns:
+            int or None: Position, or None if the id is unknown
+        """
+        sorted_ids = self.index['sorted_ids']
+        question_id = str(question_id)
+        lo = int(np.searchsorted(sorted_ids, question_id))
+        if lo < len(sorted_ids) and sorted_ids[lo] == question_id:
+            return int(self.index['id_order'][lo])
+        return None
+
+    def get_by_id(self, question_id):
+        """
+        Fetch a question by its id.
+
+        Args:
+            question_id (str): QA id as stored in the file
+
+        Returns:
+            tuple: (article title, context, qa dict)
+
+        Raises:
+            KeyError: If no question has this id
+        """
+        position = self.position_of(question_id)
+        if position is None:
+            raise KeyError(question_id)
+        return self[position]
+
+def main():
+    """
+    Build or load the index and fetch one question by id.
+    """
+    print("=" * 60)
+    print("Lazy Random-Access SQuAD Dataset")
+    print("Author: Molla Samser - https://rskworld.in")
+    print("=" * 60)
+
+    file_path = sys.argv[1] if len(sys.argv) > 1 else '../squad_format.json'
+    start = time.perf_counter()
+    with LazySquadDataset(file_path) as dataset:
+        print(f"\nOpened {file_path}: {len(dataset)} questions "
+              f"({(time.perf_counter() - start) * 1000:.2f} ms)")
+
+        question_id = sys.argv[2] if len(sys.argv) > 2 else str(dataset.index['sorted_ids'][0])
+        start = time.perf_counter()
+        title, context, qa = dataset.get_by_id(question_id)
+        print(f"\nFetched id {question_id} in {(time.perf_counter() - start) * 1000:.3f} ms")
+        print(f"Title: {title}")
+        print(f"Context: {context[:100]}...")
+        print(f"Question: {qa['question']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""
+    Project: Question Answering Dataset
+    Description: A dataset containing context passages, questions, and answers for training QA models and reading comprehension systems.
+    Author: Molla Samser
+    Website: https://rskworld.in
+    Contact: help@rskworld.in
+    Phone: +91 93305 39277
+
+    Model Registry
+    Process-wide registry that loads each (model name, revision, dtype)
+    once and hands out shared eval-mode instances. Tokenizers and pipelines
+    built on registered models are shared too, so the examples never load
+    the same weights twice.
+
+    Usage:
+        from model_registry import registry
+        model = registry.get_model("bert-base-uncased")
+"""
+
+import gc
+import os
+import threading
+import time
+
+import torch
+from transformers import AutoModelForQuestionAnswering, AutoTokenizer, pipeline
+
+try:
+    import resource
+except ImportError:  # Windows: resident memory is not reported
+    resource = None
+
+DTYPES = {
+    'float32': torch.float32,
+    'float16': torch.float16,
+    'bfloat16': torch.bfloat16,
+    'int8': None  # dynamic INT8 quantization of the linear layers (see quantization.py)
+}
+
+def resident_memory():
+    """
+    Return the resident set size of this process in bytes.
+
+    Uses /proc on Linux; elsewhere falls back to the peak RSS, or 0.
+    """
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource is None:
+        return 0
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if os.uname().sysname == 'Darwin' else peak * 1024
+
+def parameter_bytes(model):
+    """Return the bytes held by a model's parameters and buffers (packed INT8 weights excluded)."""
+    tensors = list(model.parameters()) + list(model.buffers())
+    return sum(tensor.numel() * tensor.element_size() for tensor in tensors)
+
+class ModelRegistry:
+    """
+    Loads models and tokenizers once per process and shares them.
+
+    Models are keyed by (name, revision, dtype) and returned in eval mode.
+    The model class only matters for the first load of a key. All methods
+    are thread-safe.
+    """
+
+    def __init__(self):
+        self._models = {}
+        self._tokenizers = {}
+        self._pipelines = {}
+        self._stats = {}
+        self._lock = threading.RLock()
+
+    def get_model(self, name, revision='main', dtype='float32', model_class=AutoModelForQuestionAnswering):
+        """
+        Return the shared model for (name, revision, dtype), loading it on first use.
+
+        Args:
+            name (str): Hub name or local directory
+            revision (str): Model revision
+            dtype (str): One of DTYPES
+            model_class: transformers class used to load the model
+
+        Returns:
+            torch.nn.Module: Shared model in eval mode
+        """
+        if dtype not in DTYPES:
+            raise ValueError(f"Unknown dtype '{dtype}', expected one of {sorted(DTYPES)}")
+        key = (name, revision, dtype)
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                return model
+
+            memory_before = resident_memory()
+            start = time.perf_counter()
+            if dtype == 'int8':
+                # Imported here: quantization.py imports bert_example, which imports this module
+                from quantization import load_quantized
+                model = load_quantized(name, revision, model_class=model_class)
+            else:
+                model = model_class.from_pretrained(name, revision=revision).eval()
+                if DTYPES[dtype] != torch.float32:
+                    model = model.to(DTYPES[dtype])
+            self._models[key] = model
+            self._stats[key] = {
+                'name': name,
+                'revision': revision,
+                'dtype': dtype,
+                'class': type(model).__name__,
+                'load_seconds': time.perf_counter() - start,
+                'resident_mb': (resident_memory() - memory_before) / 1e6,
+                'parameter_mb': parameter_bytes(model) / 1e6,
+                'warmup_seconds': None
+            }
+            return model
+
+    def get_tokenizer(self, name, revision='main'):
+        """Return the shared (fast, when available) tokenizer for a model."""
+        key = (name, revision)
+        with self._lock:
+            tokenizer = self._tokenizers.get(key)
+            if tokenizer is None:
+                tokenizer = AutoTokenizer.from_pretrained(name, revision=revision)
+                self._tokenizers[key] = tokenizer
+            return tokenizer
+
+    def get_pipeline(self, task, name, revision='main', dtype='float32'):
+        """
+        Return a shared pipeline built on the registered model and tokenizer.
+
+        Args:
+            task (str): Pipeline task, e.g. "question-answering"
+            name (str): Hub name or local directory
+            revision (str): Model revision
+            dtype (str): One of DTYPES
+        """
+        key = (task, name, revision, dtype)
+        with self._lock:
+            qa_pipeline = self._pipelines.get(key)
+            if qa_pipeline is None:
+                qa_pipeline = pipeline(task, model=self.get_model(name, revision, dtype),
+                                       tokenizer=self.get_tokenizer(name, revision))
+                self._pipelines[key] = qa_pipeline
+            return qa_pipeline
+
+    def warmup(self, name, revision='main', dtype='float32'):
+        """
+        Run one forward pass so the first real request skips lazy initialization.
+
+        Returns:
+            float: Seconds taken by the warmup pass
+        """
+        model = self.get_model(name, revision, dtype)
+        tokenizer = self.get_tokenizer(name, revision)
+        inputs = tokenizer("Where is the Eiffel Tower located?",
+                           "The Eiffel Tower is on the Champ de Mars in Paris, France.",
+                           return_tensors='pt')
+        start = time.perf_counter()
+        with torch.no_grad():
+            model(**inputs)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._stats[(name, revision, dtype)]['warmup_seconds'] = elapsed
+        return elapsed
+
+    def unload(self, name, revision=None, dtype=None):
+        """
+        Drop registered models (and their pipelines) matching name, and
+        revision/dtype when given.
+
+        Callers that still hold a reference keep the model alive.
+
+        Returns:
+            int: Number of models unloaded
+        """
+        def matches(key_name, key_revision, key_dtype):
+            return (key_name == name and revision in (None, key_revision)
+                    and dtype in (None, key_dtype))
+
+        with self._lock:
+            keys = [key for key in self._models if matches(*key)]
+            for key in keys:
+                del self._models[key]
+                del self._stats[key]
+            for key in [key for key in self._pipelines if matches(*key[1:])]:
+                del self._pipelines[key]
+            if not any(key[0] == name for key in self._models):
+                for key in [key for key in self._tokenizers if key[0] == name]:
+                    del self._tokenizers[key]
+        gc.collect()
+        return len(keys)
+
+    def loaded(self):
+        """Return the (name, revision, dtype) keys currently registered."""
+        with self._lock:
+            return list(self._models)
+
+    def report(self):
+        """
+        Returns:
+            list: One dict per loaded model with name, revision, dtype, class,
+                load_seconds, resident_mb (RSS growth during load), parameter_mb
+                and warmup_seconds
+        """
+        with self._lock:
+            return [dict(stats) for stats in self._stats.values()]
+
+    def print_report(self):
+        """Print load time and memory for every loaded model."""
+        for stats in self.report():
+            warmup = f", warmup {stats['warmup_seconds'] * 1000:.0f} ms" if stats['warmup_seconds'] is not None else ''
+            print(f"  {stats['name']}@{stats['revision']} [{stats['dtype']}] {stats['class']}: "
+                  f"loaded in {stats['load_seconds']:.2f} s, +{stats['resident_mb']:.0f} MB resident, "
+                  f"{stats['parameter_mb']:.0f} MB parameters{warmup}")
+
+# Process-wide registry shared by the examples
+registry = ModelRegistry()
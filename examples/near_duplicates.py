@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""
+    Project: Question Answering Dataset
+    Description: A dataset containing context passages, questions, and answers for training QA models and reading comprehension systems.
+    Author: Molla Samser
+    Website: https://rskworld.in
+    Contact: help@rskworld.in
+    Phone: +91 93305 39277
+
+    Near-Duplicate Detection with MinHash LSH
+    Finds paraphrased questions and contexts that exact-string dedupe misses.
+    Texts are split into character shingles, summarized as MinHash signatures
+    computed with vectorized NumPy, and grouped with LSH banding so only
+    likely pairs are compared. Total work grows roughly linearly with the
+    number of texts.
+
+    Usage:
+        python near_duplicates.py
+"""
+
+import json
+import re
+import zlib
+
+import numpy as np
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+def shingles(text, k=4):
+    """
+    Hash the character k-grams of a normalized text (lowercased, punctuation
+    removed, whitespace collapsed).
+
+    Args:
+        text (str): Input text
+        k (int): Shingle length in characters
+
+    Returns:
+        np.ndarray: Unique 32-bit shingle hashes (uint64 for the hashing arithmetic)
+    """
+    text = re.sub(r'\s+', ' ', re.sub(r'[^\w\s]', ' ', text.lower())).strip()
+    if len(text) <= k:
+        grams = [text]
+    else:
+        grams = [text[i:i + k] for i in range(len(text) - k + 1)]
+    return np.unique(np.fromiter((zlib.crc32(g.encode('utf-8')) for g in grams),
+                                 dtype=np.uint64, count=len(grams)))
+
+class MinHasher:
+    """
+    MinHash signatures using num_perm universal hash functions
+    h(x) = (a * x + b) mod (2^61 - 1), truncated to 32 bits.
+    """
+
+    def __init__(self, num_perm=128, seed=1):
+        rng = np.random.default_rng(seed)
+        # a, b < 2^31 and x < 2^32 keep a * x + b below 2^64
+        self.a = rng.integers(1, 1 << 31, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, 1 << 31, size=num_perm, dtype=np.uint64)
+        self.num_perm = num_perm
+
+    def signature(self, hashes):
+        """
+        Compute one signature from shingle hashes.
+
+        Args:
+            hashes (np.ndarray): uint shingle hashes
+
+        Returns:
+            np.ndarray: uint32 signature of length num_perm
+        """
+        if hashes.size == 0:
+            return np.full(self.num_perm, MAX_HASH, dtype=np.uint32)
+        permuted = (np.outer(self.a, hashes) + self.b[:, None]) % MERSENNE_PRIME
+        return (permuted & MAX_HASH).min(axis=1).astype(np.uint32)
+
+    def signatures(self, texts, k=4):
+        """Return an (n, num_perm) uint32 matrix of signatures for a list of texts."""
+        matrix = np.empty((len(texts), self.num_perm), dtype=np.uint32)
+        for i, text in enumerate(texts):
+            matrix[i] = self.signature(shingles(text, k))
+        return matrix
+
+def optimal_bands(threshold, num_perm):
+    """
+    Choose LSH bands and rows per band for a Jaccard threshold.
+
+    The S-curve of b bands of r rows has its steepest point near
+    (1 / b) ** (1 / r); pick the factorization closest to the threshold.
+
+    Returns:
+        tuple: (bands, rows)
+    """
+    best = None
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        error = abs((1.0 / bands) ** (1.0 / rows) - threshold)
+        if best is None or error < best[0]:
+            best = (error, bands, rows)
+    return best[1], best[2]
+
+class MinHashLSH:
+    """
+    LSH index over MinHash signatures.
+
+    Each signature is cut into bands; texts that share any band bucket are
+    candidates, and candidates are confirmed by their estimated Jaccard
+    similarity (the fraction of equal signature positions).
+    """
+
+    def __init__(self, threshold=0.8, num_perm=128, seed=1, k=4):
+        self.threshold = threshold
+        self.k = k
+        self.hasher = MinHasher(num_perm, seed)
+        self.bands, self.rows = optimal_bands(threshold, num_perm)
+        self.buckets = [{} for _ in range(self.bands)]
+        self.signatures = {}
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def _band_keys(self, signature):
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def insert(self, key, text=None, signature=None):
+        """Add a text (or a precomputed signature) under a key."""
+        if signature is None:
+            signature = self.hasher.signature(shingles(text, self.k))
+        self.signatures[key] = signature
+        for bucket, band_key in zip(self.buckets, self._band_keys(signature)):
+            bucket.setdefault(band_key, []).append(key)
+
+    def query(self, text=None, signature=None):
+        """
+        Find indexed keys whose estimated similarity reaches the threshold.
+
+        Returns:
+            list: (key, estimated Jaccard similarity) pairs
+        """
+        if signature is None:
+            signature = self.hasher.signature(shingles(text, self.k))
+        candidates = set()
+        for bucket, band_key in zip(self.buckets, self._band_keys(signature)):
+            candidates.update(bucket.get(band_key, ()))
+        matches = []
+        for key in candidates:
+            similarity = float(np.mean(self.signatures[key] == signature))
+            if similarity >= self.threshold:
+                matches.append((key, similarity))
+        return matches
+
+def find_clusters(texts, keys=None, threshold=0.8, num_perm=128):
+    """
+    Group near-duplicate texts into clusters.
+
+    Args:
+        texts (list): Texts to compare
+        keys (list): Identifier for each text, defaults to positions
+        threshold (float): Estimated Jaccard similarity above which texts are duplicates
+        num_perm (int): Signature length
+
+    Returns:
+        list: Clusters (lists of keys) with more than one member
+    """
+    keys = list(range(len(texts))) if keys is None else list(keys)
+    lsh = MinHashLSH(threshold, num_perm)
+    matrix = lsh.hasher.signatures(texts, lsh.k)
+
+    parent = list(range(len(keys)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i in range(len(keys)):
+        for j, _ in lsh.query(signature=matrix[i]):
+            parent[find(i)] = find(j)
+        lsh.insert(i, signature=matrix[i])
+
+    clusters = {}
+    for i in range(len(keys)):
+        clusters.setdefault(find(i), []).append(keys[i])
+    return [members for members in clusters.values() if len(members) > 1]
+
+def find_duplicate_questions(questions_path='../questions.json', threshold=0.8):
+    """
+    Report clusters of near-duplicate questions in questions.json.
+
+    Returns:
+        list: Clusters of question ids
+    """
+    with open(questions_path, 'r', encoding='utf-8') as f:
+        questions = json.load(f)['questions']
+    return find_clusters([q['question'] for q in questions], [q['id'] for q in questions], threshold)
+
+def find_duplicate_contexts(contexts_path='../contexts.json', threshold=0.8):
+    """
+    Report clusters of near-duplicate passages in contexts.json.
+
+    Returns:
+        list: Clusters of context ids
+    """
+    with open(contexts_path, 'r', encoding='utf-8') as f:
+        contexts = json.load(f)['contexts']
+    return find_clusters([c['text'] for c in contexts], [c['id'] for c in contexts], threshold)
+
+class NearDuplicateFilter:
+    """
+    Ingestion-time filter that drops texts close to anything already seen.
+
+    Seed it with the existing corpus, then pass crawled items through
+    filter(); accepted items are added to the index, so duplicates within
+    the incoming batch are dropped too.
+    """
+
+    def __init__(self, existing_texts=(), threshold=0.8, num_perm=128):
+        self.lsh = MinHashLSH(threshold, num_perm)
+        for text in existing_texts:
+            self.add(text)
+
+    def add(self, text):
+        self.lsh.insert(len(self.lsh), text)
+
+    def is_duplicate(self, text):
+        return bool(self.lsh.query(text))
+
+    def filter(self, items, key=None):
+        """
+        Yield the items whose text is not a near duplicate.
+
+        Args:
+            items (iterable): Texts, or records when `key` is given
+            key (callable): Extracts the text to compare from an item
+        """
+        for item in items:
+            text = key(item) if key else item
+            if self.is_duplicate(text):
+                continue
+            self.add(text)
+            yield item
+
+def main():
+    """
+    Report near-duplicate clusters in the normalized dataset files.
+    """
+    print("=" * 60)
+    print("Near-Duplicate Detection (MinHash LSH)")
+    print("Author: Molla Samser - https://rskworld.in")
+    print("=" * 60)
+
+    for name, clusters in (('questions', find_duplicate_questions()),
+                           ('contexts', find_duplicate_contexts())):
+        print(f"\nNear-duplicate {name}: {len(clusters)} clusters")
+        for cluster in clusters:
+            print(f"  ids {cluster}")
+
+    with open('../questions.json', 'r', encoding='utf-8') as f:
+        existing = [q['question'] for q in json.load(f)['questions']]
+    crawled = ["What is artificial intelligence?", "What is Artificial Intelligence ?",
+               "Who painted the Mona Lisa?"]
+    dedupe = NearDuplicateFilter(existing)
+    print(f"\nFiltering crawled questions: kept {list(dedupe.filter(crawled))}")
+
+if __name__ == "__main__":
+    main()
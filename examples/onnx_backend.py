@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+    Project: Question Answering Dataset
+    Description: A dataset containing context passages, questions, and answers for training QA models and reading comprehension systems.
+    Author: Molla Samser
+    Website: https://rskworld.in
+    Contact: help@rskworld.in
+    Phone: +91 93305 39277
+
+    ONNX Runtime Backend
+    Exports the question answering model used by bert_example.py and
+    transformers_example.py to ONNX (dynamic batch and sequence axes) and
+    runs it with ONNX Runtime on CPU. OnnxQAModel returns the same outputs
+    as the PyTorch model, so it can be passed to predict_answer,
+    predict_answers and predict_answer_long unchanged.
+
+    Usage:
+        python onnx_backend.py export [model_name]
+        python onnx_backend.py bench [model_name]
+"""
+
+import inspect
+import os
+import re
+import sys
+import time
+
+import numpy as np
+import onnxruntime as ort
+import torch
+from transformers import AutoConfig, AutoModelForQuestionAnswering, AutoTokenizer
+from transformers.modeling_outputs import QuestionAnsweringModelOutput
+
+from bert_example import load_dataset, predict_answer
+
+DEFAULT_EXPORT_DIR = '../onnx_models'
+ONNX_NAME = 'model.onnx'
+OUTPUT_NAMES = ['start_logits', 'end_logits']
+
+def onnx_export_dir(model_name, export_dir=DEFAULT_EXPORT_DIR):
+    """Return the directory an exported model is written to."""
+    return os.path.join(export_dir, re.sub(r'[^\w.-]+', '--', model_name.strip('/')))
+
+def export_onnx(model_name, output_dir=None, opset=17):
+    """
+    Export a question answering model and its tokenizer for ONNX Runtime.
+
+    Args:
+        model_name (str): Hub name or local directory of the model
+        output_dir (str): Directory for model.onnx, the config and the tokenizer
+        opset (int): ONNX opset version
+
+    Returns:
+        str: Path of the exported model.onnx
+    """
+    output_dir = output_dir or onnx_export_dir(model_name)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    # Eager attention traces to plain MatMul/Softmax nodes that every ORT build optimizes
+    model = AutoModelForQuestionAnswering.from_pretrained(model_name, attn_implementation='eager').eval()
+
+    sample = tokenizer("Where is the Eiffel Tower located?",
+                       "The Eiffel Tower is on the Champ de Mars in Paris, France.",
+                       return_tensors='pt')
+    # The exporter binds inputs in forward() order, which differs from the tokenizer's key order
+    input_names = [name for name in inspect.signature(model.forward).parameters if name in sample]
+    dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in input_names + OUTPUT_NAMES}
+
+    os.makedirs(output_dir, exist_ok=True)
+    onnx_path = os.path.join(output_dir, ONNX_NAME)
+    tmp_path = f"{onnx_path}.{os.getpid()}.tmp"
+    # dynamo=False keeps the TorchScript exporter (the default changed in torch 2.9; the flag needs 2.5+)
+    with torch.no_grad():
+        torch.onnx.export(model, (dict(sample),), tmp_path, input_names=input_names,
+                          output_names=OUTPUT_NAMES, dynamic_axes=dynamic_axes,
+                          opset_version=opset, dynamo=False)
+    os.replace(tmp_path, onnx_path)
+    model.config.save_pretrained(output_dir)
+    tokenizer.save_pretrained(output_dir)
+    return onnx_path
+
+def create_session(onnx_path, intra_op_threads=None, inter_op_threads=None):
+    """
+    Open an ONNX Runtime CPU session.
+
+    Args:
+        onnx_path (str): Exported model
+        intra_op_threads (int): Threads used inside one operator (None for the ORT default)
+        inter_op_threads (int): Threads running independent operators in parallel
+
+    Returns:
+        onnxruntime.InferenceSession
+    """
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if intra_op_threads:
+        options.intra_op_num_threads = intra_op_threads
+    if inter_op_threads:
+        options.inter_op_num_threads = inter_op_threads
+        options.execution_mode = ort.ExecutionMode.ORT_PARALLEL
+    return ort.InferenceSession(onnx_path, options, providers=['CPUExecutionProvider'])
+
+class OnnxQAModel:
+    """
+    ONNX Runtime stand-in for a PyTorch question answering model.
+
+    Calling it with tokenizer outputs returns a QuestionAnsweringModelOutput
+    holding torch tensors, like the eager model.
+    """
+
+    def __init__(self, session, config):
+        self.session = session
+        self.config = config
+        self.input_names = [node.name for node in session.get_inputs()]
+
+    @classmethod
+    def from_export(cls, output_dir, intra_op_threads=None, inter_op_threads=None):
+        """Load a model written by export_onnx."""
+        session = create_session(os.path.join(output_dir, ONNX_NAME), intra_op_threads, inter_op_threads)
+        return cls(session, AutoConfig.from_pretrained(output_dir))
+
+    def eval(self):
+        return self
+
+    def __call__(self, **inputs):
+        feed = {name: np.asarray(inputs[name], dtype=np.int64) for name in self.input_names}
+        start_logits, end_logits = self.session.run(OUTPUT_NAMES, feed)
+        return QuestionAnsweringModelOutput(start_logits=torch.from_numpy(start_logits),
+                                            end_logits=torch.from_numpy(end_logits))
+
+def benchmark_backends(model_name, output_dir=None, file_path='../squad_format.json', repeat=5,
+                       intra_op_threads=None, inter_op_threads=None):
+    """
+    Compare eager PyTorch with ONNX Runtime on the questions of a SQuAD file.
+
+    Args:
+        model_name (str): Hub name or local directory of the model
+        output_dir (str): Export directory (exported first if missing)
+        file_path (str): SQuAD file to run
+        repeat (int): Timed passes over the questions
+        intra_op_threads (int): ORT intra-op threads
+        inter_op_threads (int): ORT inter-op threads
+
+    Returns:
+        dict: Mean latency (ms) per backend, speedup, answer agreement and the
+            largest absolute logit difference
+    """
+    output_dir = output_dir or onnx_export_dir(model_name)
+    if not os.path.exists(os.path.join(output_dir, ONNX_NAME)):
+        export_onnx(model_name, output_dir)
+    tokenizer = AutoTokenizer.from_pretrained(output_dir)
+    backends = {
+        'torch': AutoModelForQuestionAnswering.from_pretrained(model_name).eval(),
+        'onnxruntime': OnnxQAModel.from_export(output_dir, intra_op_threads, inter_op_threads)
+    }
+    pairs = [(context, qa['question']) for _, context, qa in load_dataset(file_path)]
+
+    report = {}
+    answers = {}
+    for name, model in backends.items():
+        answers[name] = [predict_answer(context, question, model, tokenizer) for context, question in pairs]
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for context, question in pairs:
+                predict_answer(context, question, model, tokenizer)
+        report[name] = {'latency_ms': (time.perf_counter() - start) * 1000 / (repeat * len(pairs))}
+
+    max_diff = 0.0
+    with torch.no_grad():
+        for context, question in pairs:
+            inputs = tokenizer(question, context, truncation=True, return_tensors='pt')
+            expected = backends['torch'](**inputs)
+            actual = backends['onnxruntime'](**inputs)
+            max_diff = max(max_diff, float((expected.start_logits - actual.start_logits).abs().max()),
+                           float((expected.end_logits - actual.end_logits).abs().max()))
+
+    report['speedup'] = report['torch']['latency_ms'] / report['onnxruntime']['latency_ms']
+    report['agreement'] = float(np.mean([a == b for a, b in zip(answers['torch'], answers['onnxruntime'])]))
+    report['max_logit_diff'] = max_diff
+    return report
+
+def main():
+    """
+    Export the reader to ONNX, or benchmark ONNX Runtime against PyTorch.
+    """
+    print("=" * 60)
+    print("ONNX Runtime Backend")
+    print("Author: Molla Samser - https://rskworld.in")
+    print("=" * 60)
+
+    command = sys.argv[1] if len(sys.argv) > 1 else 'bench'
+    model_name = sys.argv[2] if len(sys.argv) > 2 else "bert-base-uncased"
+
+    if command == 'export':
+        print(f"\nExported {model_name} to {export_onnx(model_name)}")
+        return
+
+    report = benchmark_backends(model_name)
+    print(f"\nPyTorch (eager):  {report['torch']['latency_ms']:.2f} ms/question")
+    print(f"ONNX Runtime:     {report['onnxruntime']['latency_ms']:.2f} ms/question")
+    print(f"Speedup: {report['speedup']:.2f}x")
+    print(f"Same answer on {report['agreement']:.0%} of questions, "
+          f"max logit difference {report['max_logit_diff']:.2e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+"""
+    Project: Question Answering Dataset
+    Description: A dataset containing context passages, questions, and answers for training QA models and reading comprehension systems.
+    Author: Molla Samser
+    Website: https://rskworld.in
+    Contact: help@rskworld.in
+    Phone: +91 93305 39277
+
+    QA Join: Hash-Indexed Store over the Normalized Files
+    Loads questions.json, contexts.json and answers.json once, builds hash
+    indexes on id, context_id and question_id, and joins them back into
+    SQuAD-shaped records without scanning lists.
+
+    Usage:
+        python qa_join.py
+"""
+
+import json
+import os
+import random
+import time
+
+class NormalizedQAStore:
+    """
+    In-memory store over questions.json, contexts.json and answers.json.
+
+    All lookups are dictionary accesses, so each costs O(1) regardless of
+    corpus size.
+    """
+
+    def __init__(self, questions, contexts, answers):
+        """
+        Build the indexes.
+
+        Args:
+            questions (list): Question records with id, context_id, question, domain
+            contexts (list): Context records with id and text
+            answers (list): Answer records with id, question_id, answer, answer_start
+        """
+        self.questions = {q['id']: q for q in questions}
+        self.contexts = {c['id']: c for c in contexts}
+        self.answers = {a['id']: a for a in answers}
+
+        self.questions_by_context = {}
+        for q in questions:
+            self.questions_by_context.setdefault(q['context_id'], []).append(q)
+
+        self.answers_by_question = {}
+        for a in answers:
+            self.answers_by_question.setdefault(a['question_id'], []).append(a)
+
+    @classmethod
+    def from_directory(cls, directory='..'):
+        """
+        Load the three normalized JSON files from a directory.
+
+        Args:
+            directory (str): Directory holding questions.json, contexts.json and answers.json
+
+        Returns:
+            NormalizedQAStore: Indexed store
+        """
+        def read(name, key):
+            with open(os.path.join(directory, name), 'r', encoding='utf-8') as f:
+                return json.load(f)[key]
+
+        return cls(read('questions.json', 'questions'),
+                   read('contexts.json', 'contexts'),
+                   read('answers.json', 'answers'))
+
+    def __len__(self):
+        return len(self.questions)
+
+    def get_question(self, question_id):
+        """Return the question record with this id, or None."""
+        return self.questions.get(question_id)
+
+    def get_context(self, context_id):
+        """Return the context record with this id, or None."""
+        return self.contexts.get(context_id)
+
+    def get_context_for_question(self, question_id):
+        """Return the context record a question refers to, or None."""
+        question = self.questions.get(question_id)
+        if question is None:
+            return None
+        return self.contexts.get(question['context_id'])
+
+    def get_answers_for_question(self, question_id):
+        """Return the list of answer records for a question (empty if none)."""
+        return self.answers_by_question.get(question_id, [])
+
+    def list_questions_for_context(self, context_id):
+        """Return the list of question records that refer to a context."""
+        return self.questions_by_context.get(context_id, [])
+
+    def join(self, question_id):
+        """
+        Join one question with its context and answers.
+
+        Args:
+            question_id: Question id
+
+        Returns:
+            tuple: (domain, context text, qa dict) in the shape yielded by iter_squad_records
+        """
+        question = self.questions[question_id]
+        context = self.contexts[question['context_id']]
+        answers = [
+            {'text': a['answer'], 'answer_start': a['answer_start']}
+            for a in self.get_answers_for_question(question_id)
+        ]
+        qa = {
+            'id': str(question['id']),
+            'question': question['question'],
+            'answers': answers,
+            'is_impossible': not answers
+        }
+        return question.get('domain', ''), context['text'], qa
+
+    def iter_records(self):
+        """
+        Stream joined SQuAD-shaped records, grouped by context.
+
+        Yields:
+            tuple: (domain, context text, qa dict)
+        """
+        for context_id in self.contexts:
+            for question in self.list_questions_for_context(context_id):
+                yield self.join(question['id'])
+
+def find_qa_nested(squad_data, question_id):
+    """
+    Find a question by id by walking the nested SQuAD dicts (the baseline).
+
+    Args:
+        squad_data (dict): json.load-ed squad_format.json
+        question_id (str): Question id
+
+    Returns:
+        tuple or None: (title, context, qa dict)
+    """
+    for article in squad_data['data']:
+        for paragraph in article['paragraphs']:
+            for qa in paragraph['qas']:
+                if qa['id'] == question_id:
+                    return article['title'], paragraph['context'], qa
+    return None
+
+def _replicate(directory, squad_path, copies):
+    """
+    Build a larger synthetic corpus by repeating the dataset with fresh ids.
+
+    Returns:
+        tuple: (NormalizedQAStore, squad dict) holding the same records
+    """
+    def read(name, key):
+        with open(os.path.join(directory, name), 'r', encoding='utf-8') as f:
+            return json.load(f)[key]
+
+    questions = read('questions.json', 'questions')
+    contexts = read('contexts.json', 'contexts')
+    answers = read('answers.json', 'answers')
+    with open(squad_path, 'r', encoding='utf-8') as f:
+        squad_data = json.load(f)
+
+    q_step = max(q['id'] for q in questions)
+    c_step = max(c['id'] for c in contexts)
+    a_step = max(a['id'] for a in answers)
+    all_questions, all_contexts, all_answers, articles = [], [], [], []
+    for copy in range(copies):
+        all_questions += [dict(q, id=q['id'] + copy * q_step, context_id=q['context_id'] + copy * c_step)
+                          for q in questions]
+        all_contexts += [dict(c, id=c['id'] + copy * c_step) for c in contexts]
+        all_answers += [dict(a, id=a['id'] + copy * a_step, question_id=a['question_id'] + copy * q_step)
+                        for a in answers]
+        for article in squad_data['data']:
+            paragraphs = [
+                {'context': p['context'],
+                 'qas': [dict(qa, id=str(int(qa['id']) + copy * q_step)) for qa in p['qas']]}
+                for p in article['paragraphs']
+            ]
+            articles.append({'title': article['title'], 'paragraphs': paragraphs})
+    return NormalizedQAStore(all_questions, all_contexts, all_answers), {'data': articles}
+
+def benchmark_lookups(directory='..', squad_path='../squad_format.json', copies=200, lookups=5000):
+    """
+    Time random question -> (question, context, answers) lookups through the
+    indexed store and through nested-dict traversal of the SQuAD structure.
+
+    Args:
+        directory (str): Directory holding the normalized JSON files
+        squad_path (str): Path to the SQuAD JSON file
+        copies (int): Times the dataset is replicated to form the benchmark corpus
+        lookups (int): Number of random lookups
+
+    Returns:
+        dict: Corpus size and seconds taken by each approach
+    """
+    store, squad_data = _replicate(directory, squad_path, copies)
+    question_ids = list(store.questions)
+    sample = [random.choice(question_ids) for _ in range(lookups)]
+
+    start = time.perf_counter()
+    for question_id in sample:
+        store.get_question(question_id)
+        store.get_context_for_question(question_id)
+        store.get_answers_for_question(question_id)
+    indexed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for question_id in sample:
+        find_qa_nested(squad_data, str(question_id))
+    nested = time.perf_counter() - start
+
+    return {'questions': len(store), 'indexed': indexed, 'nested': nested}
+
+def main():
+    """
+    Build the store, show a joined record and benchmark lookups.
+    """
+    print("=" * 60)
+    print("Hash-Indexed QA Join")
+    print("Author: Molla Samser - https://rskworld.in")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    store = NormalizedQAStore.from_directory('..')
+    print(f"\nIndexed {len(store)} questions, {len(store.contexts)} contexts, "
+          f"{len(store.answers)} answers in {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    question_id = next(iter(store.questions))
+    domain, context, qa = store.join(question_id)
+    print(f"\nQuestion {question_id}: {qa['question']}")
+    print(f"Domain: {domain}")
+    print(f"Context: {context[:100]}...")
+    print(f"Answers: {[a['text'] for a in qa['answers']]}")
+
+    lookups = 5000
+    timings = benchmark_lookups('..', lookups=lookups)
+    print(f"\nBenchmark ({lookups} random lookups over {timings['questions']} questions):")
+    print(f"  Hash-indexed join:     {timings['indexed']:.3f} s")
+    print(f"  Nested-dict traversal: {timings['nested']:.3f} s")
+    print(f"  Speedup: {timings['nested'] / timings['indexed']:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+    Project: Question Answering Dataset
+    Description: A dataset containing context passages, questions, and answers for training QA models and reading comprehension systems.
+    Author: Molla Samser
+    Website: https://rskworld.in
+    Contact: help@rskworld.in
+    Phone: +91 93305 39277
+
+    Compact QA Records
+    A __slots__ record type for QA examples. It replaces the nested
+    {'context', 'question', 'answers': {'text': [...], 'answer_start': [...]}}
+    dicts, and questions on the same paragraph share one context string.
+
+    Usage:
+        python qa_records.py
+"""
+
+import sys
+import time
+import tracemalloc
+
+from squad_reader import iter_squad_records
+
+class QAExample:
+    """
+    One QA example with a single (first) answer.
+
+    The context attribute is a reference to a string shared with the other
+    questions of the same paragraph, never a copy.
+    """
+
+    __slots__ = ('id', 'title', 'context', 'question', 'answer_text', 'answer_start', 'is_impossible')
+
+    def __init__(self, id, title, context, question, answer_text='', answer_start=-1, is_impossible=False):
+        self.id = id
+        self.title = title
+        self.context = context
+        self.question = question
+        self.answer_text = answer_text
+        self.answer_start = answer_start
+        self.is_impossible = is_impossible
+
+    @classmethod
+    def from_squad(cls, title, context, qa):
+        """
+        Build an example from a flat (title, context, qa) SQuAD record.
+        """
+        answers = qa.get('answers') or []
+        if qa.get('is_impossible') or not answers:
+            return cls(qa['id'], title, context, qa['question'], is_impossible=True)
+        return cls(qa['id'], title, context, qa['question'],
+                   answers[0]['text'], answers[0]['answer_start'])
+
+    def to_hf_dict(self):
+        """
+        Return the nested dict format used by convert_squad_to_hf_dataset.
+        """
+        if self.is_impossible:
+            answers = {'text': [], 'answer_start': []}
+        else:
+            answers = {'text': [self.answer_text], 'answer_start': [self.answer_start]}
+        return {'context': self.context, 'question': self.question, 'answers': answers}
+
+    def __repr__(self):
+        return f"QAExample(id={self.id!r}, question={self.question!r}, answer_text={self.answer_text!r})"
+
+    def __eq__(self, other):
+        if not isinstance(other, QAExample):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+def iter_examples(records, include_impossible=False):
+    """
+    Turn flat (title, context, qa) records into QAExample objects.
+
+    Consecutive records with an equal context reuse the first context
+    string, so sources that decode a fresh copy per question (CSV, the
+    columnar store) still end up with one shared object per paragraph.
+    Titles are interned (a missing title becomes '').
+
+    Args:
+        records (iterable): (title, context, qa dict) records
+        include_impossible (bool): Keep unanswerable questions
+
+    Yields:
+        QAExample: One example per question
+    """
+    shared_context = None
+    for title, context, qa in records:
+        if context != shared_context:
+            shared_context = context
+        example = QAExample.from_squad(sys.intern(title or ''), shared_context, qa)
+        if example.is_impossible and not include_impossible:
+            continue
+        yield example
+
+def _measure(build):
+    """Return (objects, bytes allocated, seconds) for building a list."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    objects = build()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return objects, current, elapsed
+
+def benchmark_memory(file_path='../squad_format.json', copies=10000):
+    """
+    Compare the memory held by nested dicts and by QAExample records.
+
+    The dataset is repeated `copies` times with fresh ids and both
+    representations are built from the same records while tracemalloc
+    measures the allocations. Context strings are shared in both cases,
+    so the difference is the per-example overhead. Unanswerable questions
+    are left out of both, since iter_examples skips them by default.
+
+    Returns:
+        dict: bytes and seconds for 'dicts' and 'records', and the example count
+    """
+    base = [(title, context, qa) for title, context, qa in iter_squad_records(file_path)
+            if not qa.get('is_impossible') and qa.get('answers')]
+    records = [
+        (title, context, dict(qa, id=f"{qa['id']}-{copy}"))
+        for copy in range(copies)
+        for title, context, qa in base
+    ]
+
+    def build_dicts():
+        # Same layout as convert_squad_to_hf_dataset
+        return [
+            {
+                'context': context,
+                'question': qa['question'],
+                'answers': {
+                    'text': [answer['text'] for answer in qa['answers'][:1]],
+                    'answer_start': [answer['answer_start'] for answer in qa['answers'][:1]]
+                }
+            }
+            for _, context, qa in records
+        ]
+
+    def build_records():
+        return list(iter_examples(records))
+
+    dicts, dict_bytes, dict_seconds = _measure(build_dicts)
+    del dicts
+    examples, record_bytes, record_seconds = _measure(build_records)
+    return {
+        'examples': len(examples),
+        'dicts': {'bytes': dict_bytes, 'seconds': dict_seconds},
+        'records': {'bytes': record_bytes, 'seconds': record_seconds}
+    }
+
+def main():
+    """
+    Run the tracemalloc memory benchmark.
+    """
+    print("=" * 60)
+    print("Compact QA Records: Memory Benchmark")
+    print("Author: Molla Samser - https://rskworld.in")
+    print("=" * 60)
+
+    result = benchmark_memory()
+    n = result['examples']
+    print(f"\n{n} examples (contexts shared by reference in both cases)")
+    for name in ('dicts', 'records'):
+        print(f"  {name:8s} {result[name]['bytes'] / 1e6:8.2f} MB  "
+              f"{result[name]['bytes'] / n:6.0f} bytes/example  {result[name]['seconds']:.2f} s")
+    print(f"  Saved: {1 - result['records']['bytes'] / result['dicts']['bytes']:.0%}")
+
+if __name__ == "__main__":
+    main()
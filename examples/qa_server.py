@@ -0,0 +1,331 @@
+# -*- coding: utf-8 -*-
+"""
+    Project: Question Answering Dataset
+    Description: A dataset containing context passages, questions, and answers for training QA models and reading comprehension systems.
+    Author: Molla Samser
+    Website: https://rskworld.in
+    Contact: help@rskworld.in
+    Phone: +91 93305 39277
+
+    Asyncio QA Server with Micro-Batching
+    A small HTTP/1.1 service built on asyncio streams. Concurrent
+    POST /predict requests are collected into micro-batches (up to
+    max_batch_size requests, waiting at most max_wait_ms for the batch to
+    fill), the batched forward pass runs in a worker thread off the event
+    loop, and each caller gets its own answer back.
+
+    Usage:
+        python qa_server.py serve [model_name]
+        python qa_server.py bench [model_name]
+
+    Request:
+        curl -X POST localhost:8000/predict -d '{"context": "...", "question": "..."}'
+"""
+
+import asyncio
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from bert_example import load_dataset, predict_answers
+from model_registry import registry
+
+MAX_BODY_BYTES = 1 << 20
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 413: 'Payload Too Large',
+            500: 'Internal Server Error'}
+
+class MicroBatcher:
+    """
+    Groups concurrent requests into batches for a batch prediction function.
+
+    Batches run one at a time on a single worker thread; requests that
+    arrive while a batch runs queue up and form the next batch. If a batch
+    fails, its requests are retried one by one so the error only reaches
+    the request that caused it.
+    """
+
+    def __init__(self, predict_batch, max_batch_size=16, max_wait_ms=5.0):
+        """
+        Args:
+            predict_batch (callable): Takes a list of (context, question) pairs, returns answers
+            max_batch_size (int): Largest batch sent to predict_batch
+            max_wait_ms (float): How long the first request of a batch waits for company
+        """
+        self.predict_batch = predict_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.queue = None
+        self.task = None
+        self.batches = 0
+        self.requests = 0
+
+    def start(self):
+        """Start the batching loop on the running event loop."""
+        self.queue = asyncio.Queue()
+        self.task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+        self.executor.shutdown()
+
+    async def submit(self, context, question):
+        """Queue one request and wait for its answer."""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put(((context, question), future))
+        return await future
+
+    async def _collect(self):
+        """Wait for one request, then gather more until the batch is full or the wait expires."""
+        batch = [await self.queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            pairs = [pair for pair, _ in batch]
+            try:
+                answers = await loop.run_in_executor(self.executor, self.predict_batch, pairs)
+            except Exception:
+                # Retry one by one so a single bad request only fails its own caller
+                answers = None
+            self.batches += 1
+            self.requests += len(batch)
+            if answers is not None:
+                for (_, future), answer in zip(batch, answers):
+                    if not future.done():
+                        future.set_result(answer)
+                continue
+            for pair, future in batch:
+                try:
+                    answer = (await loop.run_in_executor(self.executor, self.predict_batch, [pair]))[0]
+                except Exception as error:
+                    if not future.done():
+                        future.set_exception(error)
+                    continue
+                if not future.done():
+                    future.set_result(answer)
+
+    def stats(self):
+        """
+        Returns:
+            dict: batches, requests and mean batch size served so far
+        """
+        return {
+            'batches': self.batches,
+            'requests': self.requests,
+            'mean_batch_size': self.requests / self.batches if self.batches else 0.0
+        }
+
+class QAServer:
+    """
+    Minimal keep-alive HTTP/1.1 server in front of a MicroBatcher.
+
+    Routes:
+        POST /predict  {"context": ..., "question": ...} -> {"answer": ...}
+        GET  /stats    batching statistics
+        GET  /health   {"status": "ok"}
+    """
+
+    def __init__(self, batcher, host='127.0.0.1', port=8000):
+        self.batcher = batcher
+        self.host = host
+        self.port = port
+        self.server = None
+
+    async def start(self):
+        self.batcher.start()
+        self.server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+        await self.batcher.stop()
+
+    async def serve_forever(self):
+        await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get('content-length', 0))
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {'error': 'request body too large'})
+                    break
+                body = await reader.readexactly(length) if length else b''
+                status, payload = await self._route(method, path, body)
+                await self._respond(writer, status, payload)
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method, path, body):
+        if method == 'POST' and path == '/predict':
+            try:
+                request = json.loads(body)
+                context, question = request['context'], request['question']
+            except (ValueError, KeyError, TypeError):
+                return 400, {'error': 'expected JSON with "context" and "question"'}
+            if not (isinstance(context, str) and isinstance(question, str) and context and question):
+                return 400, {'error': '"context" and "question" must be non-empty strings'}
+            try:
+                return 200, {'answer': await self.batcher.submit(context, question)}
+            except Exception as error:
+                return 500, {'error': f'prediction failed: {error}'}
+        if method == 'GET' and path == '/stats':
+            return 200, self.batcher.stats()
+        if method == 'GET' and path == '/health':
+            return 200, {'status': 'ok'}
+        return 404, {'error': f'no route for {method} {path}'}
+
+    async def _respond(self, writer, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        writer.write(f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+                     f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+                     .encode('latin-1') + body)
+        await writer.drain()
+
+async def _post(reader, writer, path, payload):
+    """Send one keep-alive POST and return the decoded JSON response."""
+    body = json.dumps(payload).encode('utf-8')
+    writer.write(f"POST {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode('latin-1') + body)
+    await writer.drain()
+    await reader.readline()
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+    return json.loads(await reader.readexactly(length))
+
+async def run_load(host, port, pairs, concurrency=32, total_requests=1000):
+    """
+    Drive the server with `concurrency` keep-alive clients.
+
+    Args:
+        host (str): Server host
+        port (int): Server port
+        pairs (list): (context, question) tuples, cycled through
+        concurrency (int): Concurrent connections, each with one request in flight
+        total_requests (int): Requests sent in total
+
+    Returns:
+        dict: qps, latency percentiles in ms (p50, p95, p99) and request count
+    """
+    latencies = []
+    next_index = iter(range(total_requests))
+
+    async def client():
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            for index in next_index:
+                context, question = pairs[index % len(pairs)]
+                start = time.perf_counter()
+                await _post(reader, writer, '/predict', {'context': context, 'question': question})
+                latencies.append((time.perf_counter() - start) * 1000)
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {
+        'requests': len(latencies),
+        'qps': len(latencies) / elapsed,
+        'p50': float(np.percentile(latencies, 50)),
+        'p95': float(np.percentile(latencies, 95)),
+        'p99': float(np.percentile(latencies, 99))
+    }
+
+def batch_predictor(model, tokenizer, max_length=512):
+    """Return a predict_batch function for MicroBatcher backed by predict_answers."""
+    def predict_batch(pairs):
+        return predict_answers(pairs, model, tokenizer, batch_size=len(pairs), max_length=max_length)
+    return predict_batch
+
+async def benchmark_server(predict_batch, pairs, max_batch_size=16, max_wait_ms=5.0,
+                           concurrency=32, total_requests=1000):
+    """
+    Start a server on a free local port, run the load generator against it and stop it.
+
+    Returns:
+        dict: run_load results plus the server's batching statistics
+    """
+    server = QAServer(MicroBatcher(predict_batch, max_batch_size, max_wait_ms), port=0)
+    await server.start()
+    try:
+        result = await run_load(server.host, server.port, pairs, concurrency, total_requests)
+    finally:
+        await server.stop()
+    result.update(server.batcher.stats())
+    return result
+
+def main():
+    """
+    Serve QA requests, or benchmark batch-of-one against micro-batching.
+    """
+    print("=" * 60)
+    print("Asyncio QA Server with Micro-Batching")
+    print("Author: Molla Samser - https://rskworld.in")
+    print("=" * 60)
+
+    command = sys.argv[1] if len(sys.argv) > 1 else 'bench'
+    model_name = sys.argv[2] if len(sys.argv) > 2 else "bert-base-uncased"
+    predict_batch = batch_predictor(registry.get_model(model_name), registry.get_tokenizer(model_name))
+    registry.warmup(model_name)
+
+    if command == 'serve':
+        server = QAServer(MicroBatcher(predict_batch))
+        print(f"\nListening on http://{server.host}:{server.port} (POST /predict)")
+        asyncio.run(server.serve_forever())
+        return
+
+    pairs = [(context, qa['question']) for _, context, qa in load_dataset()]
+    for max_batch_size in (1, 16):
+        result = asyncio.run(benchmark_server(predict_batch, pairs, max_batch_size=max_batch_size))
+        print(f"\nmax_batch_size={max_batch_size}: {result['qps']:.1f} QPS, "
+              f"p50 {result['p50']:.1f} ms, p95 {result['p95']:.1f} ms, p99 {result['p99']:.1f} ms "
+              f"(mean batch {result['mean_batch_size']:.1f})")
+
+if __name__ == "__main__":
+    main()
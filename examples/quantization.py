@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+    Project: Question Answering Dataset
+    Description: A dataset containing context passages, questions, and answers for training QA models and reading comprehension systems.
+    Author: Molla Samser
+    Website: https://rskworld.in
+    Contact: help@rskworld.in
+    Phone: +91 93305 39277
+
+    Dynamic INT8 Quantization
+    Opt-in CPU inference mode for the BERT reader. The nn.Linear layers are
+    quantized to INT8 with dynamic (per-batch) activation scales, and the
+    quantized weights are cached on disk so later runs skip the fp32 load.
+    The benchmark reports latency, throughput, model size and the EM/F1
+    change against fp32 on squad_format.json.
+
+    Usage:
+        python quantization.py [model_name]
+"""
+
+import io
+import os
+import re
+import sys
+import time
+import warnings
+
+import numpy as np
+import torch
+from transformers import AutoConfig, AutoTokenizer, BertForQuestionAnswering
+
+from bert_example import load_dataset, predict_answer
+from squad_metrics import evaluate, gold_answers
+
+DEFAULT_CACHE_DIR = '../quantized_models'
+WEIGHTS_NAME = 'model-int8.pt'
+
+try:
+    from torchao.quantization import Int8DynamicActivationInt8WeightConfig, quantize_
+except ImportError:  # torchao is optional; torch.ao.quantization is used until torch removes it
+    quantize_ = None
+
+QUANTIZATION_BACKEND = 'torchao' if quantize_ is not None else 'torch.ao'
+
+def quantize_model(model):
+    """
+    Quantize the linear layers of a model to INT8 with dynamic activation scales.
+
+    Uses torchao when it is installed. Otherwise it falls back to
+    torch.ao.quantization, which is deprecated and goes away in torch 2.10.
+
+    Args:
+        model: fp32 model in eval mode
+
+    Returns:
+        torch.nn.Module: Quantized model
+    """
+    if quantize_ is not None:
+        quantize_(model, Int8DynamicActivationInt8WeightConfig())
+        return model
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', DeprecationWarning)
+        return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+def quantized_cache_path(model_name, revision='main', cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Return the cache directory for a quantized model.
+
+    The torch version and quantization backend are part of the key because
+    the serialized packed weights are not portable across them.
+    """
+    safe_name = re.sub(r'[^\w.-]+', '--', model_name.strip('/'))
+    return os.path.join(cache_dir, f"{safe_name}@{revision}-torch{torch.__version__}-{QUANTIZATION_BACKEND}")
+
+def load_quantized(model_name, revision='main', cache_dir=DEFAULT_CACHE_DIR, model_class=BertForQuestionAnswering):
+    """
+    Load an INT8 quantized model, building it on first use.
+
+    Only the state dict is cached. On a cache hit the model skeleton is
+    created from the saved config, quantized, and the cached state dict is
+    loaded into it with weights_only=True, so the fp32 weights are never
+    read and no pickled code is executed.
+
+    Args:
+        model_name (str): Hub name or local directory of the fp32 model
+        revision (str): Model revision
+        cache_dir (str): Directory holding quantized models
+        model_class: transformers class of the model
+
+    Returns:
+        torch.nn.Module: Quantized model in eval mode
+    """
+    path = quantized_cache_path(model_name, revision, cache_dir)
+    weights_path = os.path.join(path, WEIGHTS_NAME)
+    if os.path.exists(weights_path):
+        config = AutoConfig.from_pretrained(path)
+        # Auto classes build from a config with from_config, concrete classes with their constructor
+        skeleton = model_class.from_config(config) if hasattr(model_class, 'from_config') else model_class(config)
+        model = quantize_model(skeleton.eval())
+        model.load_state_dict(torch.load(weights_path, weights_only=True))
+        return model.eval()
+
+    model = quantize_model(model_class.from_pretrained(model_name, revision=revision).eval())
+    os.makedirs(path, exist_ok=True)
+    model.config.save_pretrained(path)
+    tmp_path = f"{weights_path}.{os.getpid()}.tmp"
+    torch.save(model.state_dict(), tmp_path)
+    os.replace(tmp_path, weights_path)
+    return model
+
+def load_qa_model(model_name, quantized=False, revision='main', cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Load the BERT reader in fp32, or INT8 when `quantized` is set.
+    """
+    if quantized:
+        return load_quantized(model_name, revision, cache_dir)
+    return BertForQuestionAnswering.from_pretrained(model_name, revision=revision).eval()
+
+def model_size_mb(model):
+    """Return the serialized size of a model's state dict in megabytes."""
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell() / 1e6
+
+def _run(model, tokenizer, pairs):
+    """Predict every pair one at a time; return (predictions, latencies in ms)."""
+    predictions, latencies = [], []
+    for context, question in pairs:
+        start = time.perf_counter()
+        predictions.append(predict_answer(context, question, model, tokenizer))
+        latencies.append((time.perf_counter() - start) * 1000)
+    return predictions, latencies
+
+def benchmark_quantized(model_name, file_path='../squad_format.json', repeat=3,
+                        cache_dir=DEFAULT_CACHE_DIR, num_threads=None):
+    """
+    Compare fp32 and INT8 inference on a SQuAD file.
+
+    Args:
+        model_name (str): Hub name or local directory of the fp32 model
+        file_path (str): SQuAD file to evaluate on
+        repeat (int): Timed passes over the questions (after one warmup pass)
+        cache_dir (str): Directory holding quantized models
+        num_threads (int): torch intra-op threads, None to keep the default
+
+    Returns:
+        dict: Per-mode latency (mean/p50/p95 ms), throughput (questions/s),
+            size (MB), exact_match and f1, plus the INT8 - fp32 deltas
+    """
+    if num_threads:
+        torch.set_num_threads(num_threads)
+    records = list(load_dataset(file_path))
+    pairs = [(context, qa['question']) for _, context, qa in records]
+    references = [gold_answers(qa) for _, _, qa in records]
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+
+    report = {}
+    for mode in ('fp32', 'int8'):
+        model = load_qa_model(model_name, quantized=mode == 'int8', cache_dir=cache_dir)
+        predictions, _ = _run(model, tokenizer, pairs)
+        latencies = []
+        for _ in range(repeat):
+            _, timings = _run(model, tokenizer, pairs)
+            latencies.extend(timings)
+        scores = evaluate(predictions, references)
+        report[mode] = {
+            'latency_ms': {
+                'mean': float(np.mean(latencies)),
+                'p50': float(np.percentile(latencies, 50)),
+                'p95': float(np.percentile(latencies, 95))
+            },
+            'throughput': 1000.0 / float(np.mean(latencies)),
+            'size_mb': model_size_mb(model),
+            'exact_match': scores['exact_match'],
+            'f1': scores['f1']
+        }
+    report['delta'] = {
+        'exact_match': report['int8']['exact_match'] - report['fp32']['exact_match'],
+        'f1': report['int8']['f1'] - report['fp32']['f1'],
+        'speedup': report['int8']['throughput'] / report['fp32']['throughput'],
+        'size_ratio': report['int8']['size_mb'] / report['fp32']['size_mb']
+    }
+    return report
+
+def main():
+    """
+    Report fp32 vs INT8 latency, throughput, size and accuracy.
+    """
+    print("=" * 60)
+    print("Dynamic INT8 Quantization of the BERT Reader")
+    print("Author: Molla Samser - https://rskworld.in")
+    print("=" * 60)
+
+    model_name = sys.argv[1] if len(sys.argv) > 1 else "bert-base-uncased"
+    report = benchmark_quantized(model_name)
+    for mode in ('fp32', 'int8'):
+        result = report[mode]
+        print(f"\n{mode}:")
+        print(f"  Latency:    {result['latency_ms']['mean']:.1f} ms mean, "
+              f"{result['latency_ms']['p50']:.1f} ms p50, {result['latency_ms']['p95']:.1f} ms p95")
+        print(f"  Throughput: {result['throughput']:.1f} questions/s")
+        print(f"  Size:       {result['size_mb']:.1f} MB")
+        print(f"  EM / F1:    {result['exact_match']:.1f} / {result['f1']:.1f}")
+    delta = report['delta']
+    print(f"\nINT8 vs fp32: {delta['speedup']:.2f}x throughput, {delta['size_ratio']:.0%} of the size, "
+          f"EM {delta['exact_match']:+.1f}, F1 {delta['f1']:+.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+    Project: Question Answering Dataset
+    Description: A dataset containing context passages, questions, and answers for training QA models and reading comprehension systems.
+    Author: Molla Samser
+    Website: https://rskworld.in
+    Contact: help@rskworld.in
+    Phone: +91 93305 39277
+
+    Sidecar Files
+    Helpers for caching derived data next to a dataset file, keyed by the
+    file's size, modification time and content hash.
+"""
+
+import hashlib
+import json
+import os
+
+HASH_BLOCK = 1 << 20
+
+def hash_file(file_path, length=None, hasher=None, offset=0):
+    """
+    Hash a file (or `length` bytes of it) with SHA-256.
+
+    Args:
+        file_path (str): File to hash
+        length (int): Number of bytes to hash, or None to hash up to the end
+        hasher: Existing hashlib object to continue, or None for a fresh one
+        offset (int): Byte offset to start hashing from
+
+    Returns:
+        hashlib object: Call .hexdigest() for the digest; it can still be updated
+    """
+    if hasher is None:
+        hasher = hashlib.sha256()
+    remaining = length
+    with open(file_path, 'rb') as f:
+        f.seek(offset)
+        while remaining is None or remaining > 0:
+            block = f.read(HASH_BLOCK if remaining is None else min(HASH_BLOCK, remaining))
+            if not block:
+                break
+            hasher.update(block)
+            if remaining is not None:
+                remaining -= len(block)
+    return hasher
+
+def file_signature(file_path, with_hash=True):
+    """
+    Describe the current state of a file.
+
+    Args:
+        file_path (str): File to describe
+        with_hash (bool): Whether to include the SHA-256 of the content
+
+    Returns:
+        dict: size, mtime and (optionally) sha256
+    """
+    stat = os.stat(file_path)
+    signature = {'size': stat.st_size, 'mtime': stat.st_mtime}
+    if with_hash:
+        signature['sha256'] = hash_file(file_path).hexdigest()
+    return signature
+
+def sidecar_path(file_path, suffix):
+    """Return the path of a sidecar file, e.g. dataset.csv -> dataset.csv.stats.json."""
+    return f"{file_path}.{suffix}"
+
+def load_sidecar(file_path, suffix):
+    """
+    Read a JSON sidecar.
+
+    Returns:
+        dict or None: Sidecar contents, or None if missing or unreadable
+    """
+    try:
+        with open(sidecar_path(file_path, suffix), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_sidecar(file_path, suffix, data):
+    """Atomically write a JSON sidecar."""
+    path = sidecar_path(file_path, suffix)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+def is_unchanged(file_path, signature):
+    """
+    Check a file against a stored signature.
+
+    Size and mtime are compared first; the content hash is only computed
+    when the mtime changed but the size did not.
+
+    Returns:
+        bool: True if the file content matches the signature
+    """
+    if signature is None:
+        return False
+    stat = os.stat(file_path)
+    if stat.st_size != signature.get('size'):
+        return False
+    if stat.st_mtime == signature.get('mtime'):
+        return True
+    return hash_file(file_path).hexdigest() == signature.get('sha256')
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+    Project: Question Answering Dataset
+    Description: A dataset containing context passages, questions, and answers for training QA models and reading comprehension systems.
+    Author: Molla Samser
+    Website: https://rskworld.in
+    Contact: help@rskworld.in
+    Phone: +91 93305 39277
+
+    SQuAD Metrics
+    Exact match and token-level F1 as defined by the official SQuAD
+    evaluation script. Unanswerable questions count as correct only when
+    the prediction is empty.
+"""
+
+import re
+import string
+from collections import Counter
+
+_PUNCTUATION = set(string.punctuation)
+
+def normalize_answer(text):
+    """Lowercase, strip punctuation and articles, and collapse whitespace."""
+    text = ''.join(ch for ch in text.lower() if ch not in _PUNCTUATION)
+    text = re.sub(r'\b(a|an|the)\b', ' ', text)
+    return ' '.join(text.split())
+
+def exact_match(prediction, truth):
+    """Return 1.0 if the normalized strings are equal, else 0.0."""
+    return float(normalize_answer(prediction) == normalize_answer(truth))
+
+def f1_score(prediction, truth):
+    """Return the token-level F1 between two answers."""
+    prediction_tokens = normalize_answer(prediction).split()
+    truth_tokens = normalize_answer(truth).split()
+    if not prediction_tokens or not truth_tokens:
+        return float(prediction_tokens == truth_tokens)
+    common = sum((Counter(prediction_tokens) & Counter(truth_tokens)).values())
+    if common == 0:
+        return 0.0
+    precision = common / len(prediction_tokens)
+    recall = common / len(truth_tokens)
+    return 2 * precision * recall / (precision + recall)
+
+def gold_answers(qa):
+    """Return the reference answer texts of a SQuAD qa dict ([''] if unanswerable)."""
+    texts = [answer['text'] for answer in qa.get('answers') or [] if answer['text']]
+    return texts or ['']
+
+def score_prediction(prediction, truths):
+    """
+    Score one prediction against its reference answers.
+
+    Returns:
+        tuple: (exact match, F1), each the best over the references
+    """
+    return (max(exact_match(prediction, truth) for truth in truths),
+            max(f1_score(prediction, truth) for truth in truths))
+
+def evaluate(predictions, references):
+    """
+    Compute corpus-level EM and F1.
+
+    Args:
+        predictions (list): Predicted answer strings
+        references (list): Lists of reference answers, aligned with predictions
+
+    Returns:
+        dict: exact_match and f1 in percent, and the number of questions
+    """
+    total_em = total_f1 = 0.0
+    for prediction, truths in zip(predictions, references):
+        em, f1 = score_prediction(prediction, truths)
+        total_em += em
+        total_f1 += f1
+    count = len(predictions)
+    return {
+        'exact_match': 100.0 * total_em / count if count else 0.0,
+        'f1': 100.0 * total_f1 / count if count else 0.0,
+        'count': count
+    }
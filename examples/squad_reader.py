@@ -0,0 +1,305 @@
+# -*- coding: utf-8 -*-
+"""
+    Project: Question Answering Dataset
+    Description: A dataset containing context passages, questions, and answers for training QA models and reading comprehension systems.
+    Author: Molla Samser
+    Website: https://rskworld.in
+    Contact: help@rskworld.in
+    Phone: +91 93305 39277
+
+    Streaming SQuAD Reader
+    Reads SQuAD format files incrementally, one paragraph at a time, so that
+    multi-gigabyte corpora can be processed without loading the whole file.
+"""
+
+import json
+
+CHUNK_SIZE = 1 << 20
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+
+class _JsonStream:
+    """
+    Minimal pull scanner over a JSON file opened in binary mode.
+
+    Chunks are decoded as latin-1 so that every buffer position is also a
+    byte offset into the file. Values are parsed with the standard JSON
+    decoder and re-decoded as UTF-8 when they contain non-ASCII bytes.
+    """
+
+    def __init__(self, fh, chunk_size=CHUNK_SIZE):
+        self.fh = fh
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.base = 0  # file offset of buffer[0]
+        self.eof = False
+
+    def tell(self):
+        """Byte offset of the scanner in the file."""
+        return self.base + self.pos
+
+    def _fill(self):
+        """Read another chunk, dropping the already consumed part of the buffer."""
+        if self.eof:
+            return False
+        chunk = self.fh.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.base += self.pos
+        self.buffer = self.buffer[self.pos:] + chunk.decode('latin-1')
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char):
+        """Consume the next non-whitespace character, which must be `char`."""
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected '{char}' at byte {self.tell()}, found '{found}'")
+        self.pos += 1
+
+    def _value_end(self):
+        """Return the buffer position just after the value at the cursor."""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number ending exactly at the buffer end may continue in the next chunk
+            if end == len(self.buffer) and not self.eof and self._fill():
+                continue
+            return value, end
+
+    def read_value(self):
+        """Parse and consume the JSON value at the cursor."""
+        value, end = self._value_end()
+        raw = self.buffer[self.pos:end]
+        self.pos = end
+        if not raw.isascii():
+            value = json.loads(raw.encode('latin-1').decode('utf-8'))
+        return value
+
+    def read_value_span(self):
+        """Parse the value at the cursor and return (value, start_byte, end_byte)."""
+        start = self.tell()
+        value = self.read_value()
+        return value, start, self.tell()
+
+    def skip_value(self):
+        """Consume the JSON value at the cursor without decoding strings to UTF-8."""
+        _, end = self._value_end()
+        self.pos = end
+
+    def iter_object_keys(self):
+        """Consume an object's opening brace and yield its keys one at a time.
+
+        The caller must consume (read or skip) the value of each key before
+        asking for the next one.
+        """
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.read_value()
+            self.expect(':')
+            yield key
+            if self.peek() == ',':
+                self.pos += 1
+                continue
+            self.expect('}')
+            return
+
+    def iter_array(self):
+        """Consume an array's opening bracket and yield once per element.
+
+        The caller must consume each element before resuming the generator.
+        """
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield
+            if self.peek() == ',':
+                self.pos += 1
+                continue
+            self.expect(']')
+            return
+
+def _iter_paragraph_spans(fh, header=None, chunk_size=CHUNK_SIZE):
+    """
+    Yield (title, paragraph, start, end) for every paragraph in a SQuAD file.
+
+    `start` and `end` are the byte offsets of the paragraph object. Articles
+    whose "paragraphs" key precedes "title" are buffered until the article
+    is complete; well-formed SQuAD files put the title first.
+    """
+    stream = _JsonStream(fh, chunk_size)
+    for key in stream.iter_object_keys():
+        if key != 'data':
+            value = stream.read_value()
+            if header is not None:
+                header[key] = value
+            continue
+        for _ in stream.iter_array():
+            title = None
+            pending = []
+            for article_key in stream.iter_object_keys():
+                if article_key == 'title':
+                    title = stream.read_value()
+                elif article_key == 'paragraphs':
+                    for _ in stream.iter_array():
+                        paragraph, start, end = stream.read_value_span()
+                        if title is None:
+                            pending.append((paragraph, start, end))
+                        else:
+                            yield title, paragraph, start, end
+                else:
+                    stream.skip_value()
+            for paragraph, start, end in pending:
+                yield title, paragraph, start, end
+
+def iter_squad_paragraphs(file_path, header=None, chunk_size=CHUNK_SIZE):
+    """
+    Stream (title, paragraph) pairs from a SQuAD format file.
+
+    Args:
+        file_path (str): Path to the SQuAD JSON file
+        header (dict): Optional dict that receives top-level keys other than "data" (e.g. "version")
+        chunk_size (int): Number of bytes read from disk at a time
+
+    Yields:
+        tuple: (article title, paragraph dict with "context" and "qas")
+    """
+    with open(file_path, 'rb') as f:
+        for title, paragraph, _, _ in _iter_paragraph_spans(f, header, chunk_size):
+            yield title, paragraph
+
+def iter_squad_paragraph_spans(file_path, chunk_size=CHUNK_SIZE):
+    """
+    Stream paragraphs together with their byte range in the file.
+
+    Args:
+        file_path (str): Path to the SQuAD JSON file
+        chunk_size (int): Number of bytes read from disk at a time
+
+    Yields:
+        tuple: (article title, paragraph dict, start byte, end byte)
+    """
+    with open(file_path, 'rb') as f:
+        yield from _iter_paragraph_spans(f, chunk_size=chunk_size)
+
+def iter_squad_records(file_path, header=None, chunk_size=CHUNK_SIZE):
+    """
+    Stream flat QA records from a SQuAD format file.
+
+    Only one paragraph is held in memory at a time, whatever the file size.
+
+    Args:
+        file_path (str): Path to the SQuAD JSON file
+        header (dict): Optional dict that receives top-level keys other than "data" (e.g. "version")
+        chunk_size (int): Number of bytes read from disk at a time
+
+    Yields:
+        tuple: (article title, context, qa dict)
+    """
+    for title, paragraph in iter_squad_paragraphs(file_path, header, chunk_size):
+        context = paragraph['context']
+        for qa in paragraph['qas']:
+            yield title, context, qa
+
+def _article_paragraphs(stream, keys, extra, pending):
+    """Yield an article's remaining paragraphs, collecting its other keys into `extra`."""
+    yield from pending
+    for key in keys:
+        if key == 'paragraphs':
+            for _ in stream.iter_array():
+                yield stream.read_value()
+        else:
+            extra[key] = stream.read_value()
+
+def iter_squad_articles(file_path, header=None, chunk_size=CHUNK_SIZE):
+    """
+    Stream articles from a SQuAD format file, one paragraph at a time.
+
+    Like the groups of itertools.groupby, each article's paragraph iterator
+    must be consumed before the next article is requested; unconsumed
+    paragraphs are skipped. `extra` is complete only once the paragraphs
+    have been consumed. Paragraphs that precede the article's title are
+    buffered until the title is read.
+
+    Args:
+        file_path (str): Path to the SQuAD JSON file
+        header (dict): Optional dict that receives top-level keys other than "data" (e.g. "version")
+        chunk_size (int): Number of bytes read from disk at a time
+
+    Yields:
+        tuple: (article title or None, paragraph iterator, dict of the article's
+            keys other than "title" and "paragraphs")
+    """
+    with open(file_path, 'rb') as f:
+        stream = _JsonStream(f, chunk_size)
+        for key in stream.iter_object_keys():
+            if key != 'data':
+                value = stream.read_value()
+                if header is not None:
+                    header[key] = value
+                continue
+            for _ in stream.iter_array():
+                keys = stream.iter_object_keys()
+                title, extra, pending = None, {}, []
+                for article_key in keys:
+                    if article_key == 'title':
+                        title = stream.read_value()
+                        break
+                    if article_key == 'paragraphs':
+                        pending.extend(stream.read_value() for _ in stream.iter_array())
+                    else:
+                        extra[article_key] = stream.read_value()
+                paragraphs = _article_paragraphs(stream, keys, extra, pending)
+                yield title, paragraphs, extra
+                for _ in paragraphs:
+                    pass
+
+def iter_json_array(file_path, key, header=None, chunk_size=CHUNK_SIZE):
+    """
+    Stream the elements of one top-level array of a JSON object file.
+
+    Used for the normalized files (the "contexts" array of contexts.json,
+    and so on), which are a "_metadata" object next to one large array.
+
+    Args:
+        file_path (str): Path to the JSON file
+        key (str): Top-level key holding the array
+        header (dict): Optional dict that receives the other top-level keys
+        chunk_size (int): Number of bytes read from disk at a time
+
+    Yields:
+        object: Decoded array elements, in order
+    """
+    with open(file_path, 'rb') as f:
+        stream = _JsonStream(f, chunk_size)
+        for top_key in stream.iter_object_keys():
+            if top_key != key:
+                value = stream.read_value()
+                if header is not None:
+                    header[top_key] = value
+                continue
+            for _ in stream.iter_array():
+                yield stream.read_value()
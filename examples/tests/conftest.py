@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""
+    Project: Question Answering Dataset
+    Description: A dataset containing context passages, questions, and answers for training QA models and reading comprehension systems.
+    Author: Molla Samser
+    Website: https://rskworld.in
+    Contact: help@rskworld.in
+    Phone: +91 93305 39277
+
+    Test configuration: the example modules import each other by plain
+    name, as when run from examples/, so that directory goes on sys.path.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def make_qa(qa_id, question, answer=None, context=''):
+    """Build a SQuAD qa dict; without an answer it is unanswerable."""
+    if answer is None:
+        return {'id': qa_id, 'question': question, 'answers': [], 'is_impossible': True}
+    return {'id': qa_id, 'question': question, 'is_impossible': False,
+            'answers': [{'text': answer, 'answer_start': context.find(answer)}]}
+
+@pytest.fixture
+def write_squad(tmp_path):
+    """Return a function that writes a SQuAD dict to tmp_path and returns its path."""
+    def write(data, name='squad.json'):
+        path = tmp_path / name
+        path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding='utf-8')
+        return str(path)
+    return write
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+    Project: Question Answering Dataset
+    Description: A dataset containing context passages, questions, and answers for training QA models and reading comprehension systems.
+    Author: Molla Samser
+    Website: https://rskworld.in
+    Contact: help@rskworld.in
+    Phone: +91 93305 39277
+
+    Tests for answer_cache.py.
+"""
+
+import sqlite3
+import types
+
+import pytest
+
+from answer_cache import AnswerCache, normalize_question, tokenizer_lowercases
+
+CONTEXT = 'Paris is the capital of France.'
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / 'answers.sqlite')
+
+def _age_entries(path, seconds):
+    """Move every entry's creation time `seconds` into the past."""
+    connection = sqlite3.connect(path)
+    with connection:
+        connection.execute('UPDATE answers SET created = created - ?', (seconds,))
+    connection.close()
+
+def _order_entries(path, questions):
+    """Give the entries for `questions` distinct creation times, oldest first."""
+    connection = sqlite3.connect(path)
+    with connection:
+        for age, question in enumerate(questions):
+            connection.execute('UPDATE answers SET created = ? WHERE question = ?', (1e9 + age, question))
+    connection.close()
+
+def test_normalize_question_folds_case_only_when_asked():
+    assert normalize_question('  What is\tParis? ') == 'What is Paris'
+    assert normalize_question('What is Paris?', lowercase=True) == 'what is paris'
+    assert normalize_question('Ｗhat') == 'What'  # NFKC folds full-width letters
+
+def test_tokenizer_lowercases():
+    assert tokenizer_lowercases(types.SimpleNamespace(do_lower_case=True))
+    assert not tokenizer_lowercases(types.SimpleNamespace(do_lower_case=False))
+    assert not tokenizer_lowercases(object())
+
+def test_keys_separate_models_revisions_contexts_and_case(cache_path):
+    with AnswerCache(cache_path) as cache:
+        cache.put('m', 'r1', CONTEXT, 'What is Paris?', 'a capital')
+        assert cache.get('m', 'r1', CONTEXT, 'What is Paris') == 'a capital'
+        assert cache.get('m', 'r1', CONTEXT, 'what is paris') is None
+        assert cache.get('m', 'r2', CONTEXT, 'What is Paris?') is None
+        assert cache.get('other', 'r1', CONTEXT, 'What is Paris?') is None
+        assert cache.get('m', 'r1', CONTEXT + ' ', 'What is Paris?') is None
+
+        cache.put('uncased', 'r1', CONTEXT, 'What is Paris?', 'a capital', lowercase=True)
+        assert cache.get('uncased', 'r1', CONTEXT, 'WHAT IS PARIS', lowercase=True) == 'a capital'
+
+def test_get_or_compute_calls_compute_once(cache_path):
+    calls = []
+    with AnswerCache(cache_path) as cache:
+        for _ in range(3):
+            answer = cache.get_or_compute('m', 'r', CONTEXT, 'Capital?',
+                                          lambda: calls.append(1) or {'answer': 'Paris'})
+            assert answer == {'answer': 'Paris'}
+        assert len(calls) == 1
+        assert cache.stats()['hits'] == 2
+
+def test_expired_entries_are_misses_and_evicted_on_open(cache_path):
+    with AnswerCache(cache_path, ttl=60) as cache:
+        cache.put('m', 'r', CONTEXT, 'old', 'x')
+    _age_entries(cache_path, 120)
+    with AnswerCache(cache_path, ttl=60) as cache:
+        # Expired rows are filtered in the lookup itself...
+        assert cache.get('m', 'r', CONTEXT, 'old') is None
+        # ...and removed when the cache is opened
+        assert len(cache) == 0
+
+def test_max_entries_enforced_by_a_fresh_process(cache_path):
+    with AnswerCache(cache_path, max_entries=None) as cache:
+        for i in range(10):
+            cache.put('m', 'r', CONTEXT, f'q{i}', i)
+        assert len(cache) == 10
+    _order_entries(cache_path, [f'q{i}' for i in range(10)])
+    with AnswerCache(cache_path, ttl=None, max_entries=3) as cache:
+        assert len(cache) == 3
+        assert [cache.get('m', 'r', CONTEXT, f'q{i}') for i in (6, 7, 8, 9)] == [None, 7, 8, 9]
+
+def test_evict_returns_deleted_count(cache_path):
+    with AnswerCache(cache_path, ttl=None, max_entries=None) as cache:
+        for i in range(5):
+            cache.put('m', 'r', CONTEXT, f'q{i}', i)
+    _order_entries(cache_path, [f'q{i}' for i in range(5)])
+    with AnswerCache(cache_path, ttl=None, max_entries=None) as cache:
+        assert len(cache) == 5  # opens the connection (and its eviction pass) first
+        cache.max_entries = 2
+        assert cache.evict() == 3
+        assert len(cache) == 2
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+    Project: Question Answering Dataset
+    Description: A dataset containing context passages, questions, and answers for training QA models and reading comprehension systems.
+    Author: Molla Samser
+    Website: https://rskworld.in
+    Contact: help@rskworld.in
+    Phone: +91 93305 39277
+
+    Tests for dataset_stats.py.
+"""
+
+import csv
+import os
+
+from columnar_store import compile_dataset
+from conftest import make_qa
+from dataset_stats import compute_stats
+
+COLUMNS = ['context', 'question', 'answer', 'domain', 'question_id']
+
+def _write_rows(path, rows, mode='w'):
+    with open(path, mode, encoding='utf-8', newline='') as f:
+        if mode == 'w':
+            f.write(','.join(COLUMNS) + '\n')
+        writer = csv.writer(f, quoting=csv.QUOTE_NONNUMERIC, lineterminator='\n')
+        writer.writerows(rows)
+
+def _rows(start, count):
+    return [(f'Context number {i} ' + 'x' * (i * 7 % 300), f'Question {i}?', f'answer {i}' * (i % 3),
+             ['History', 'Science', 'Literature'][i % 3], i) for i in range(start, start + count)]
+
+def _comparable(stats):
+    return {key: stats[key] for key in ('counts', 'domains', 'lengths')}
+
+def test_csv_append_is_incremental_and_matches_a_full_rescan(tmp_path):
+    path = str(tmp_path / 'dataset.csv')
+    _write_rows(path, _rows(0, 50))
+    assert compute_stats(path)['cache'] == 'miss'
+    assert compute_stats(path)['cache'] == 'hit'
+
+    _write_rows(path, _rows(50, 30), mode='a')
+    incremental = compute_stats(path)
+    assert incremental['cache'] == 'incremental'
+    full = compute_stats(path, use_cache=False)
+    assert _comparable(incremental) == _comparable(full)
+    assert incremental['counts']['questions'] == 80
+    assert compute_stats(path)['cache'] == 'hit'
+
+def test_rewritten_csv_is_rescanned(tmp_path):
+    path = str(tmp_path / 'dataset.csv')
+    _write_rows(path, _rows(0, 20))
+    compute_stats(path)
+    _write_rows(path, _rows(100, 25))
+    stats = compute_stats(path)
+    assert stats['cache'] == 'miss'
+    assert _comparable(stats) == _comparable(compute_stats(path, use_cache=False))
+
+def test_squad_stats_count_articles_and_agree_with_the_compiled_store(write_squad):
+    context = 'Rome was founded in 753 BC.'
+    path = write_squad({'version': '2.0', 'data': [
+        {'title': 'History', 'paragraphs': [
+            {'context': context, 'qas': [make_qa('1', 'When?', '753 BC', context), make_qa('2', 'Why?')]},
+            {'context': 'Empty paragraph.', 'qas': []}]},
+        # A second article with the same title is still a separate article
+        {'title': 'History', 'paragraphs': [
+            {'context': context, 'qas': [make_qa('3', 'Founded?', 'founded', context)]}]},
+        {'title': 'Science', 'paragraphs': []},
+    ]})
+    streamed = compute_stats(path, use_cache=False)
+    assert streamed['counts'] == {'articles': 3, 'paragraphs': 2, 'questions': 3, 'impossible': 1}
+    assert streamed['domains'] == {'History': 3}
+
+    compile_dataset(path)
+    try:
+        assert _comparable(compute_stats(path, use_cache=False)) == _comparable(streamed)
+    finally:
+        os.remove(os.path.splitext(path)[0] + '.qacol')
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+    Project: Question Answering Dataset
+    Description: A dataset containing context passages, questions, and answers for training QA models and reading comprehension systems.
+    Author: Molla Samser
+    Website: https://rskworld.in
+    Contact: help@rskworld.in
+    Phone: +91 93305 39277
+
+    Tests for ingest_log.py.
+"""
+
+import csv
+import json
+
+import pytest
+
+from conftest import make_qa
+from ingest_log import DeltaLog, iter_dataset
+from squad_reader import iter_squad_records
+
+ROME = 'Rome was founded in 753 BC.'
+NILE = 'The Nile flows north.'
+PARIS = 'Paris is the capital of France.'
+
+@pytest.fixture
+def base(write_squad, tmp_path):
+    """A base file with keys compaction does not know about, plus normalized siblings."""
+    (tmp_path / 'contexts.json').write_text(json.dumps({'_metadata': {'project': 'test'}, 'contexts': []}),
+                                            encoding='utf-8')
+    return write_squad({
+        'version': '2.0',
+        'data': [
+            {'title': 'History', 'source': 'wiki', 'paragraphs': [
+                {'context': ROME, 'paragraph_id': 7, 'qas': [
+                    make_qa('1', 'When was Rome founded?', '753 BC', ROME),
+                    make_qa('2', 'Who founded it?')]}]},
+            {'title': 'Geography', 'paragraphs': [
+                {'context': NILE, 'qas': [make_qa('3', 'Which way?', 'north', NILE)]}]},
+        ],
+        'license': 'CC-BY-SA'
+    })
+
+def _log(base, tmp_path):
+    return DeltaLog(base, compact_bytes=None, csv_path=str(tmp_path / 'dataset.csv'), normalized_dir=str(tmp_path))
+
+def _keyed(records):
+    return sorted((title, context, json.dumps(qa, sort_keys=True)) for title, context, qa in records)
+
+def test_compaction_matches_the_merged_view_and_keeps_structure(base, tmp_path):
+    log = _log(base, tmp_path)
+    log.append([
+        ('History', ROME, make_qa('4', 'In which century BC?', '753 BC', ROME)),    # existing paragraph
+        ('History', 'Rome had kings first.', make_qa('5', 'Who ruled first?', 'kings', 'Rome had kings first.')),
+        ('Geography', NILE, make_qa('3', 'In which direction?', 'north', NILE)),    # replaced in place
+        ('History', PARIS, make_qa('2', 'What is Paris?', 'the capital', PARIS)),    # replaced and moved
+        ('Cities', PARIS, make_qa('6', 'Capital of?', 'France', PARIS)),            # new article
+    ])
+    merged = _keyed(log.iter_merged())
+    assert log.compact() == 6
+    assert not log.has_deltas()
+    assert _keyed(iter_squad_records(base)) == merged
+    assert _keyed(iter_dataset(base)) == merged
+
+    with open(base, encoding='utf-8') as f:
+        data = json.load(f)
+    assert data['version'] == '2.0' and data['license'] == 'CC-BY-SA'
+    assert [article['title'] for article in data['data']] == ['History', 'Geography', 'Cities']
+    history = data['data'][0]
+    assert history['source'] == 'wiki'
+    assert [p['context'] for p in history['paragraphs']] == [ROME, 'Rome had kings first.', PARIS]
+    assert history['paragraphs'][0]['paragraph_id'] == 7
+    assert [qa['id'] for qa in history['paragraphs'][0]['qas']] == ['1', '4']
+    assert data['data'][1]['paragraphs'][0]['qas'][0]['question'] == 'In which direction?'
+
+def test_compaction_rewrites_csv_and_normalized_siblings(base, tmp_path):
+    log = _log(base, tmp_path)
+    log.append([('Geography', NILE, make_qa('9', 'What flows?', 'The Nile', NILE))])
+    log.compact()
+
+    with open(tmp_path / 'dataset.csv', encoding='utf-8', newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert [row['question_id'] for row in rows] == ['1', '2', '3', '9']
+    assert rows[1]['answer'] == ''
+
+    def read(name):
+        with open(tmp_path / name, encoding='utf-8') as f:
+            return json.load(f)
+    contexts = read('contexts.json')
+    questions = read('questions.json')['questions']
+    answers = read('answers.json')['answers']
+    assert contexts['_metadata'] == {'project': 'test'}
+    assert [(c['id'], c['text'], c['domain']) for c in contexts['contexts']] == [(1, ROME, 'History'), (2, NILE, 'Geography')]
+    assert [(q['id'], q['context_id']) for q in questions] == [(1, 1), (2, 1), (3, 2), (9, 2)]
+    assert [(a['question_id'], a['answer']) for a in answers] == [(1, '753 BC'), (3, 'north'), (9, 'The Nile')]
+
+def test_compacting_an_empty_log_round_trips(base, tmp_path):
+    before = _keyed(iter_squad_records(base))
+    _log(base, tmp_path).compact()
+    assert _keyed(iter_squad_records(base)) == before
+
+def test_interrupted_trailing_line_is_ignored(base, tmp_path):
+    log = _log(base, tmp_path)
+    log.append([('Cities', PARIS, make_qa('6', 'Capital of?', 'France', PARIS))])
+    with open(log.log_path, 'a', encoding='utf-8') as f:
+        f.write('{"title": "Cities", "cont')
+    assert [qa['id'] for _, _, qa in log.iter_deltas()] == ['6']
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+    Project: Question Answering Dataset
+    Description: A dataset containing context passages, questions, and answers for training QA models and reading comprehension systems.
+    Author: Molla Samser
+    Website: https://rskworld.in
+    Contact: help@rskworld.in
+    Phone: +91 93305 39277
+
+    Tests for qa_records.py.
+"""
+
+from conftest import make_qa
+from qa_records import QAExample, benchmark_memory, iter_examples
+
+CONTEXT = 'The Nile flows north into the Mediterranean.'
+
+def test_from_squad_keeps_first_answer_or_marks_impossible():
+    example = QAExample.from_squad('Geo', CONTEXT, make_qa('1', 'Where?', 'the Mediterranean', CONTEXT))
+    assert (example.answer_text, example.answer_start, example.is_impossible) == ('the Mediterranean', 26, False)
+    impossible = QAExample.from_squad('Geo', CONTEXT, make_qa('2', 'Who?'))
+    assert impossible.is_impossible and impossible.answer_text == ''
+    assert impossible.to_hf_dict()['answers'] == {'text': [], 'answer_start': []}
+
+def test_iter_examples_shares_equal_contexts_and_skips_impossible():
+    # Equal but distinct string objects, as CSV rows or the columnar store decode them
+    copies = [''.join(list(CONTEXT)) for _ in range(3)]
+    assert copies[0] is not copies[2]
+    records = [
+        ('Geo', copies[0], make_qa('1', 'Which way?', 'north', CONTEXT)),
+        ('Geo', copies[1], make_qa('2', 'Who?')),
+        ('Geo', copies[2], make_qa('3', 'Into what?', 'the Mediterranean', CONTEXT)),
+    ]
+    examples = list(iter_examples(records))
+    assert [example.id for example in examples] == ['1', '3']
+    assert examples[0].context is examples[1].context
+    assert len(list(iter_examples(records, include_impossible=True))) == 3
+
+def test_iter_examples_accepts_missing_title():
+    (example,) = iter_examples([(None, CONTEXT, make_qa('1', 'Which way?', 'north', CONTEXT))])
+    assert example.title == ''
+
+def test_benchmark_memory_skips_unanswerable_on_both_sides(write_squad):
+    path = write_squad({'version': '2.0', 'data': [{'title': 'Geo', 'paragraphs': [{
+        'context': CONTEXT,
+        'qas': [make_qa('1', 'Which way?', 'north', CONTEXT), make_qa('2', 'Who?')]
+    }]}]})
+    result = benchmark_memory(path, copies=4)
+    assert result['examples'] == 4
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""
+    Project: Question Answering Dataset
+    Description: A dataset containing context passages, questions, and answers for training QA models and reading comprehension systems.
+    Author: Molla Samser
+    Website: https://rskworld.in
+    Contact: help@rskworld.in
+    Phone: +91 93305 39277
+
+    Tests for squad_metrics.py.
+"""
+
+import pytest
+
+from squad_metrics import evaluate, exact_match, f1_score, gold_answers, normalize_answer, score_prediction
+
+def test_normalize_answer_strips_case_punctuation_and_articles():
+    assert normalize_answer('  The  Eiffel-Tower, in an instant!') == 'eiffeltower in instant'
+    assert normalize_answer('A') == ''
+
+def test_exact_match_after_normalization():
+    assert exact_match('the Moon.', 'moon') == 1.0
+    assert exact_match('the Moon', 'sun') == 0.0
+
+def test_f1_counts_overlapping_tokens():
+    # prediction: "red big apple" vs truth: "big apple pie" -> 2 common tokens
+    assert f1_score('red big apple', 'the big apple pie') == pytest.approx(2 / 3)
+    assert f1_score('apple apple', 'apple') == pytest.approx(2 * 0.5 * 1.0 / 1.5)
+    assert f1_score('pear', 'apple') == 0.0
+
+def test_empty_answers_match_only_empty_predictions():
+    assert f1_score('', '') == 1.0
+    assert f1_score('something', '') == 0.0
+    assert exact_match('', 'the') == 1.0  # the article alone normalizes away
+
+def test_gold_answers_of_unanswerable_question_is_empty_string():
+    assert gold_answers({'answers': []}) == ['']
+    assert gold_answers({'answers': [{'text': 'x'}, {'text': ''}, {'text': 'y'}]}) == ['x', 'y']
+
+def test_score_prediction_takes_best_reference():
+    assert score_prediction('1887', ['1887 to 1889', '1887']) == (1.0, 1.0)
+
+def test_evaluate_averages_in_percent():
+    result = evaluate(['paris', 'london', ''], [['Paris'], ['Berlin'], ['']])
+    assert result == {'exact_match': pytest.approx(200 / 3), 'f1': pytest.approx(200 / 3), 'count': 3}
+    assert evaluate([], []) == {'exact_match': 0.0, 'f1': 0.0, 'count': 0}
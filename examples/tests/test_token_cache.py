@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+    Project: Question Answering Dataset
+    Description: A dataset containing context passages, questions, and answers for training QA models and reading comprehension systems.
+    Author: Molla Samser
+    Website: https://rskworld.in
+    Contact: help@rskworld.in
+    Phone: +91 93305 39277
+
+    Tests for token_cache.py, with a WordPiece tokenizer built from a
+    tiny vocabulary instead of a Hub model.
+"""
+
+import pytest
+from transformers import BertTokenizerFast
+
+from token_cache import ContextTokenCache, build_qa_input
+
+VOCAB = ['[PAD]', '[UNK]', '[CLS]', '[SEP]', '[MASK]', 'the', 'nile', 'flows', 'north', 'into',
+         'med', '##iter', '##ranean', 'which', 'way', 'does', '.', '?']
+CONTEXT = 'The Nile flows north into the Mediterranean.'
+
+def load_tokenizer(directory, vocab):
+    """Write vocab.txt into a directory and load a lowercasing WordPiece tokenizer from it."""
+    directory.mkdir()
+    (directory / 'vocab.txt').write_text('\n'.join(vocab) + '\n', encoding='utf-8')
+    return BertTokenizerFast.from_pretrained(str(directory), do_lower_case=True)
+
+@pytest.fixture
+def tokenizer(tmp_path):
+    return load_tokenizer(tmp_path / 'tiny', VOCAB)
+
+def test_build_qa_input_matches_pair_encoding(tokenizer):
+    question = 'Which way does the Nile flow?'
+    assert tokenizer.unk_token_id not in tokenizer(CONTEXT)['input_ids']
+    features = build_qa_input(CONTEXT, question, tokenizer, ContextTokenCache())
+    expected = tokenizer(question, CONTEXT, return_offsets_mapping=True)
+    assert features['input_ids'] == expected['input_ids']
+    assert features['token_type_ids'] == expected['token_type_ids']
+    start = features['context_offset']
+    for token_offsets, (begin, end) in zip(features['offset_mapping'][start:-1], expected['offset_mapping'][start:-1]):
+        assert tuple(token_offsets) == (begin, end)
+    assert CONTEXT[slice(*features['offset_mapping'][start + 1])] == 'Nile'
+
+def test_build_qa_input_truncates_the_context_first(tokenizer):
+    features = build_qa_input(CONTEXT, 'Which way?', tokenizer, ContextTokenCache(), max_length=10)
+    assert len(features['input_ids']) == 10
+    assert features['input_ids'][:5] == tokenizer('Which way?')['input_ids']
+    assert features['input_ids'][-1] == tokenizer.sep_token_id
+
+def test_cache_hits_misses_and_lru_eviction(tokenizer):
+    cache = ContextTokenCache(maxsize=2)
+    first = cache.get(CONTEXT, tokenizer)
+    assert cache.get(CONTEXT, tokenizer) is first
+    cache.get('the nile', tokenizer)
+    cache.get(CONTEXT, tokenizer)            # most recently used again
+    cache.get('north', tokenizer)            # evicts 'the nile'
+    assert cache.stats() == {'size': 2, 'hits': 2, 'misses': 3, 'evictions': 1, 'hit_rate': 0.4}
+    cache.get(CONTEXT, tokenizer)
+    assert cache.hits == 3
+
+def test_cache_keys_differ_per_tokenizer(tokenizer, tmp_path):
+    other = load_tokenizer(tmp_path / 'other', VOCAB + ['extra'])
+    assert ContextTokenCache.key(CONTEXT, tokenizer) != ContextTokenCache.key(CONTEXT, other)
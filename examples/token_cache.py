@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+    Project: Question Answering Dataset
+    Description: A dataset containing context passages, questions, and answers for training QA models and reading comprehension systems.
+    Author: Molla Samser
+    Website: https://rskworld.in
+    Contact: help@rskworld.in
+    Phone: +91 93305 39277
+
+    Context Token Cache
+    Several questions in squad_format.json and dataset.csv share one context.
+    This size-bounded LRU cache tokenizes each context once and builds the
+    BERT input by concatenating the cached context ids with the freshly
+    tokenized question.
+"""
+
+import hashlib
+from collections import OrderedDict
+
+import torch
+
+class ContextTokenCache:
+    """
+    LRU cache of context tokenizations keyed by context hash and tokenizer.
+
+    Each entry holds the context token ids (without special tokens) and,
+    for fast tokenizers, their character offset mapping.
+    """
+
+    def __init__(self, maxsize=1024):
+        """
+        Args:
+            maxsize (int): Maximum number of cached contexts
+        """
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def key(context, tokenizer):
+        """Build the cache key for a context and tokenizer."""
+        digest = hashlib.sha1(context.encode('utf-8')).hexdigest()
+        return digest, type(tokenizer).__name__, tokenizer.name_or_path, len(tokenizer)
+
+    def get(self, context, tokenizer):
+        """
+        Return the tokenization of a context, computing it on a miss.
+
+        Args:
+            context (str): Context passage
+            tokenizer: BERT tokenizer
+
+        Returns:
+            tuple: (list of token ids, list of (start, end) offsets or None)
+        """
+        key = self.key(context, tokenizer)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        is_fast = getattr(tokenizer, 'is_fast', False)
+        encoding = tokenizer(context, add_special_tokens=False, return_offsets_mapping=is_fast)
+        entry = (encoding['input_ids'], encoding['offset_mapping'] if is_fast else None)
+        self._entries[key] = entry
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return entry
+
+    def stats(self):
+        """
+        Returns:
+            dict: size, hits, misses, evictions and hit_rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+    def clear(self):
+        self._entries.clear()
+
+def build_qa_input(context, question, tokenizer, cache, max_length=512):
+    """
+    Assemble [CLS] question [SEP] context [SEP] from cached context ids.
+
+    WordPiece tokenizes each segment independently, so the ids match a
+    pair encoding. When the pair is too long the context is truncated
+    (the question is only cut if it alone exceeds the budget).
+
+    Args:
+        context (str): Context passage
+        question (str): Question to answer
+        tokenizer: BERT tokenizer
+        cache (ContextTokenCache): Cache of context tokenizations
+        max_length (int): Maximum sequence length
+
+    Returns:
+        dict: input_ids, token_type_ids, attention_mask as lists, plus
+            context_offset (index of the first context token) and
+            offset_mapping (character offsets into the context, aligned with
+            input_ids and (0, 0) outside the context; None for slow tokenizers)
+    """
+    context_ids, context_offsets = cache.get(context, tokenizer)
+    budget = max_length - 3
+    question_ids = tokenizer(question, add_special_tokens=False)['input_ids'][:budget]
+    context_ids = context_ids[:budget - len(question_ids)]
+
+    input_ids = [tokenizer.cls_token_id] + question_ids + [tokenizer.sep_token_id] + context_ids + [tokenizer.sep_token_id]
+    question_part = len(question_ids) + 2
+    offset_mapping = None
+    if context_offsets is not None:
+        offset_mapping = [(0, 0)] * question_part + list(context_offsets[:len(context_ids)]) + [(0, 0)]
+    return {
+        'input_ids': input_ids,
+        'token_type_ids': [0] * question_part + [1] * (len(context_ids) + 1),
+        'attention_mask': [1] * len(input_ids),
+        'context_offset': question_part,
+        'offset_mapping': offset_mapping
+    }
+
+def to_model_inputs(features):
+    """Convert a build_qa_input result to a batch of one (offset_mapping included when present)."""
+    keys = ['input_ids', 'token_type_ids', 'attention_mask']
+    if features['offset_mapping'] is not None:
+        keys.append('offset_mapping')
+    return {key: torch.tensor([features[key]]) for key in keys}
@@ -11,25 +11,31 @@
     This example demonstrates how to use the dataset with various transformer models.
 """
 
-import json
+import sys
+import numpy as np
 import pandas as pd
-from transformers import pipeline, AutoTokenizer, AutoModelForQuestionAnswering
+from pandas.api.types import union_categoricals
+import torch
 from datasets import Dataset
 from transformers import TrainingArguments, Trainer
+from ingest_log import iter_dataset
+from dataset_stats import compute_stats, mean_length
+from qa_records import iter_examples
+from model_registry import registry
 
 def load_squad_dataset(file_path='../squad_format.json'):
     """
-    Load the SQuAD format dataset.
+    Load the SQuAD format dataset as a stream of flat records.
+    
+    See ingest_log.iter_dataset for where the records come from.
     
     Args:
         file_path (str): Path to the dataset JSON file
         
     Returns:
-        dict: Loaded dataset
+        iterator: (article title, context, qa) records
     """
-    with open(file_path, 'r', encoding='utf-8') as f:
-        dataset = json.load(f)
-    return dataset
+    return iter_dataset(file_path)
 
 def load_csv_dataset(file_path='../dataset.csv'):
     """
@@ -44,31 +50,95 @@ def load_csv_dataset(file_path='../dataset.csv'):
     df = pd.read_csv(file_path)
     return df
 
-def convert_squad_to_hf_dataset(squad_data):
+def load_csv_interned(file_path='../dataset.csv', chunksize=10000):
+    """
+    Load the CSV format dataset with every distinct context stored once.
+    
+    dataset.csv repeats the full context on each question row. This loader
+    reads the file in chunks and replaces the context column with an id into
+    a context table (the layout of contexts.json), and loads domains as a
+    categorical, so only one copy of each passage stays in memory.
+    
+    Args:
+        file_path (str): Path to the CSV file
+        chunksize (int): Rows parsed per chunk; bounds the duplicate copies held at once
+        
+    Returns:
+        tuple: (questions DataFrame with a context_id column, contexts DataFrame with id and text).
+            questions.attrs['bytes_saved'] holds the bytes saved versus one context per row.
+    """
+    context_ids = {}
+    context_texts = []
+    chunks = []
+    bytes_saved = 0
+    
+    for chunk in pd.read_csv(file_path, chunksize=chunksize):
+        ids = np.empty(len(chunk), dtype=np.int32)
+        for i, text in enumerate(chunk['context']):
+            context_id = context_ids.get(text)
+            if context_id is None:
+                context_id = len(context_texts) + 1
+                context_ids[text] = context_id
+                context_texts.append(text)
+            else:
+                bytes_saved += sys.getsizeof(text)
+            ids[i] = context_id
+        
+        chunk = chunk.drop(columns='context')
+        chunk.insert(0, 'context_id', ids)
+        bytes_saved += chunk['domain'].memory_usage(deep=True, index=False)
+        chunk['domain'] = chunk['domain'].astype('category')
+        bytes_saved -= chunk['domain'].memory_usage(deep=True, index=False)
+        chunks.append(chunk)
+    
+    if not chunks:
+        empty = pd.DataFrame(columns=['context_id', 'question', 'answer', 'domain', 'question_id'])
+        empty.attrs['bytes_saved'] = 0
+        return empty, pd.DataFrame(columns=['id', 'text'])
+    
+    domains = union_categoricals([chunk['domain'] for chunk in chunks])
+    questions = pd.concat(chunks, ignore_index=True)
+    questions['domain'] = domains
+    questions.attrs['bytes_saved'] = int(bytes_saved)
+    contexts = pd.DataFrame({'id': np.arange(1, len(context_texts) + 1, dtype=np.int32), 'text': context_texts})
+    return questions, contexts
+
+def convert_squad_to_hf_dataset(squad_records, include_impossible=False, as_records=False):
     """
     Convert SQuAD format to Hugging Face Dataset format.
     
+    For large corpora use convert_squad_to_hf_shards in hf_shards.py, which
+    converts in parallel and writes Arrow shards to disk.
+    
     Args:
-        squad_data (dict): SQuAD format dataset
+        squad_records (iterable): (article title, context, qa) records from load_squad_dataset
+        include_impossible (bool): Keep unanswerable questions with empty answer lists
+        as_records (bool): Return compact QAExample objects (see qa_records.py) instead of dicts;
+            call .to_hf_dict() on one to get the dict form
         
     Returns:
         list: List of examples in HF format
     """
+    if as_records:
+        return list(iter_examples(squad_records, include_impossible=include_impossible))
+    
     examples = []
-    for article in squad_data['data']:
-        for paragraph in article['paragraphs']:
-            context = paragraph['context']
-            for qa in paragraph['qas']:
-                if not qa['is_impossible']:
-                    example = {
-                        'context': context,
-                        'question': qa['question'],
-                        'answers': {
-                            'text': [qa['answers'][0]['text']],
-                            'answer_start': [qa['answers'][0]['answer_start']]
-                        }
-                    }
-                    examples.append(example)
+    for _, context, qa in squad_records:
+        if not qa['is_impossible']:
+            answers = {
+                'text': [qa['answers'][0]['text']],
+                'answer_start': [qa['answers'][0]['answer_start']]
+            }
+        elif include_impossible:
+            answers = {'text': [], 'answer_start': []}
+        else:
+            continue
+        example = {
+            'context': context,
+            'question': qa['question'],
+            'answers': answers
+        }
+        examples.append(example)
     return examples
 
 def use_qa_pipeline(model_name="distilbert-base-uncased-distilled-squad"):
@@ -79,7 +149,7 @@ def use_qa_pipeline(model_name="distilbert-base-uncased-distilled-squad"):
         model_name (str): Name of the pre-trained model
     """
     print(f"\nUsing QA Pipeline with model: {model_name}")
-    qa_pipeline = pipeline("question-answering", model=model_name)
+    qa_pipeline = registry.get_pipeline("question-answering", model_name)
     
     # Example usage
     context = "Artificial Intelligence (AI) is the simulation of human intelligence in machines that are programmed to think and learn like humans."
@@ -99,15 +169,16 @@ def use_auto_model(model_name="bert-base-uncased"):
     """
     print(f"\nUsing AutoModel with: {model_name}")
     
-    tokenizer = AutoTokenizer.from_pretrained(model_name)
-    model = AutoModelForQuestionAnswering.from_pretrained(model_name)
+    # Shared eval-mode instances; a second call does not reload the weights
+    tokenizer = registry.get_tokenizer(model_name)
+    model = registry.get_model(model_name)
     
     context = "The Eiffel Tower is a wrought-iron lattice tower on the Champ de Mars in Paris, France."
     question = "Where is the Eiffel Tower located?"
     
     inputs = tokenizer(question, context, return_tensors="pt", padding=True, truncation=True)
     
-    with model.eval():
+    with torch.no_grad():
         outputs = model(**inputs)
         start_logits = outputs.start_logits
         end_logits = outputs.end_logits
@@ -131,30 +202,29 @@ def analyze_dataset():
     print("Dataset Analysis")
     print("=" * 60)
     
-    # Load SQuAD format
-    squad_data = load_squad_dataset()
+    # Counts and histograms come from the cached stats engine (dataset_stats.py)
+    squad_stats = compute_stats('../squad_format.json')
     print(f"\nSQuAD Format:")
-    print(f"  Version: {squad_data.get('version', 'N/A')}")
-    print(f"  Number of articles: {len(squad_data['data'])}")
-    
-    total_paragraphs = sum(len(article['paragraphs']) for article in squad_data['data'])
-    print(f"  Total paragraphs: {total_paragraphs}")
-    
-    total_questions = 0
-    for article in squad_data['data']:
-        for paragraph in article['paragraphs']:
-            total_questions += len(paragraph['qas'])
-    print(f"  Total questions: {total_questions}")
+    print(f"  Version: {squad_stats.get('version', 'N/A')}")
+    print(f"  Number of articles: {squad_stats['counts']['articles']}")
+    print(f"  Total paragraphs: {squad_stats['counts']['paragraphs']}")
+    print(f"  Total questions: {squad_stats['counts']['questions']}")
+    print(f"  Mean context length: {mean_length(squad_stats, 'context'):.1f} chars")
+    print(f"  Mean question length: {mean_length(squad_stats, 'question'):.1f} chars")
     
-    # Load CSV format
-    df = load_csv_dataset()
+    csv_stats = compute_stats('../dataset.csv')
     print(f"\nCSV Format:")
-    print(f"  Total rows: {len(df)}")
-    print(f"  Columns: {', '.join(df.columns)}")
-    print(f"  Domains: {', '.join(df['domain'].unique())}")
+    print(f"  Total rows: {csv_stats['counts']['questions']}")
+    print(f"  Columns: {', '.join(csv_stats['fieldnames'])}")
+    print(f"  Domains: {', '.join(csv_stats['domains'])}")
+    
+    # Rows are loaded with each distinct context stored once
+    questions, contexts = load_csv_interned('../dataset.csv')
+    print(f"  Unique contexts: {len(contexts)}")
+    print(f"  Memory saved by interning: {questions.attrs['bytes_saved'] / 1024:.1f} KB")
     
     print("\nFirst few examples from CSV:")
-    print(df.head())
+    print(questions.head())
 
 def main():
     """
@@ -180,6 +250,9 @@ def main():
     print("=" * 60)
     use_auto_model()
     
+    print("\nLoaded models:")
+    registry.print_report()
+    
     print("\n" + "=" * 60)
     print("Examples completed!")
     print("=" * 60)
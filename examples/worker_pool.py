@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+    Project: Question Answering Dataset
+    Description: A dataset containing context passages, questions, and answers for training QA models and reading comprehension systems.
+    Author: Molla Samser
+    Website: https://rskworld.in
+    Contact: help@rskworld.in
+    Phone: +91 93305 39277
+
+    Multi-Core Worker Pool
+    Runs QA inference in N worker processes, each pinned to its own slice
+    of cores with a matching torch intra-op thread count, so parallel
+    batches stop competing for the same cores. The model weights are moved
+    to shared memory once and mapped by every worker, not copied.
+
+    Usage:
+        python worker_pool.py [model_name]
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import torch
+import torch.multiprocessing as mp
+
+from bert_example import load_dataset, predict_answers
+from model_registry import registry
+
+# Tokenizers used before fork would otherwise warn and disable their own threads
+os.environ.setdefault('TOKENIZERS_PARALLELISM', 'false')
+
+_worker = {}
+
+def available_cores():
+    """Return the CPU ids this process may run on."""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+def split_cores(cores, num_workers):
+    """
+    Split cores into num_workers contiguous slices of (nearly) equal size.
+
+    With more workers than cores, workers share cores round-robin.
+    """
+    if num_workers >= len(cores):
+        return [[cores[i % len(cores)]] for i in range(num_workers)]
+    size, extra = divmod(len(cores), num_workers)
+    slices, start = [], 0
+    for i in range(num_workers):
+        end = start + size + (1 if i < extra else 0)
+        slices.append(cores[start:end])
+        start = end
+    return slices
+
+def _init_worker(model, tokenizer, core_slices, counter, batch_size, max_length):
+    """Pin this worker to its core slice and keep the shared model for later calls."""
+    with counter.get_lock():
+        index = counter.value
+        counter.value += 1
+    cores = core_slices[index % len(core_slices)]
+    if hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, cores)
+    torch.set_num_threads(len(cores))
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:  # already set in the parent before fork
+        pass
+    _worker.update(model=model, tokenizer=tokenizer, batch_size=batch_size,
+                   max_length=max_length, cores=cores)
+
+def _predict_batch(pairs):
+    return predict_answers(pairs, _worker['model'], _worker['tokenizer'],
+                           batch_size=_worker['batch_size'], max_length=_worker['max_length'])
+
+def _worker_cores(_):
+    return os.getpid(), _worker['cores']
+
+class QAWorkerPool:
+    """
+    Process pool that answers (context, question) pairs in batches.
+
+    The model's parameters are moved to shared memory before the workers
+    start; forked workers inherit the mapping and spawned workers receive
+    shared-memory handles, so each weight exists once in RAM.
+    """
+
+    def __init__(self, model, tokenizer, num_workers=None, cores=None, batch_size=16, max_length=512):
+        """
+        Args:
+            model: Question answering model (fp32 or fp16)
+            tokenizer: Tokenizer for the model
+            num_workers (int): Worker processes, defaults to one per core
+            cores (list): CPU ids to spread the workers over, defaults to all available
+            batch_size (int): Pairs dispatched to a worker at a time
+            max_length (int): Maximum sequence length
+        """
+        cores = list(cores) if cores is not None else available_cores()
+        self.num_workers = num_workers or len(cores)
+        self.core_slices = split_cores(cores, self.num_workers)
+        self.batch_size = batch_size
+        model.share_memory()
+        context = mp.get_context('fork' if 'fork' in mp.get_all_start_methods() else 'spawn')
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.num_workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(model, tokenizer, self.core_slices, context.Value('i', 0), batch_size, max_length)
+        )
+
+    def predict(self, pairs):
+        """
+        Predict answers for many pairs, spreading batches over the workers.
+
+        Args:
+            pairs (list): (context, question) tuples
+
+        Returns:
+            list: Predicted answers, in the same order as `pairs`
+        """
+        batches = [pairs[i:i + self.batch_size] for i in range(0, len(pairs), self.batch_size)]
+        answers = []
+        for batch_answers in self.executor.map(_predict_batch, batches):
+            answers.extend(batch_answers)
+        return answers
+
+    def warmup(self):
+        """
+        Start every worker and return its pinned cores.
+
+        Returns:
+            dict: Worker pid -> list of CPU ids
+        """
+        return dict(self.executor.map(_worker_cores, range(self.num_workers * 4)))
+
+    def close(self):
+        self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def benchmark_scaling(model, tokenizer, pairs, worker_counts=None, batch_size=16, repeat=5):
+    """
+    Measure aggregate throughput as the number of workers grows.
+
+    Args:
+        model: Question answering model
+        tokenizer: Tokenizer for the model
+        pairs (list): (context, question) tuples
+        worker_counts (list): Pool sizes to try, defaults to powers of two up to the core count
+        batch_size (int): Pairs dispatched to a worker at a time
+        repeat (int): Passes over the pairs per measurement
+
+    Returns:
+        list: Dicts with workers, threads_per_worker, throughput (questions/s),
+            speedup and efficiency relative to one worker
+    """
+    cores = available_cores()
+    if worker_counts is None:
+        worker_counts = [1]
+        while worker_counts[-1] * 2 <= len(cores):
+            worker_counts.append(worker_counts[-1] * 2)
+    workload = pairs * repeat
+
+    results = []
+    for workers in worker_counts:
+        with QAWorkerPool(model, tokenizer, workers, cores, batch_size) as pool:
+            pool.warmup()
+            pool.predict(pairs)
+            start = time.perf_counter()
+            pool.predict(workload)
+            throughput = len(workload) / (time.perf_counter() - start)
+        baseline = results[0]['throughput'] if results else throughput
+        results.append({
+            'workers': workers,
+            'threads_per_worker': max(1, len(cores) // workers),
+            'throughput': throughput,
+            'speedup': throughput / baseline,
+            'efficiency': throughput / baseline / workers
+        })
+    return results
+
+def main():
+    """
+    Report how QA throughput scales with the number of pinned workers.
+    """
+    print("=" * 60)
+    print("Multi-Core QA Worker Pool")
+    print("Author: Molla Samser - https://rskworld.in")
+    print("=" * 60)
+
+    model_name = sys.argv[1] if len(sys.argv) > 1 else "bert-base-uncased"
+    model = registry.get_model(model_name)
+    tokenizer = registry.get_tokenizer(model_name)
+    pairs = [(context, qa['question']) for _, context, qa in load_dataset()]
+
+    print(f"\n{len(available_cores())} cores available, {len(pairs)} questions per pass")
+    for result in benchmark_scaling(model, tokenizer, pairs):
+        print(f"  {result['workers']:3d} workers x {result['threads_per_worker']:2d} threads: "
+              f"{result['throughput']:8.1f} questions/s  {result['speedup']:5.2f}x  "
+              f"{result['efficiency']:.0%} efficiency")
+
+if __name__ == "__main__":
+    main()